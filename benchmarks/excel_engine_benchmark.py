@@ -0,0 +1,67 @@
+"""
+Compare the default pandas excel path of read_complete_excel_file with the streaming engine.
+
+    python benchmarks/excel_engine_benchmark.py --rows 300000 --columns 40
+"""
+import argparse
+import io
+import time
+import tracemalloc
+
+import openpyxl
+
+from file_parser_sdk.utils.logger import CustomLogger
+from file_parser_sdk.utils.s3_file_parser import S3FileParser
+from file_parser_sdk.utils.storage_backends import InMemoryStorageBackend
+
+
+def build_workbook(rows, columns):
+    # a regular workbook stores strings in the shared strings table like excel does, write_only uses inline strings
+    workbook = openpyxl.Workbook()
+    worksheet = workbook.active
+    worksheet.title = "MIS"
+    worksheet.append([f"column_{index}" for index in range(columns)])
+    for row in range(rows):
+        worksheet.append([f"TXN{row:09d}" if index == 0 else row * 1.5 if index % 2 else f"value_{row % 97}" for index in range(columns)])
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    return buffer.getvalue()
+
+
+def measure(label, read, trace_memory):
+    if trace_memory:
+        # tracemalloc slows the readers down considerably, durations are only comparable between traced runs
+        tracemalloc.start()
+    start_time = time.perf_counter()
+    df = read()
+    duration = time.perf_counter() - start_time
+    peak = ""
+    if trace_memory:
+        peak = f"  peak {tracemalloc.get_traced_memory()[1] / 2 ** 20:8.1f} MiB"
+        tracemalloc.stop()
+    print(f"{label:<28} {duration:8.2f}s{peak}  shape {df.shape}")
+
+
+def main():
+    arguments = argparse.ArgumentParser()
+    arguments.add_argument("--rows", type=int, default=50000)
+    arguments.add_argument("--columns", type=int, default=40)
+    arguments.add_argument("--usecols", type=int, default=12, help="columns selected for the pruned runs")
+    arguments.add_argument("--trace-memory", action="store_true", help="report the peak of python allocations")
+    options = arguments.parse_args()
+
+    data = build_workbook(options.rows, options.columns)
+    s3_file_parser = S3FileParser(CustomLogger(), {"s3_config": {}})
+    s3_file_parser.register_storage_backend("memory", InMemoryStorageBackend({"memory://bench/file.xlsx": data}))
+    file_dtype = {"column_0": str}
+    usecols = [f"column_{index}" for index in range(options.usecols)]
+    print(f"{options.rows} rows x {options.columns} columns, {len(data) / 2 ** 20:.1f} MiB xlsx")
+
+    measure("pandas", lambda: s3_file_parser.read_complete_excel_file("memory://bench/file.xlsx", file_dtype), options.trace_memory)
+    measure("streaming", lambda: s3_file_parser.read_complete_excel_file("memory://bench/file.xlsx", file_dtype, excel_engine="streaming"), options.trace_memory)
+    measure(f"pandas usecols={options.usecols}", lambda: s3_file_parser.read_complete_excel_file("memory://bench/file.xlsx", file_dtype, usecols=usecols), options.trace_memory)
+    measure(f"streaming usecols={options.usecols}", lambda: s3_file_parser.read_complete_excel_file("memory://bench/file.xlsx", file_dtype, excel_engine="streaming", usecols=usecols), options.trace_memory)
+
+
+if __name__ == "__main__":
+    main()
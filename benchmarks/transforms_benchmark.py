@@ -0,0 +1,75 @@
+"""
+Compare the built-in edge case transforms with the row-wise apply implementations they replace.
+
+    python benchmarks/transforms_benchmark.py --rows 1000000
+"""
+import argparse
+import re
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from file_parser_sdk.utils import transforms
+
+
+def build_dataframe(rows):
+    generator = np.random.default_rng(0)
+    days = generator.integers(1, 28, rows)
+    return pd.DataFrame({
+        "MisDate": [f"{day:02d}-05-2022" for day in days],
+        "MisAmount": [f"INR {amount:,.2f}" for amount in generator.uniform(1, 100000, rows)],
+        "MisCurrency": generator.choice(["INR", "USD"], rows),
+        "MisTxRef": [f"  txn-{number} " for number in generator.integers(0, 10 ** 9, rows)],
+    })
+
+
+def convert_date_row(value):
+    try:
+        return datetime.strptime(value, "%d-%m-%Y").strftime("%Y-%m-%d")
+    except (TypeError, ValueError):
+        return None
+
+
+def convert_amount_row(row, rates):
+    amount = float(re.sub(r"[^0-9.\-]", "", row["MisAmount"].replace(",", "")))
+    return round(amount * rates.get(row["MisCurrency"], 1), 2)
+
+
+def sanitise_str_row(value):
+    return re.sub("[-']", "", value.strip()).upper()
+
+
+def measure(run, df):
+    start_time = time.perf_counter()
+    run(df.copy())
+    return time.perf_counter() - start_time
+
+
+def main():
+    arguments = argparse.ArgumentParser()
+    arguments.add_argument("--rows", type=int, default=200000)
+    options = arguments.parse_args()
+    df = build_dataframe(options.rows)
+    rates = {"USD": 83.2}
+    cases = [
+        ("dates",
+         lambda frame: frame["MisDate"].apply(convert_date_row),
+         lambda frame: transforms.parse_dates(frame, {"columns": ["MisDate"], "format": "%d-%m-%Y", "output_format": "%Y-%m-%d"})),
+        ("amounts",
+         lambda frame: frame.apply(convert_amount_row, axis=1, rates=rates),
+         lambda frame: transforms.convert_amounts(frame, {"columns": ["MisAmount"], "currency_column": "MisCurrency", "rates": rates, "round": 2})),
+        ("strings",
+         lambda frame: frame["MisTxRef"].apply(sanitise_str_row),
+         lambda frame: transforms.clean_strings(frame, {"columns": ["MisTxRef"], "remove": "[-']", "case": "upper"})),
+    ]
+    print(f"{options.rows} rows")
+    for name, row_wise, builtin in cases:
+        row_wise_duration = measure(row_wise, df)
+        builtin_duration = measure(builtin, df)
+        print(f"{name:<10} apply {row_wise_duration:7.2f}s  built-in {builtin_duration:7.2f}s  {row_wise_duration / builtin_duration:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 # src/__init__.py
 from .service.file_parser import FileParser
+from .service import batch_parser
 
 class FileParserSDK:
     def __init__(self, config):
@@ -12,15 +13,60 @@ class FileParserSDK:
         self.config = config
         self.parser = FileParser(config)
 
-    def parse(self, file_path: str, file_source: str = None, response_type: str = None):
+    def parse(self, file_path: str, file_source: str = None, response_type: str = None, response_options: dict = None):
         """
         Parse and transform file as per mapping defined in configuration
         Args:
             file_path (str): Path to the file to be parsed.
             file_source: file source name in configuration
+            response_options: options of the response type, e.g. {"arrow_format": "reader"} for ARROW
         
         Returns:
             Result of the parsing data as ParsedDataResponseType
             Defualt: Dataframe
         """
-        return self.parser.parse_file(file_path, file_source, response_type)
+        return self.parser.parse_file(file_path, file_source, response_type, response_options)
+
+    async def parse_async(self, file_path: str, file_source: str = None, response_type: str = None, executor = None, response_options: dict = None):
+        """
+        Parse and transform file as per mapping defined in configuration without blocking the event loop
+        Args:
+            file_path (str): Path to the file to be parsed.
+            file_source: file source name in configuration
+            executor: optional concurrent.futures executor used for decoding the file
+            response_options: options of the response type
+        
+        Returns:
+            Result of the parsing data as ParsedDataResponseType
+            Defualt: Dataframe
+        """
+        return await self.parser.parse_file_async(file_path, file_source, response_type, executor, response_options)
+
+
+    def parse_iter(self, file_path: str, file_source: str = None, chunksize: int = None):
+        """
+        Parse and transform file in chunks as per mapping defined in configuration
+        Args:
+            file_path (str): Path to the file to be parsed.
+            file_source: file source name in configuration
+            chunksize: number of rows per chunk
+        
+        Returns:
+            Generator of parsed dataframes
+        """
+        return self.parser.parse_file_iter(file_path, file_source, chunksize)
+
+    def parse_many(self, items, max_workers: int = None, executor: str = "process", max_in_flight: int = None, response_type: str = None):
+        """
+        Parse and transform many files in parallel as per mapping defined in configuration
+        Args:
+            items: iterable of (file_path, file_source) tuples
+            max_workers: number of worker processes/threads
+            executor: "process" or "thread"
+            max_in_flight: maximum number of files being parsed or waiting to be consumed at once
+            response_type: ParsedDataResponseType of every result
+        
+        Returns:
+            Generator of ParseResult (file_path, file_source, data, error) in completion order
+        """
+        return batch_parser.parse_many(self.config, items, max_workers=max_workers, executor=executor, max_in_flight=max_in_flight, response_type=response_type)
@@ -2,4 +2,10 @@ import enum
 
 class FilterType(enum.Enum):
     EQUALS="equals"
-    STARTSWITH="startswith"
\ No newline at end of file
+    STARTSWITH="startswith"
+    NOT_EQUALS="not_equals"
+    CONTAINS="contains"
+    REGEX="regex"
+    RANGE="range"
+    IS_NULL="is_null"
+    NOT_NULL="not_null"
@@ -3,4 +3,6 @@ import enum
 class ParsedDataResponseType(enum.Enum):
     DATAFRAME="DATAFRAME"
     FILE="FILE"
-    JSON="JSON"
\ No newline at end of file
+    JSON="JSON"
+    ARROW="ARROW"
+    PARQUET="PARQUET"
\ No newline at end of file
@@ -0,0 +1,107 @@
+#!/usr/bin/python
+import os
+import pickle
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+from .file_parser import FileParser
+from ..exceptions.expcetion import ConfigMissingException, FileProcessFailException
+from ..utils import file_parser_constants
+
+# FileParser keeps the active file source on the instance, so every worker thread/process gets its own parser
+_process_parser = None
+_thread_parsers = threading.local()
+
+
+class ParseResult:
+    """Outcome of one file of a parse_many batch, error is set instead of data when the file failed."""
+
+    def __init__(self, file_path, file_source, data=None, error=None, duration=None):
+        self.file_path = file_path
+        self.file_source = file_source
+        self.data = data
+        self.error = error
+        self.duration = duration
+
+    @property
+    def succeeded(self):
+        return self.error is None
+
+    def __repr__(self):
+        status = "succeeded" if self.succeeded else "failed :: " + str(self.error)
+        return f"ParseResult({self.file_path}, {self.file_source}, {status})"
+
+
+def _parse_with(parser, file_path, file_source, response_type):
+    start_time = time.monotonic()
+    try:
+        data = parser.parse_file(file_path, file_source, response_type)
+        return ParseResult(file_path, file_source, data=data, duration=time.monotonic() - start_time)
+    except Exception as e:
+        return ParseResult(file_path, file_source, error=e, duration=time.monotonic() - start_time)
+
+
+def _init_process_parser(config):
+    global _process_parser
+    _process_parser = FileParser(config)
+
+
+def _parse_in_process(file_path, file_source, response_type):
+    result = _parse_with(_process_parser, file_path, file_source, response_type)
+    if result.error is not None:
+        try:
+            pickle.dumps(result.error)
+        except Exception:
+            result.error = FileProcessFailException(f"{type(result.error).__name__} :: {result.error}")
+    return result
+
+
+def parse_many(config, items, max_workers=None, executor=file_parser_constants.process_executor, max_in_flight=None, response_type=None):
+    """
+    Parse many (file_path, file_source) pairs on a bounded pool and yield a ParseResult per file as it finishes.
+    A failing file is reported through its ParseResult and does not stop the batch. At most max_in_flight files
+    (default: twice the worker count) are submitted at a time, which bounds the memory held by pending results.
+    Args:
+        config (dict): same configuration as FileParser
+        items: iterable of (file_path, file_source) tuples
+        max_workers: pool size, defaults to the number of CPUs
+        executor: "process" or "thread"
+        max_in_flight: maximum number of files submitted to the pool at once
+        response_type: ParsedDataResponseType value passed on to parse_file
+    Returns: generator of ParseResult in completion order
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    max_in_flight = max(max_in_flight or 2 * max_workers, 1)
+    if executor == file_parser_constants.process_executor:
+        pool = ProcessPoolExecutor(max_workers=max_workers, initializer=_init_process_parser, initargs=(config,))
+        submit = lambda file_path, file_source: pool.submit(_parse_in_process, file_path, file_source, response_type)
+    elif executor == file_parser_constants.thread_executor:
+        def parse_in_thread(file_path, file_source):
+            parser = getattr(_thread_parsers, "parser", None)
+            if parser is None or parser._config is not config:
+                parser = _thread_parsers.parser = FileParser(config)
+            return _parse_with(parser, file_path, file_source, response_type)
+        pool = ThreadPoolExecutor(max_workers=max_workers)
+        submit = lambda file_path, file_source: pool.submit(parse_in_thread, file_path, file_source)
+    else:
+        raise ConfigMissingException(f"Unsupported executor = {executor}")
+
+    with pool:
+        items = iter(items)
+        in_flight = {}
+        while True:
+            for file_path, file_source in items:
+                in_flight[submit(file_path, file_source)] = (file_path, file_source)
+                if len(in_flight) >= max_in_flight:
+                    break
+            if not in_flight:
+                return
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                file_path, file_source = in_flight.pop(future)
+                try:
+                    yield future.result()
+                except Exception as e:
+                    # the worker itself died (e.g. a crashed process), report it against the file
+                    yield ParseResult(file_path, file_source, error=e)
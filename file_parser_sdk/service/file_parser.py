@@ -1,32 +1,72 @@
 #!/usr/bin/python
+import asyncio
+import copy
+import io
 import os
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
 
 import pandas as pd
 from ..exceptions.expcetion import FileProcessFailException, ConfigMissingException, ResourceNotFoundException
 from ..utils.s3_file_parser import S3FileParser
 from ..utils.logger import CustomLogger
 from ..enums.LogLevel import LogLevel
-from ..enums.FilterType import FilterType
 from ..enums.ParsedDataResponseType import ParsedDataResponseType
-from ..utils import common_utils, file_parser_constants
+from ..utils import common_utils, file_parser_constants, excel_reader, filter_engine, transforms, column_pruning, memory_profile, response_formats, metrics
+from ..utils.result_cache import ResultCache, get_config_hash, get_edge_case_version
 
 
 class FileParser:
 
     def __init__(self, config):
         self._config = config
-        self._logger = CustomLogger()
+        self._logger = CustomLogger(self._config.get(file_parser_constants.log_config))
         self.s3_file_parser = S3FileParser(
             self._logger, self._config)
         self._file_source = None
         self._file_name = ''
         self._file_config = self._config.get("file_config", None)
+        self._async_lock = threading.Lock()
+        self._async_semaphores = {}
+        self._io_executor = None
         try:
             from edgeCases import user_edge_cases
             self.edge_cases = user_edge_cases
         except ImportError:
             self.edge_cases = None
             self._logger.print_log(LogLevel.WARNING.value, message = "FileParser :: Warning: No user-defined edge cases found. Edge case functions won't be available.")
+        self.result_cache = self.build_result_cache()
+        self._edge_case_version = None
+        metrics_config = self._config.get(file_parser_constants.metrics) or {}
+        self._metrics_enabled = metrics_config.get("enabled", False)
+        self.metrics_registry = metrics.MetricsRegistry() if metrics_config.get("prometheus", False) else None
+        self.metrics_hooks = []
+        self.last_stats = None
+
+    def build_result_cache(self):
+        result_cache_config = self._config.get(file_parser_constants.result_cache, None)
+        if result_cache_config is None:
+            return None
+        return ResultCache(result_cache_config["cache_dir"],
+                           max_size_bytes=result_cache_config.get("max_size_bytes", file_parser_constants.default_result_cache_max_size_bytes),
+                           max_entries=result_cache_config.get("max_entries", None))
+
+    def add_metrics_hook(self, hook):
+        """Call hook(stats, span) whenever a stage of a parse ends, see utils.metrics.ParseStats."""
+        self.metrics_hooks = self.metrics_hooks + [hook]
+
+    def new_stats(self, input_file_path, file_source, return_stats=False):
+        """ParseStats of a call when metrics are enabled, hooks are registered or stats are requested, NULL_STATS otherwise."""
+        if not (return_stats or self._metrics_enabled or self.metrics_hooks or self.metrics_registry is not None):
+            return metrics.NULL_STATS
+        return metrics.ParseStats(input_file_path, file_source, hooks=self.metrics_hooks)
+
+    def prometheus_text(self):
+        """Metrics of every parse of this parser in the Prometheus text format, requires metrics["prometheus"]."""
+        if self.metrics_registry is None:
+            raise ConfigMissingException("Prometheus metrics are not enabled, set metrics = {\"prometheus\": True}")
+        return self.metrics_registry.to_prometheus_text()
 
     def get_sheet_names(self, config):
         all_sheet_names = []
@@ -61,10 +101,12 @@ class FileParser:
                 skip_footer = self.file_config["skipfooter"]
             if read_from_s3_func == "readFromS3":
                 df = self.s3_file_parser.readFromS3(
-                    input_file_path, file_dtype, **parameters, skip_footer=skip_footer)
+                    input_file_path, file_dtype, **{**self.get_read_options(), **parameters}, skip_footer=skip_footer)
             elif read_from_s3_func == "read_complete_excel_file":
+                read_options = self.get_read_options()
                 df = self.s3_file_parser.read_complete_excel_file(
-                    input_file_path, file_dtype, skip_footer=skip_footer)
+                    input_file_path, file_dtype, skip_footer=skip_footer, sheet_names=self.file_config.get(file_parser_constants.excel_sheet_names),
+                    excel_engine=read_options.get(file_parser_constants.excel_engine), usecols=read_options.get(file_parser_constants.usecols))
             elif read_from_s3_func == "readZipFromS3":
                 disable_skip_rows_sheets = []
                 if "disable_skip_rows" in self.file_config and len(self.file_config.get("disable_skip_rows")) > 0:
@@ -74,7 +116,52 @@ class FileParser:
             raise Exception(
                 "Exception Occurred while Reading from S3 :: "+str(e))
         return df
-    
+
+    def fetch_chunks_from_s3_using_input_path(self, input_file_path=None, file_dtype=None, chunksize=None):
+        """
+        Yield the raw file data in dataframes of at most chunksize rows. csv/txt files read through readFromS3 and
+        csv/txt members of zip archives are streamed, every other reader falls back to a single full dataframe.
+        """
+        try:
+            read_from_s3_func = self.file_config["read_from_s3_func"]
+            parameters = self.file_config["parameters_for_read_s3"] if self.file_config["parameters_for_read_s3"] is not None else {}
+            skip_footer = 0
+            if "skipfooter" in self.file_config and self.file_config.get("skipfooter") > 0:
+                skip_footer = self.file_config["skipfooter"]
+            if read_from_s3_func == "readFromS3":
+                chunks = self.s3_file_parser.readFromS3(
+                    input_file_path, file_dtype, **{**self.get_read_options(), **parameters, "chunksize": chunksize}, skip_footer=skip_footer)
+            elif read_from_s3_func == "readZipFromS3" and len(self.get_sheet_names(parameters)) == 0:
+                compression_type = self.file_config.get(file_parser_constants.compression_type, None)
+                zfile = self.s3_file_parser.readZipFromS3(input_file_path, compression_type)
+                chunks = self.iter_dataframe_chunks(zfile, input_file_path, file_dtype, **{**parameters, "chunksize": chunksize}, skip_footer=skip_footer)
+            else:
+                chunks = self.fetch_data_from_s3_using_input_path(input_file_path, file_dtype)
+            if isinstance(chunks, pd.DataFrame):
+                chunks = [chunks]
+            for chunk in chunks:
+                yield chunk
+        except Exception as e:
+            raise Exception(
+                "Exception Occurred while Reading from S3 :: "+str(e))
+
+    def get_read_options(self):
+        """
+        excel_engine, xml_options, pdf_options and usecols passed on to the readers of S3FileParser. With prune_columns and
+        without an explicit usecols only the columns the file source needs are read, see column_pruning.
+        """
+        options = {}
+        for option in [file_parser_constants.excel_engine, file_parser_constants.xml_options, file_parser_constants.pdf_options]:
+            if self.file_config.get(option) is not None:
+                options[option] = self.file_config[option]
+        if self.file_config.get(file_parser_constants.usecols) is not None:
+            options[file_parser_constants.usecols] = self.file_config[file_parser_constants.usecols]
+        else:
+            required_columns = column_pruning.get_required_columns(self.file_config, self.edge_cases)
+            if required_columns is not None:
+                options[file_parser_constants.usecols] = column_pruning.ColumnSelector(required_columns)
+        return options
+
     def ignore_file_while_reading_from_zip(self, file_name, file_type, ignore_file_based_on_extension, ignore_file_based_on_name_list, ignore_file_based_on_name):
         if len(file_type) == 0:
             return True
@@ -91,61 +178,165 @@ class FileParser:
             password = os.environ[password_secret_key]
         return password
 
-    def create_dataframe(self, zfile, input_file_path, file_dtype=None, password_protected=False, password_secret_key=None, ignore_file_based_on_extension=[], ignore_file_based_on_name_list = [], ignore_file_based_on_name=None, sep=",", header=None, has_header=True, skiprows=0, skip_header=False,engine="c",skip_footer=0):
-        df = pd.DataFrame()
-        self._logger.print_log(LogLevel.WARNING.value, self._file_name,
-                                  "FileParser :: create_dataframe :: Input path = " + input_file_path)
-        password_protected = self.password_duality_checker(input_file_path, password_protected)
-        
+    def get_zip_members_to_parse(self, zfile, ignore_file_based_on_extension=[], ignore_file_based_on_name_list=[], ignore_file_based_on_name=None):
+        members = []
         for fileName in zfile.namelist():
             original_file_name = fileName
             fileName = fileName.split("/")[-1]
-            
+
             file_type = self.s3_file_parser.detect_type(fileName)
             if self.ignore_file_while_reading_from_zip(fileName, file_type, ignore_file_based_on_extension, ignore_file_based_on_name_list, ignore_file_based_on_name):
                 continue
-            if password_protected:
-                password = self.get_zip_password(password_secret_key)
-                file_df = self.s3_file_parser.creating_df_based_on_file_types(zfile.open(original_file_name, pwd=bytes(password, 'utf-8')), input_file_path, file_type, file_dtype=file_dtype, header_info={'header': header, 'has_header': has_header, 'skip_header': skip_header}, sep=sep, skiprows=skiprows, engine=engine, skip_footer=skip_footer)
-                df = pd.concat([file_df, df], axis=0)
-            else:
-                file_df = self.s3_file_parser.creating_df_based_on_file_types(zfile.open(original_file_name), input_file_path, file_type, file_dtype=file_dtype, sep=sep, header_info={'header': header, 'has_header': has_header, 'skip_header': skip_header}, skiprows=skiprows, engine=engine, skip_footer=skip_footer)
-                df = pd.concat([file_df, df], axis=0)
-        return df
+            members.append((original_file_name, file_type))
+        return members
+
+    def open_zip_member(self, zfile, original_file_name, password=None):
+        if password is not None:
+            return zfile.open(original_file_name, pwd=bytes(password, 'utf-8'))
+        return zfile.open(original_file_name)
+
+    def create_dataframe(self, zfile, input_file_path, file_dtype=None, password_protected=False, password_secret_key=None, ignore_file_based_on_extension=[], ignore_file_based_on_name_list = [], ignore_file_based_on_name=None, sep=",", header=None, has_header=True, skiprows=0, skip_header=False,engine="c",skip_footer=0):
+        self._logger.print_log(LogLevel.WARNING.value, self._file_name, "FileParser :: create_dataframe", input_path=input_file_path)
+        password_protected = self.password_duality_checker(input_file_path, password_protected)
+        password = self.get_zip_password(password_secret_key) if password_protected else None
+
+        members = self.get_zip_members_to_parse(zfile, ignore_file_based_on_extension, ignore_file_based_on_name_list, ignore_file_based_on_name)
+        parse_kwargs = {'file_dtype': file_dtype, 'sep': sep, 'header_info': {'header': header, 'has_header': has_header, 'skip_header': skip_header}, 'skiprows': skiprows, 'engine': engine, 'skip_footer': skip_footer, **self.get_read_options()}
+        dfs = self.decode_zip_members(zfile, members, password, input_file_path, parse_kwargs)
+        if len(dfs) == 0:
+            return pd.DataFrame()
+        return pd.concat(dfs, axis=0)
+
+    def decode_zip_member(self, zfile, original_file_name, file_type, password, input_file_path, parse_kwargs):
+        return self.s3_file_parser.creating_df_based_on_file_types(self.open_zip_member(zfile, original_file_name, password), input_file_path, file_type, **parse_kwargs)
+
+    def decode_zip_members(self, zfile, members, password, input_file_path, parse_kwargs):
+        """
+        Parse the given zip members into dataframes, returned in archive order. The pool is configured per file
+        source through zip_member_workers and zip_member_executor ("thread" or "process"). Threads decompress and
+        parse straight from the archive, a process pool gets the decompressed member bytes from this process. At
+        most twice the worker count members, of zip_member_max_bytes_in_flight decompressed bytes together (a
+        larger member goes alone), are handed to the process pool at a time, more are read as members finish.
+        """
+        workers = self.file_config.get(file_parser_constants.zip_member_workers, 1)
+        executor_type = self.file_config.get(file_parser_constants.zip_member_executor, file_parser_constants.thread_executor)
+        stats = metrics.current_stats()
+        stats.add("zip_members", len(members))
+        if workers is None or workers <= 1 or len(members) <= 1:
+            return [self.decode_zip_member(zfile, original_file_name, file_type, password, input_file_path, parse_kwargs) for original_file_name, file_type in members]
+
+        self._logger.print_log(LogLevel.INFO.value, self._file_name, "FileParser :: decode_zip_members",
+                               members=len(members), workers=workers, executor=executor_type)
+        if executor_type == file_parser_constants.process_executor:
+            max_bytes_in_flight = self.file_config.get(file_parser_constants.zip_member_max_bytes_in_flight) or file_parser_constants.default_zip_member_max_bytes_in_flight
+            dfs = [None] * len(members)
+            with ProcessPoolExecutor(max_workers=workers) as executor, stats.span("decode", members=len(members)):
+                pending = iter(enumerate(members))
+                next_member = next(pending, None)
+                in_flight = {}
+                bytes_in_flight = 0
+                while next_member is not None or in_flight:
+                    while next_member is not None and len(in_flight) < 2 * workers:
+                        index, (original_file_name, file_type) = next_member
+                        member_size = zfile.getinfo(original_file_name).file_size
+                        if in_flight and bytes_in_flight + member_size > max_bytes_in_flight:
+                            break
+                        with stats.span("decompress", member=original_file_name), self.open_zip_member(zfile, original_file_name, password) as member:
+                            member_bytes = member.read()
+                        in_flight[executor.submit(parse_zip_member_bytes, self._config, member_bytes, input_file_path, file_type, parse_kwargs)] = (index, member_size)
+                        bytes_in_flight += member_size
+                        next_member = next(pending, None)
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        index, member_size = in_flight.pop(future)
+                        bytes_in_flight -= member_size
+                        dfs[index] = future.result()
+            return dfs
+        elif executor_type == file_parser_constants.thread_executor:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                return list(executor.map(lambda member: metrics.run_with_stats(stats, self.decode_zip_member, zfile, member[0], member[1], password, input_file_path, parse_kwargs), members))
+        raise ConfigMissingException(f"Unsupported zip_member_executor = {executor_type}")
+
+    def iter_dataframe_chunks(self, zfile, input_file_path, file_dtype=None, chunksize=None, password_protected=False, password_secret_key=None, ignore_file_based_on_extension=[], ignore_file_based_on_name_list = [], ignore_file_based_on_name=None, sep=",", header=None, has_header=True, skiprows=0, skip_header=False,engine="c",skip_footer=0):
+        """
+        Chunked counterpart of create_dataframe. Members are read one after another in archive order and csv/txt
+        members are streamed straight out of the archive, so only one chunk is held in memory at a time.
+        """
+        self._logger.print_log(LogLevel.WARNING.value, self._file_name, "FileParser :: iter_dataframe_chunks", input_path=input_file_path)
+        password_protected = self.password_duality_checker(input_file_path, password_protected)
+        password = self.get_zip_password(password_secret_key) if password_protected else None
+
+        for original_file_name, file_type in self.get_zip_members_to_parse(zfile, ignore_file_based_on_extension, ignore_file_based_on_name_list, ignore_file_based_on_name):
+            metrics.current_stats().add("zip_members")
+            chunks = self.s3_file_parser.creating_df_based_on_file_types(self.open_zip_member(zfile, original_file_name, password), input_file_path, file_type, file_dtype=file_dtype, chunksize=chunksize, sep=sep, header_info={'header': header, 'has_header': has_header, 'skip_header': skip_header}, skiprows=skiprows, engine=engine, skip_footer=skip_footer, **self.get_read_options())
+            if isinstance(chunks, pd.DataFrame):
+                chunks = [chunks]
+            for chunk in chunks:
+                yield chunk
 
     def get_dataframe_for_multiple_sheets(self,sheet_names, zfile, file_name, password, input_file_path, file_type, file_dtype, sep, header, has_header, skiprows, skip_footer=0, disable_skip_rows_sheets=[]):
-        dfs={}
-        for sheet_name in sheet_names:
-            skip_rows = skiprows
-            if sheet_name in disable_skip_rows_sheets:
-                skip_rows = 0
-            dfs[sheet_name] = self.s3_file_parser.creating_df_based_on_file_types(zfile.open(file_name, pwd=bytes(password, 'utf-8') if password else None), input_file_path, file_type, file_dtype=file_dtype, sep=sep, header_info={'header': header, 'has_header': has_header}, skiprows=skip_rows, sheet_name=sheet_name, skip_footer=skip_footer)
-            dropna_column = self.file_config.get("dropna_column", None)
-        if dropna_column is not None and dropna_column in dfs[sheet_name].columns:
-            dfs[sheet_name] = dfs[sheet_name].dropna(subset=[dropna_column])
-        return dfs
-    
+        """
+        Read the given sheets of one archive member into {sheet name: dataframe}. The member is decompressed once and
+        an excel workbook is opened once, its sheets are then parsed on sheet_workers threads (default: one per sheet,
+        at most the number of CPUs).
+        """
+        with self.open_zip_member(zfile, file_name, password) as member:
+            member_bytes = member.read()
+        read_options = self.get_read_options()
+        header_info = {'header': header, 'has_header': has_header, 'skip_header': False}
+        workbook = None
+        if file_type in file_parser_constants.excel_file_type:
+            if read_options.get(file_parser_constants.excel_engine) == file_parser_constants.streaming_excel_engine \
+                    and excel_reader.is_streaming_supported(io.BytesIO(member_bytes)):
+                workbook = excel_reader.open_workbook(io.BytesIO(member_bytes))
+            else:
+                workbook = pd.ExcelFile(io.BytesIO(member_bytes))
+        dropna_column = self.file_config.get("dropna_column", None)
+
+        def read_sheet(sheet_name):
+            skip_rows = 0 if sheet_name in disable_skip_rows_sheets else skiprows
+            if isinstance(workbook, excel_reader.XlsxWorkbook):
+                df = excel_reader.read_sheet(workbook.iter_rows(sheet_name), dtype=file_dtype, skiprows=skip_rows,
+                                             usecols=read_options.get(file_parser_constants.usecols), skip_footer=skip_footer)
+            elif workbook is not None:
+                df = self.s3_file_parser.read_excel_sheet(workbook, sheet_name, file_dtype, skip_rows,
+                                                          usecols=read_options.get(file_parser_constants.usecols), skip_footer=skip_footer)
+            else:
+                df = self.s3_file_parser.creating_df_based_on_file_types(io.BytesIO(member_bytes), input_file_path, file_type, file_dtype=file_dtype, sep=sep, header_info=header_info, skiprows=skip_rows, sheet_name=sheet_name, skip_footer=skip_footer)
+            if dropna_column is not None and dropna_column in df.columns:
+                df = df.dropna(subset=[dropna_column])
+            return df
+
+        try:
+            workers = self.file_config.get(file_parser_constants.sheet_workers) or min(len(sheet_names), os.cpu_count() or 1)
+            # pd.ExcelFile is not safe to share between threads, XlsxWorkbook opens a new stream for every sheet
+            if workers <= 1 or len(sheet_names) <= 1 or not isinstance(workbook, excel_reader.XlsxWorkbook):
+                return {sheet_name: read_sheet(sheet_name) for sheet_name in sheet_names}
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                return dict(zip(sheet_names, executor.map(read_sheet, sheet_names)))
+        finally:
+            if workbook is not None:
+                workbook.close()
+
     def create_dataframe_with_sheets(self, zfile, input_file_path, file_dtype=None, password_protected=False, password_secret_key = None, ignore_file_based_on_extension=[], mark_entry_type_based_on_sheets={}, ignore_file_based_on_name="", sep=",", header=None, has_header=True, skiprows=0,skip_footer=0, disable_skip_rows_sheets=[], sheet_names = []):
-        dfs = {}
+        """
+        Read the sheets listed in mark_entry_type_based_on_sheets from every member of the archive and mark each row
+        with the type of its sheet. All sheets of all members are concatenated once, in member and sheet type order.
+        """
         try:
-            for file_name in zfile.namelist():
-                file_type = self.s3_file_parser.detect_type(file_name)
-                password = None
-                if password_protected:
-                    password = os.environ[password_secret_key]
-                dfs = self.get_dataframe_for_multiple_sheets(sheet_names, zfile, file_name, password, input_file_path, file_type, file_dtype, sep, header, has_header, skiprows,skip_footer=skip_footer, disable_skip_rows_sheets=disable_skip_rows_sheets)
-
-                dfs_by_sheet_type = {}
-                for df_type, sheet_names in mark_entry_type_based_on_sheets[file_parser_constants.sheet_type].items():
-                    df = pd.DataFrame({})
-                    for sheet_name in sheet_names:
-                        df = pd.concat([df, dfs[sheet_name]])
-                    # Add the specified column with the type (key) as the value
-                    df[mark_entry_type_based_on_sheets[file_parser_constants.column_name]] = df_type
-                    dfs_by_sheet_type[df_type] = df
-
-                # Concatenate all dataframes into a single dataframe
-                final_df = pd.concat(dfs_by_sheet_type.values())
+            password = self.get_zip_password(password_secret_key) if password_protected else None
+            column_name = mark_entry_type_based_on_sheets[file_parser_constants.column_name]
+            members = self.get_zip_members_to_parse(zfile, ignore_file_based_on_extension, [], ignore_file_based_on_name or None)
+            dfs = []
+            for file_name, file_type in members:
+                dfs_by_sheet = self.get_dataframe_for_multiple_sheets(sheet_names, zfile, file_name, password, input_file_path, file_type, file_dtype, sep, header, has_header, skiprows,skip_footer=skip_footer, disable_skip_rows_sheets=disable_skip_rows_sheets)
+                for df_type, type_sheet_names in mark_entry_type_based_on_sheets[file_parser_constants.sheet_type].items():
+                    for sheet_name in type_sheet_names:
+                        # a shallow copy shares the column data, only the type column is added to it
+                        df = dfs_by_sheet[sheet_name].copy(deep=False)
+                        df[column_name] = df_type
+                        dfs.append(df)
+            final_df = pd.concat(dfs) if len(dfs) > 0 else pd.DataFrame()
         except Exception as e:
             self._logger.print_log(LogLevel.ERROR.value, self._file_name, "createDataFrame :: Failed to load dataframe :: Error: " + str(e))
             raise FileProcessFailException("createDataFrame::Failed to load dataframe "+str(e))
@@ -153,35 +344,46 @@ class FileParser:
 
     def sanitize_file(self, df):
         try:
-            self._logger.print_log(LogLevel.WARNING.value, self._file_name,
-                                  self._file_source+" :: file size = " + str(df.shape[0])+" :: columns :: "+str(df.columns))
+            self._logger.print_log(LogLevel.WARNING.value, self._file_name, self._file_source,
+                                   rows=df.shape[0], columns=lambda: [str(column) for column in df.columns])
             if df.shape[0] == 0:
                 return df
             
-            df = self.apply_edge_cases(df)
-            
-            df.rename(
-                columns=self.file_config["columns_mapping"], inplace = True)
+            stats = metrics.current_stats()
+            with stats.span("edge_cases", rows_in=df.shape[0]) as span:
+                df = self.apply_edge_cases(df)
+                span.set(rows_out=df.shape[0])
+
+            with stats.span("rename"):
+                df.rename(
+                    columns=self.file_config["columns_mapping"], inplace = True)
 
             if "filter_based_on_status" in self.file_config and self.file_config["filter_based_on_status"] is not None:
-                filter_type = self.file_config["filter_based_on_status"]["filter_type"] if "filter_type" in self.file_config["filter_based_on_status"] else FilterType.EQUALS.value
-                filter_column = self.file_config["filter_based_on_status"].get("filter_column", None)
-                df = common_utils.filter_entries_by_transaction_types_list(df, filter_column, self.file_config["filter_based_on_status"]["filter_values"], filter_type)
+                with stats.span("filter", rows_in=df.shape[0]) as span:
+                    df = filter_engine.apply_filter(df, self.file_config["filter_based_on_status"])
+                    span.set(rows_out=df.shape[0])
             return df
         except Exception as e:
             raise Exception(
                 "Exception Occurred while sanitizing MIS DF :: "+str(e))
     
     def apply_edge_cases(self, df):
+        """
+        Run the edge cases of the file source in their configured order. Each one is a function of user_edge_cases
+        or, when the module doesn't define it, one of the built-in vectorized transforms (see utils.transforms).
+        """
         try:
             conditions = self.file_config["edge_case"]
             if conditions is None or len(conditions) < 1:
               return df
-            if self.edge_cases is None:
-                raise ImportError("Edge case module not found. Please ensure `user_edge_cases` is available in Config.")
             for condition_name, params in conditions.items():
-                edge_case_func = getattr(self.edge_cases, condition_name, None)
-                
+                edge_case_func = getattr(self.edge_cases, condition_name, None) if self.edge_cases is not None else None
+                if edge_case_func is None and transforms.get_builtin_transform(condition_name) is not None:
+                    df = transforms.apply_builtin_transform(df, condition_name, params)
+                    continue
+                if self.edge_cases is None:
+                    raise ImportError("Edge case module not found. Please ensure `user_edge_cases` is available in Config.")
+
                 # If the function is missing, raise an error with details
                 if not edge_case_func:
                     raise AttributeError(f"Edge case '{condition_name}' is not defined in `user_edge_cases.py`. Please define it or update the configuration.")
@@ -197,14 +399,24 @@ class FileParser:
             raise FileProcessFailException(
                   "Exception Occurred while handling edge cases :: "+str(e))
 
-    def parse_file(self, input_file_path=None, file_source = None, response_type = None):
+    def apply_memory_profile(self, df, plan=None):
         """
-        Fetch file data for given input_path and convert the data in consumable format for generating consolidated report
-        Args:
-            file_path (str): Path to the file to be parsed.
-            file_source: file source name in configuration
-        Returns: parsed data as response_type
+        Compact the dtypes of the sanitized dataframe when the file source sets memory_profile, see
+        utils.memory_profile. plan is the dtype plan shared by the chunks of a file. The memory saved is logged
+        and set on the memory_profile span of the parse stats (before_bytes, after_bytes, saved_bytes, dtypes).
         """
+        profile = memory_profile.get_profile(self.file_config.get(file_parser_constants.memory_profile))
+        if profile is None:
+            return df
+        with metrics.current_stats().span("memory_profile") as span:
+            df, report = memory_profile.compact_dataframe(df, profile, plan)
+            span.set(**report)
+        self._logger.print_log(LogLevel.INFO.value, self._file_name, "FileParser :: apply_memory_profile",
+                               before_bytes=report['before_bytes'], after_bytes=report['after_bytes'],
+                               dtypes=lambda: {str(column): list(change) for column, change in report['dtypes'].items()})
+        return df
+
+    def resolve_file_config(self, input_file_path, file_source):
         self._file_name = os.path.basename(input_file_path)
         self._file_source = file_source
         if self._file_source is None:
@@ -217,24 +429,249 @@ class FileParser:
             raise ConfigMissingException(f"File Config is missing for FileSource = {self._file_source}")
 
         self.file_config = self._file_config[self._file_source]
-        self._logger.print_log(LogLevel.WARNING.value, self._file_name,
-                                f"FileParser :: parse_file :: Input path = {input_file_path}")
-        file_dtype = self.file_config["file_dtype"]
-        df = self.fetch_data_from_s3_using_input_path(input_file_path, file_dtype)
+        return self.file_config
+
+    def parse_file(self, input_file_path=None, file_source = None, response_type = None, response_options = None, return_stats = False):
+        """
+        Fetch file data for given input_path and convert the data in consumable format for generating consolidated report
+        Args:
+            file_path (str): Path to the file to be parsed.
+            file_source: file source name in configuration
+            response_options: options of the response type, override response_options of the file source
+            return_stats: return (parsed data, utils.metrics.ParseStats of the call)
+        Returns: parsed data as response_type
+        """
+        stats = self.new_stats(input_file_path, file_source, return_stats)
+        with self.record_stats(stats), metrics.collect(stats):
+            result = self._parse_file(input_file_path, file_source, response_type, response_options)
+        return (result, stats) if return_stats else result
+
+    @contextmanager
+    def record_stats(self, stats):
+        """
+        Time the block as the parse_file span of stats, then keep the stats in last_stats and record them in the
+        metrics registry. The stats are not activated, see metrics.collect.
+        """
+        status = "failure"
+        try:
+            with stats.span("parse_file"):
+                yield stats
+            status = "success"
+        except GeneratorExit:
+            # a parse_file_iter consumer stopped early, nothing failed
+            status = "success"
+            raise
+        finally:
+            if stats.enabled:
+                self.last_stats = stats
+                if self.metrics_registry is not None:
+                    self.metrics_registry.record(stats, status)
+
+    def _parse_file(self, input_file_path, file_source, response_type, response_options):
+        self.resolve_file_config(input_file_path, file_source)
+        self._logger.print_log(LogLevel.WARNING.value, self._file_name, "FileParser :: parse_file", input_path=input_file_path)
+        if response_type == ParsedDataResponseType.FILE.value and self.get_response_options(response_options).get("chunksize") is not None:
+            # a cached result is written as it is, a parsed one is never stored as that would hold the whole file
+            options = self.get_response_options(response_options)
+            df = self.get_cached_result(input_file_path)
+            if df is not None:
+                metrics.current_stats().add("cache_hits")
+                return response_formats.write_csv(self._time_writes([df], response_type), self._file_name, options)
+            chunks = self._iter_sanitized_chunks(input_file_path, file_source, self.file_config, options["chunksize"])
+            return response_formats.write_csv(self._time_writes(chunks, response_type), self._file_name, options)
+        cache_key = self.get_result_cache_key(input_file_path)
+        df = self.result_cache.get(cache_key) if cache_key is not None else None
+        if cache_key is not None:
+            metrics.current_stats().add("cache_hits" if df is not None else "cache_misses")
+        if df is None:
+            file_dtype = self.file_config["file_dtype"]
+            df = self.fetch_data_from_s3_using_input_path(input_file_path, file_dtype)
+
+            df = self.sanitize_file(df)
+            df = self.apply_memory_profile(df)
+            if cache_key is not None:
+                self.store_result_in_cache(cache_key, df)
+        else:
+            self._logger.print_log(LogLevel.INFO.value, self._file_name, "FileParser :: parse_file :: result cache hit")
+
+        return self.format_response(df, response_type, response_options)
+
+    @staticmethod
+    def _time_writes(chunks, response_type):
+        # the serialize span of a chunk is open while the consumer writes it, reading the next chunk isn't timed
+        stats = metrics.current_stats()
+        for chunk in chunks:
+            with stats.span("serialize", response_type=response_type, rows_in=chunk.shape[0]):
+                yield chunk
+
+    def get_result_cache_identity(self, input_file_path):
+        """(location, version tag) of the object for the result cache key, None when the result cache is not used."""
+        if self.result_cache is None or self.file_config.get(file_parser_constants.use_result_cache, True) is False:
+            return None
+        try:
+            return self.s3_file_parser.get_storage_backend(input_file_path).get_cache_identity(input_file_path)
+        except Exception as e:
+            self._logger.print_log(LogLevel.WARNING.value, self._file_name, "FileParser :: get_result_cache_key :: cache skipped :: " + str(e))
+            return None
 
-        df = self.sanitize_file(df)
+    def get_result_cache_key(self, input_file_path, cache_identity=None):
+        if cache_identity is None:
+            cache_identity = self.get_result_cache_identity(input_file_path)
+        if cache_identity is None:
+            return None
+        location, version_tag = cache_identity
+        if self._edge_case_version is None:
+            self._edge_case_version = get_edge_case_version(self.edge_cases)
+        return ResultCache.build_key(location, version_tag, get_config_hash(self.file_config), self._edge_case_version)
 
+    def get_cached_result(self, input_file_path, cache_identity=None):
+        """Return the cached sanitized dataframe of input_file_path, looked up without downloading the object, None on a miss."""
+        cache_key = self.get_result_cache_key(input_file_path, cache_identity)
+        if cache_key is None or not self.result_cache.contains(cache_key):
+            return None
+        return self.result_cache.get(cache_key)
+
+    def store_result_in_cache(self, cache_key, df):
+        try:
+            self.result_cache.put(cache_key, df)
+        except Exception as e:
+            # e.g. mixed type object columns which parquet can't store, the parse itself has succeeded
+            self._logger.print_log(LogLevel.WARNING.value, self._file_name, "FileParser :: store_result_in_cache :: failed to cache result :: " + str(e))
+
+    def get_response_options(self, response_options):
+        return {**(self.file_config.get(file_parser_constants.response_options) or {}), **(response_options or {})}
+
+    def format_response(self, df, response_type, response_options=None):
+        with metrics.current_stats().span("serialize", response_type=response_type, rows_in=df.shape[0]):
+            return self._format_response(df, response_type, response_options)
+
+    def _format_response(self, df, response_type, response_options=None):
         if response_type == ParsedDataResponseType.JSON.value:
             return df.to_json(orient="records")
+        elif response_type == ParsedDataResponseType.ARROW.value:
+            return response_formats.to_arrow(df, self.get_response_options(response_options))
+        elif response_type == ParsedDataResponseType.PARQUET.value:
+            return response_formats.to_parquet(df, self.get_response_options(response_options))
         elif response_type == ParsedDataResponseType.FILE.value:
-            file_path = f"parsed_{self._file_name}"
-            df.to_csv(file_path, index=False)
-            try:
-                return file_path
-            finally:
-                os.remove(file_path)  # Clean up the file immediately
+            return response_formats.write_csv([df], self._file_name, self.get_response_options(response_options))
         else:
             return df
+
+    async def parse_file_async(self, input_file_path=None, file_source = None, response_type = None, executor = None, response_options = None, return_stats = False):
+        """
+        asyncio counterpart of parse_file. The S3 download runs on this parser's I/O thread pool and decoding plus
+        sanitizing run in executor (the loop's default executor when None, a ProcessPoolExecutor is supported), so the
+        event loop is never blocked. The result cache is checked before the download, a hit is not downloaded at
+        all. At most max_async_parses (top level config, default 8) files are parsed at once.
+        Args:
+            file_path (str): Path to the file to be parsed.
+            file_source: file source name in configuration
+            executor: concurrent.futures executor for the CPU bound part
+            response_options: options of the response type, see parse_file
+            return_stats: return (parsed data, utils.metrics.ParseStats of the call), see parse_file
+        Returns: parsed data as response_type
+        """
+        # parse on a copy as the parser keeps the active file source on the instance
+        parser = copy.copy(self)
+        parser.resolve_file_config(input_file_path, file_source)
+        loop = asyncio.get_running_loop()
+        async with self.get_async_semaphore(loop):
+            stats = self.new_stats(input_file_path, file_source, return_stats)
+            with self.record_stats(stats):
+                result = await parser._parse_file_async(loop, self.get_io_executor(), stats, input_file_path, file_source, response_type, executor, response_options)
+        return (result, stats) if return_stats else result
+
+    async def _parse_file_async(self, loop, io_executor, stats, input_file_path, file_source, response_type, executor, response_options):
+        # executor threads don't inherit the active stats, every step runs with stats activated explicitly
+        cache_identity = await loop.run_in_executor(io_executor, metrics.run_with_stats, stats, self.get_result_cache_identity, input_file_path)
+        df = None
+        if cache_identity is not None:
+            df = await loop.run_in_executor(io_executor, self.get_cached_result, input_file_path, cache_identity)
+        if df is not None:
+            stats.add("cache_hits")
+            self._logger.print_log(LogLevel.INFO.value, self._file_name, "FileParser :: parse_file_async :: result cache hit")
+            format_executor = None if isinstance(executor, ProcessPoolExecutor) else executor
+            return await loop.run_in_executor(format_executor, metrics.run_with_stats, stats, self.format_response, df, response_type, response_options)
+        data = await loop.run_in_executor(io_executor, metrics.run_with_stats, stats, self.s3_file_parser.read_object_bytes, input_file_path)
+        prefetched_objects = {input_file_path: data}
+        # the parse keys the result cache by the identity looked up above, like a parse_file of the object
+        cache_identities = {input_file_path: cache_identity} if cache_identity is not None else None
+        if isinstance(executor, ProcessPoolExecutor):
+            result = await loop.run_in_executor(executor, parse_prefetched_file, self._config, input_file_path, file_source, response_type,
+                                                prefetched_objects, response_options, cache_identities, stats.enabled)
+            if not stats.enabled:
+                return result
+            result, (spans, counters) = result
+            stats.merge(spans, counters)
+            return result
+        self.s3_file_parser = self.s3_file_parser.with_prefetched_objects(prefetched_objects, cache_identities)
+        return await loop.run_in_executor(executor, metrics.run_with_stats, stats, self._parse_file, input_file_path, file_source, response_type, response_options)
+
+    def get_max_async_parses(self):
+        return self._config.get(file_parser_constants.max_async_parses) or file_parser_constants.default_max_async_parses
+
+    def get_async_semaphore(self, loop):
+        with self._async_lock:
+            semaphore = self._async_semaphores.get(loop)
+            if semaphore is None:
+                semaphore = asyncio.Semaphore(self.get_max_async_parses())
+                self._async_semaphores = {running_loop: running_semaphore for running_loop, running_semaphore in self._async_semaphores.items() if not running_loop.is_closed()}
+                self._async_semaphores[loop] = semaphore
+            return semaphore
+
+    def get_io_executor(self):
+        with self._async_lock:
+            if self._io_executor is None:
+                self._io_executor = ThreadPoolExecutor(max_workers=self.get_max_async_parses(), thread_name_prefix="file-parser-io")
+            return self._io_executor
+
+    def parse_file_iter(self, input_file_path=None, file_source = None, chunksize = None):
+        """
+        Streaming counterpart of parse_file. The file is read chunksize rows at a time and every chunk is
+        sanitized (edge cases, column mapping and filters) before it is yielded, so the whole file never has to fit
+        in memory. Footer rows configured through skipfooter are trimmed across chunk boundaries. Stats are
+        recorded while chunks are read, their parse_file span lasts until the generator is exhausted or closed.
+        Args:
+            file_path (str): Path to the file to be parsed.
+            file_source: file source name in configuration
+            chunksize: rows per chunk, falls back to "chunksize" of the file source and then to default_chunksize
+        Returns: generator of sanitized dataframes
+        """
+        file_config = self.resolve_file_config(input_file_path, file_source)
+        if chunksize is None:
+            chunksize = file_config.get("chunksize", file_parser_constants.default_chunksize)
+        self._logger.print_log(LogLevel.WARNING.value, self._file_name, "FileParser :: parse_file_iter",
+                               input_path=input_file_path, chunksize=chunksize)
+        stats = self.new_stats(input_file_path, file_source)
+        return self._iter_recorded(stats, self._iter_sanitized_chunks(input_file_path, file_source, file_config, chunksize, stats))
+
+    def _iter_recorded(self, stats, chunks):
+        with self.record_stats(stats):
+            yield from chunks
+
+    def _iter_sanitized_chunks(self, input_file_path, file_source, file_config, chunksize, stats=None):
+        # stats are activated while a chunk is produced only, never across a yield into the consumer's code
+        stats = metrics.current_stats() if stats is None else stats
+        file_name = self._file_name
+        profile = memory_profile.get_profile(file_config.get(file_parser_constants.memory_profile))
+        plan = None
+        with metrics.collect(stats):
+            chunks = iter(self.fetch_chunks_from_s3_using_input_path(input_file_path, file_config["file_dtype"], chunksize))
+        while True:
+            with metrics.collect(stats):
+                chunk = next(chunks, None)
+                if chunk is None:
+                    return
+                # the parser keeps the active file source on the instance, restore it in case another parse ran in between
+                self._file_name, self._file_source, self.file_config = file_name, file_source, file_config
+                chunk = self.sanitize_file(chunk)
+                if chunk.shape[0] > 0:
+                    if profile is not None and plan is None:
+                        # planned once from the first chunk so every chunk gets the same dtypes
+                        plan = memory_profile.plan_dtypes(chunk, profile, chunked=True)
+                    chunk = self.apply_memory_profile(chunk, plan)
+            if chunk.shape[0] > 0:
+                yield chunk
     
     def get_dynamic_password(self):
             password = ""
@@ -247,4 +684,26 @@ class FileParser:
                 return password
             except Exception as e:
                 self._logger.print_log(LogLevel.EXCEPTION.value, self._file_name,
-                                      "Exception Occurred getting dynamic password:: " + str(e))
\ No newline at end of file
+                                      "Exception Occurred getting dynamic password:: " + str(e))
+
+
+def parse_zip_member_bytes(config, member_bytes, input_file_path, file_type, parse_kwargs):
+    """Process pool entry point for decode_zip_members, runs in the worker process."""
+    s3_file_parser = S3FileParser(CustomLogger(config.get(file_parser_constants.log_config)), config)
+    return s3_file_parser.creating_df_based_on_file_types(io.BytesIO(member_bytes), input_file_path, file_type, **parse_kwargs)
+
+
+def parse_prefetched_file(config, input_file_path, file_source, response_type, prefetched_objects, response_options=None,
+                          cache_identities=None, collect_stats=False):
+    """
+    Process pool entry point for parse_file_async, parses already downloaded objects without any S3 I/O. With
+    collect_stats returns (parsed data, ParseStats.snapshot()) for the stats of the calling process.
+    """
+    parser = FileParser(config)
+    parser.s3_file_parser = parser.s3_file_parser.with_prefetched_objects(prefetched_objects, cache_identities)
+    if not collect_stats:
+        return parser.parse_file(input_file_path, file_source, response_type, response_options)
+    stats = metrics.ParseStats(input_file_path, file_source)
+    with metrics.collect(stats):
+        result = parser._parse_file(input_file_path, file_source, response_type, response_options)
+    return result, stats.snapshot()
@@ -0,0 +1,80 @@
+"""
+    Works out which columns of an input file a file_source actually uses, so that readers only materialize those.
+    Pruning is opt-in through prune_columns, columns nothing reads are then dropped from the output as well.
+    A column is needed when columns_mapping renames it, filter_based_on_status filters on it, dropna_column or
+    required_columns names it, or an edge case reads it. Built-in transforms declare their inputs through their
+    parameters, user_edge_cases functions through an input_columns attribute or edge_case_columns in the
+    file_source. A user edge case without declared inputs may read any column and disables pruning.
+"""
+from . import file_parser_constants, filter_engine, transforms
+
+
+class ColumnSelector:
+    """Picklable usecols callable selecting columns by name, selected names missing from the file are ignored."""
+
+    def __init__(self, columns):
+        self.columns = frozenset(columns)
+
+    def __call__(self, name):
+        return name in self.columns
+
+    def __eq__(self, other):
+        return isinstance(other, ColumnSelector) and other.columns == self.columns
+
+    def __hash__(self):
+        return hash(self.columns)
+
+    def __repr__(self):
+        return f"ColumnSelector({sorted(self.columns, key=str)})"
+
+
+def get_transform_input_columns(params):
+    columns = set()
+    for transform_params in (params if isinstance(params, list) else [params]):
+        transform_params = transform_params or {}
+        columns.update(transform_params.get("columns") or [])
+        columns.update(transform_params.get("dtypes", {}).keys())
+        for key in ["column", "currency_column"]:
+            if transform_params.get(key) is not None:
+                columns.add(transform_params[key])
+    return columns
+
+
+def get_edge_case_input_columns(file_config, edge_cases):
+    """Columns read by the edge cases of a file_source, None when an edge case doesn't declare them."""
+    columns = set()
+    declared_columns = file_config.get(file_parser_constants.edge_case_columns) or {}
+    for condition_name, params in (file_config.get("edge_case") or {}).items():
+        edge_case_func = getattr(edge_cases, condition_name, None) if edge_cases is not None else None
+        if condition_name in declared_columns:
+            columns.update(declared_columns[condition_name])
+        elif edge_case_func is not None:
+            input_columns = getattr(edge_case_func, file_parser_constants.input_columns, None)
+            if input_columns is None:
+                return None
+            columns.update(input_columns)
+        elif transforms.get_builtin_transform(condition_name) is not None:
+            columns.update(get_transform_input_columns(params))
+        else:
+            return None
+    return columns
+
+
+def get_required_columns(file_config, edge_cases=None):
+    """Set of raw column names a file_source needs, None when every column has to be read."""
+    if file_config.get(file_parser_constants.prune_columns, False) is not True:
+        return None
+    columns_mapping = file_config.get("columns_mapping") or {}
+    if len(columns_mapping) == 0:
+        return None
+    edge_case_columns = get_edge_case_input_columns(file_config, edge_cases)
+    if edge_case_columns is None:
+        return None
+    # filters run after the columns are renamed
+    source_columns = {target: source for source, target in columns_mapping.items()}
+    filter_columns = filter_engine.get_filter_columns(file_config.get("filter_based_on_status"))
+    columns = set(columns_mapping) | edge_case_columns | {source_columns.get(column, column) for column in filter_columns}
+    columns.update(file_config.get(file_parser_constants.required_columns) or [])
+    if file_config.get("dropna_column") is not None:
+        columns.add(file_config["dropna_column"])
+    return columns
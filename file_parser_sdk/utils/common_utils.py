@@ -1,7 +1,7 @@
 import pandas as pd
 from datetime import date
 from ..exceptions.expcetion import FileProcessFailException 
-from ..enums.FilterType import FilterType
+from . import filter_engine
 
 def get_dynamic_password_based_on_time():
         try:
@@ -14,13 +14,23 @@ def get_dynamic_password_based_on_time():
                   "Exception Occurred while getting dynamic password:: "+str(e))
         
 def filter_entries_by_transaction_types_list(df, column_name, filter_value_list, filter_type):
+    """Keep the rows whose column_name matches any of filter_value_list, in one pass and in the original order."""
     if filter_value_list is None or filter_type is None:
         return df
-    filtered_df = pd.DataFrame({})
-    for filter_value in filter_value_list:
-        if filter_type == FilterType.EQUALS.value:
-            current_filtered_df = df[df[column_name] == filter_value]
-        elif filter_type == FilterType.STARTSWITH.value:
-            current_filtered_df = df[df[column_name].str.startswith(filter_value)]
-        filtered_df = pd.concat([filtered_df, current_filtered_df])
-    return filtered_df
\ No newline at end of file
+    return filter_engine.apply_filter(df, {"filter_column": column_name, "filter_type": filter_type, "filter_values": filter_value_list})
+
+def trim_footer_from_chunks(chunks, skip_footer):
+    """
+        Drop the last skip_footer rows of a chunked read. The tail of every chunk is held back until the
+        next chunk arrives, so only rows which are known not to belong to the footer are yielded.
+    """
+    pending = None
+    for chunk in chunks:
+        if pending is not None:
+            chunk = pd.concat([pending, chunk])
+        if chunk.shape[0] <= skip_footer:
+            pending = chunk
+            continue
+        pending = chunk.iloc[-skip_footer:]
+        # copy so that edge cases can assign columns on the chunk without writing into a view
+        yield chunk.iloc[:-skip_footer].copy()
@@ -0,0 +1,75 @@
+import csv
+import io
+import re
+
+import numpy as np
+import pandas as pd
+
+from . import file_parser_constants
+
+
+def _render_column(values):
+    """The fields of a column as to_csv renders them (dates, floats, booleans, "" for missing values), unquoted."""
+    text = values.to_frame().to_csv(header=False, index=False, quoting=csv.QUOTE_ALL, lineterminator="\n")
+    return pd.Series([row[0] if row else "" for row in csv.reader(io.StringIO(text))], index=values.index, dtype=object)
+
+
+def _is_number(values):
+    # the fields csv.QUOTE_NONNUMERIC leaves unquoted, ints (booleans included) and floats but not missing values
+    if pd.api.types.is_numeric_dtype(values.dtype):
+        return values.notna()
+    return values.map(lambda value: isinstance(value, (int, float, np.integer, np.floating)) and not pd.isna(value)).astype(bool)
+
+
+def _quote(text, sep, quoting, is_number=None, lone_field=False):
+    """
+    Quote the rendered fields of a column like the csv module does for quoting, with sep as the delimiter.
+    lone_field: the column is the only field of its rows.
+    """
+    if quoting == csv.QUOTE_ALL:
+        needs_quotes = pd.Series(True, index=text.index)
+    elif quoting == csv.QUOTE_NONNUMERIC:
+        needs_quotes = ~is_number if is_number is not None else pd.Series(True, index=text.index)
+    else:
+        needs_quotes = text.str.contains("|".join(re.escape(token) for token in [sep, '"', "\n", "\r"]), regex=True)
+        if quoting == csv.QUOTE_NONE:
+            if needs_quotes.any():
+                raise csv.Error("need to escape, but no escapechar set")
+            return text
+    # a lone empty field is quoted so the row isn't mistaken for a blank line
+    if lone_field and quoting == csv.QUOTE_MINIMAL:
+        needs_quotes = needs_quotes | (text == "")
+    if needs_quotes.any():
+        text = text.where(~needs_quotes, '"' + text.str.replace('"', '""', regex=False) + '"')
+    return text
+
+
+def _write_multi_char_delimited(df, text_stream, sep, quoting, header):
+    if header:
+        text_stream.write(sep.join(_quote(pd.Series(df.columns.map(str), dtype=object), sep, quoting, lone_field=df.shape[1] == 1)) + "\n")
+    if len(df) == 0:
+        return
+    columns = []
+    for position in range(df.shape[1]):
+        values = df.iloc[:, position]
+        is_number = _is_number(values) if quoting == csv.QUOTE_NONNUMERIC else None
+        columns.append(_quote(_render_column(values), sep, quoting, is_number, lone_field=df.shape[1] == 1))
+    if not columns:
+        return
+    lines = columns[0].str.cat(columns[1:], sep=sep) if len(columns) > 1 else columns[0]
+    text_stream.write("\n".join(lines) + "\n")
+
+
+def write_delimited(df, text_stream, sep=",", quoting=csv.QUOTE_MINIMAL, chunksize=file_parser_constants.default_upload_chunksize):
+    """
+    Write df as delimited text to text_stream, chunksize rows at a time so no more than one chunk is rendered at
+    once. Separators longer than one character (e.g. "~~"), which to_csv doesn't support, are written by joining
+    the columns rendered by to_csv and quoted according to quoting, where fields containing the separator count
+    as fields containing the delimiter.
+    """
+    for start in range(0, max(len(df), 1), chunksize):
+        chunk = df.iloc[start:start + chunksize]
+        if len(sep) == 1:
+            chunk.to_csv(text_stream, sep=sep, quoting=quoting, index=False, header=start == 0)
+        else:
+            _write_multi_char_delimited(chunk, text_stream, sep, quoting, header=start == 0)
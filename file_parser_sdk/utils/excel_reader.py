@@ -0,0 +1,379 @@
+import io
+import math
+import posixpath
+import zipfile
+from collections import deque
+
+import pandas as pd
+from lxml import etree
+
+_xlsx_signature = b"PK\x03\x04"
+_workbook_path = "xl/workbook.xml"
+_string_dtypes = (str, "str", "string")
+_relationship_id = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}id"
+
+
+def is_streaming_supported(file_obj):
+    """Only xlsx workbooks can be streamed, xls and xlsb files are left to pandas."""
+    position = file_obj.tell()
+    try:
+        if file_obj.read(len(_xlsx_signature)) != _xlsx_signature:
+            return False
+        file_obj.seek(position)
+        with zipfile.ZipFile(file_obj) as archive:
+            return _workbook_path in archive.NameToInfo
+    except zipfile.BadZipFile:
+        return False
+    finally:
+        file_obj.seek(position)
+
+
+def as_seekable(file_obj):
+    """
+    Return a seekable file object for the workbook. Members of zip archives are copied into memory as seeking
+    backwards in a compressed member restarts its decompression, every other seekable file is used as is.
+    """
+    if isinstance(file_obj, zipfile.ZipExtFile) or not (hasattr(file_obj, 'seekable') and file_obj.seekable()):
+        return io.BytesIO(file_obj.read())
+    return file_obj
+
+
+def _cast_number(value):
+    if "." in value or "E" in value or "e" in value:
+        return float(value)
+    return int(value)
+
+
+class XlsxWorkbook:
+    """
+        Minimal read-only xlsx reader. Sheet xml is parsed with lxml iterparse and cell values are converted like
+        openpyxl does in read-only, data-only mode (shared strings, booleans, date formatted numbers), but without
+        creating cell objects. Rows are yielded as tuples and every row element is cleared once read, so memory
+        stays flat regardless of the sheet size.
+    """
+
+    def __init__(self, file_obj):
+        from openpyxl.utils.datetime import CALENDAR_MAC_1904, CALENDAR_WINDOWS_1900
+
+        self._archive = zipfile.ZipFile(file_obj)
+        workbook = etree.fromstring(self._archive.read(_workbook_path))
+        targets = self._read_relationships("xl/_rels/workbook.xml.rels")
+        self._sheet_paths = {}
+        for sheet in workbook.iterfind("{*}sheets/{*}sheet"):
+            self._sheet_paths[sheet.get("name")] = targets[sheet.get(_relationship_id)][0]
+        workbook_properties = workbook.find("{*}workbookPr")
+        date1904 = workbook_properties is not None and workbook_properties.get("date1904") in ("1", "true")
+        self._epoch = CALENDAR_MAC_1904 if date1904 else CALENDAR_WINDOWS_1900
+        shared_strings_paths = [path for path, relationship_type in targets.values() if relationship_type.endswith("/sharedStrings")]
+        self._shared_strings = self._read_shared_strings(shared_strings_paths[0]) if shared_strings_paths else []
+        styles_paths = [path for path, relationship_type in targets.values() if relationship_type.endswith("/styles")]
+        self._date_styles, self._timedelta_styles = self._read_date_styles(styles_paths[0]) if styles_paths else (set(), set())
+
+    @property
+    def sheetnames(self):
+        return list(self._sheet_paths)
+
+    def _read_relationships(self, path):
+        if path not in self._archive.NameToInfo:
+            return {}
+        relationships = {}
+        for relationship in etree.fromstring(self._archive.read(path)).iterfind("{*}Relationship"):
+            target = relationship.get("Target")
+            target = target.lstrip("/") if target.startswith("/") else posixpath.normpath(posixpath.join("xl", target))
+            relationships[relationship.get("Id")] = (target, relationship.get("Type", ""))
+        return relationships
+
+    def _read_shared_strings(self, path):
+        shared_strings = []
+        with self._archive.open(path) as source:
+            for _, element in etree.iterparse(source, tag="{*}si"):
+                text = element.find("{*}t")
+                if text is not None:
+                    shared_strings.append(text.text or "")
+                else:
+                    # rich text runs, phonetic runs (rPh) are not part of the value
+                    shared_strings.append("".join(run.text or "" for run in element.iterfind("{*}r/{*}t")))
+                element.clear()
+        return shared_strings
+
+    def _read_date_styles(self, path):
+        from openpyxl.styles.numbers import BUILTIN_FORMATS, is_date_format, is_timedelta_format
+
+        styles = etree.fromstring(self._archive.read(path))
+        number_formats = dict(BUILTIN_FORMATS)
+        for number_format in styles.iterfind("{*}numFmts/{*}numFmt"):
+            number_formats[int(number_format.get("numFmtId"))] = number_format.get("formatCode")
+        date_styles, timedelta_styles = set(), set()
+        for style_id, cell_format in enumerate(styles.iterfind("{*}cellXfs/{*}xf")):
+            format_code = number_formats.get(int(cell_format.get("numFmtId", 0)))
+            if format_code and is_date_format(format_code):
+                date_styles.add(str(style_id))
+                if is_timedelta_format(format_code):
+                    timedelta_styles.add(str(style_id))
+        return date_styles, timedelta_styles
+
+    def _get_sheet_path(self, sheet_name):
+        if sheet_name is None or isinstance(sheet_name, int):
+            return list(self._sheet_paths.values())[sheet_name or 0]
+        if sheet_name not in self._sheet_paths:
+            raise ValueError(f"Worksheet named '{sheet_name}' not found")
+        return self._sheet_paths[sheet_name]
+
+    def _convert_value(self, cell, data_type, value, tags):
+        if data_type == "inlineStr":
+            inline_string = cell.find(tags["is"])
+            if inline_string is None:
+                return None
+            text = inline_string.find(tags["t"])
+            if text is not None:
+                return text.text or ""
+            return "".join(run.findtext(tags["t"]) or "" for run in inline_string.iterfind(tags["r"]))
+        if not value:
+            return None
+        if data_type == "n":
+            value = _cast_number(value)
+            style_id = cell.get("s")
+            if style_id in self._date_styles:
+                from openpyxl.utils.datetime import from_excel
+                try:
+                    return from_excel(value, self._epoch, timedelta=style_id in self._timedelta_styles)
+                except (OverflowError, ValueError):
+                    return math.nan
+            return value
+        if data_type == "b":
+            return bool(int(value))
+        if data_type == "e":
+            return math.nan
+        if data_type == "d":
+            from openpyxl.utils.datetime import from_ISO8601
+            return from_ISO8601(value)
+        return value
+
+    def iter_rows(self, sheet_name=None):
+        """Yield the rows of a sheet as tuples of values, missing rows in between are yielded as empty tuples."""
+        from openpyxl.utils.cell import column_index_from_string
+
+        row_number = 0
+        tags = None
+        column_indexes = {}
+        shared_strings = self._shared_strings
+        date_styles = self._date_styles
+        with self._archive.open(self._get_sheet_path(sheet_name)) as source:
+            for _, row in etree.iterparse(source, tag="{*}row"):
+                if tags is None:
+                    # exact tags are much cheaper to match than {*} wildcards
+                    namespace = row.tag[:row.tag.index("}") + 1] if row.tag.startswith("{") else ""
+                    tags = {name: namespace + name for name in ["c", "v", "is", "t", "r"]}
+                    cell_tag, value_tag, text_tag = tags["c"], tags["v"], tags["t"]
+                current_row_number = int(row.get("r", row_number + 1))
+                for _ in range(current_row_number - row_number - 1):
+                    yield ()
+                row_number = current_row_number
+                values = []
+                for cell in row:
+                    if cell.tag != cell_tag:
+                        continue
+                    reference = cell.get("r")
+                    if reference:
+                        letters = reference.rstrip("0123456789")
+                        column = column_indexes.get(letters)
+                        if column is None:
+                            column = column_indexes[letters] = column_index_from_string(letters)
+                        if column > len(values) + 1:
+                            values.extend([None] * (column - len(values) - 1))
+                    # the value is the last child, after the formula of formula cells
+                    last_child = cell[-1] if len(cell) else None
+                    value = last_child.text if last_child is not None and last_child.tag == value_tag else None
+                    data_type = cell.get("t", "n")
+                    # strings and plain numbers are by far the most common cells, convert them inline
+                    if data_type == "s" and value:
+                        values.append(shared_strings[int(value)])
+                    elif data_type == "n" and value and cell.get("s") not in date_styles:
+                        values.append(_cast_number(value))
+                    elif data_type == "inlineStr" and last_child is not None and len(last_child) == 1 and last_child[0].tag == text_tag:
+                        values.append(last_child[0].text or "")
+                    else:
+                        values.append(self._convert_value(cell, data_type, value, tags))
+                yield tuple(values)
+                row.clear()
+                # drop the already processed rows from the partially built tree
+                while row.getprevious() is not None:
+                    del row.getparent()[0]
+
+    def close(self):
+        self._archive.close()
+
+
+def open_workbook(file_obj):
+    return XlsxWorkbook(file_obj)
+
+
+def _get_column_names(header_row, width):
+    """Return the column names and the header names they were deduplicated from, file_dtype applies to both."""
+    names = []
+    header_names = []
+    seen = {}
+    for index in range(width):
+        name = header_row[index] if index < len(header_row) else None
+        if name is None or name == "":
+            name = f"Unnamed: {index}"
+        header_names.append(name)
+        # duplicated headers are renamed like pandas does, a, a.1, a.2 ...
+        if name in seen:
+            seen[name] += 1
+            deduplicated_name = f"{name}.{seen[name]}"
+            while deduplicated_name in seen:
+                seen[name] += 1
+                deduplicated_name = f"{name}.{seen[name]}"
+            name = deduplicated_name
+        seen[name] = 0
+        names.append(name)
+    return names, header_names
+
+
+def _select_columns(names, usecols):
+    if usecols is None:
+        return list(range(len(names)))
+    if callable(usecols):
+        return [index for index, name in enumerate(names) if usecols(name)]
+    positions = {name: index for index, name in enumerate(names)}
+    selected = []
+    for column in usecols:
+        if isinstance(column, int):
+            selected.append(column)
+        elif column in positions:
+            selected.append(positions[column])
+        else:
+            raise ValueError(f"Usecols do not match columns, columns expected but not found: {column}")
+    return sorted(set(selected))
+
+
+def _get_dtype(dtype, name):
+    if isinstance(dtype, dict):
+        return dtype.get(name)
+    return dtype
+
+
+def _to_str(value):
+    if isinstance(value, float):
+        if math.isnan(value):
+            return value
+        if value.is_integer():
+            return str(int(value))
+    return str(value)
+
+
+def _build_column(values, dtype):
+    values = [math.nan if value is None or value == "" else value for value in values]
+    if dtype in _string_dtypes:
+        return pd.Series([_to_str(value) for value in values], dtype=object)
+    series = pd.Series(values)
+    if dtype is not None:
+        series = series.astype(dtype)
+    return series
+
+
+class _ColumnCollector:
+    """Appends the values of rows to a list per kept column, columns are kept as they appear in wider rows."""
+
+    def __init__(self, header_row, header, usecols):
+        self._header_row = header_row
+        self._header = header
+        self._usecols = usecols
+        self._usecols_positions = set(column for column in usecols if isinstance(column, int)) if isinstance(usecols, (list, tuple, set)) else set()
+        self.width = 0
+        self.row_count = 0
+        self.values = {}
+
+    def _is_kept(self, index, name):
+        if self._usecols is None or index in self._usecols_positions:
+            return True
+        return self._usecols(name) if callable(self._usecols) else name in self._usecols
+
+    def add(self, row, count=1):
+        if len(row) > self.width:
+            names = list(range(len(row))) if self._header is None else _get_column_names(self._header_row, len(row))[0]
+            for index in range(self.width, len(row)):
+                if self._is_kept(index, names[index]):
+                    self.values[index] = [None] * self.row_count
+            self.width = len(row)
+        for index, values in self.values.items():
+            value = row[index] if index < len(row) else None
+            if count == 1:
+                values.append(value)
+            else:
+                values.extend([value] * count)
+        self.row_count += count
+
+
+def read_sheet(rows, dtype=None, header=0, skiprows=0, usecols=None, skip_footer=0):
+    """
+        Build a dataframe from the row tuples of a sheet. Only the columns selected through usecols (names,
+        positions or a callable on the column name) are materialized and columns with a file_dtype entry are typed
+        directly, str columns are rendered like pd.read_excel(dtype=str). Rows are consumed one at a time, only
+        the skip_footer last rows and a count of trailing blank rows are held back until the sheet ends.
+    """
+    rows = iter(rows)
+    for _ in range(skiprows or 0):
+        if next(rows, None) is None:
+            break
+    header_row = None
+    if header is not None:
+        for _ in range(header + 1):
+            header_row = next(rows, None)
+        header_row = header_row or ()
+    collector = _ColumnCollector(header_row, header, usecols)
+    footer = deque()
+
+    def add(row, count=1):
+        if skip_footer <= 0:
+            collector.add(row, count)
+            return
+        for _ in range(count):
+            footer.append(row)
+            if len(footer) > skip_footer:
+                collector.add(footer.popleft())
+
+    # blank rows are held back until a row with values follows, trailing blank rows are reported for
+    # formatted but empty cells
+    blank_count = 0
+    blank_width = 0
+    for row in rows:
+        if row.count(None) == len(row):
+            blank_count += 1
+            blank_width = max(blank_width, len(row))
+            continue
+        if blank_count > 0:
+            add((None,) * blank_width, blank_count)
+            blank_count = blank_width = 0
+        add(row)
+
+    width = max(len(header_row or ()), collector.width)
+    if header is not None:
+        names, header_names = _get_column_names(header_row, width)
+    else:
+        names = header_names = list(range(width))
+    columns = {}
+    for index in _select_columns(names, usecols):
+        values = collector.values.get(index, [None] * collector.row_count)
+        columns[names[index]] = _build_column(values, _get_dtype(dtype, header_names[index]))
+    return pd.DataFrame(columns, index=pd.RangeIndex(collector.row_count))
+
+
+def read_excel_sheets(file_obj, sheet_names=None, **kwargs):
+    """Open the workbook once and read the given sheets (all when None), returns {sheet name: dataframe}."""
+    workbook = open_workbook(as_seekable(file_obj))
+    try:
+        sheet_names = workbook.sheetnames if sheet_names is None else sheet_names
+        return {sheet_name: read_sheet(workbook.iter_rows(sheet_name), **kwargs) for sheet_name in sheet_names}
+    finally:
+        workbook.close()
+
+
+def read_excel(file_obj, sheet_name=None, **kwargs):
+    """Streaming counterpart of pd.read_excel for a single sheet, the first sheet when sheet_name is None."""
+    workbook = open_workbook(as_seekable(file_obj))
+    try:
+        return read_sheet(workbook.iter_rows(sheet_name), **kwargs)
+    finally:
+        workbook.close()
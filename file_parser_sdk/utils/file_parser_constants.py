@@ -31,4 +31,79 @@ settlement_account = "settlement_account"
 common_date_format = "%Y-%m-%d"
 mark_entry_type_based_on_sheets = "mark_entry_type_based_on_sheets"
 sheet_type = "sheet_type"
-column_name = "column_name"
\ No newline at end of file
+column_name = "column_name"
+default_chunksize = 100000
+zip_member_workers = "zip_member_workers"
+zip_member_executor = "zip_member_executor"
+zip_member_max_bytes_in_flight = "zip_member_max_bytes_in_flight"
+default_zip_member_max_bytes_in_flight = 256 * 1024 * 1024
+thread_executor = "thread"
+process_executor = "process"
+range_read_zip = "range_read_zip"
+s3_scheme_aliases = ["s3a", "s3n"]
+range_read_block_size = "range_read_block_size"
+range_read_cache_blocks = "range_read_cache_blocks"
+default_range_read_block_size = 1024 * 1024
+default_range_read_cache_blocks = 16
+max_pool_connections = "max_pool_connections"
+retry_max_attempts = "retry_max_attempts"
+retry_mode = "retry_mode"
+connect_timeout = "connect_timeout"
+read_timeout = "read_timeout"
+tcp_keepalive = "tcp_keepalive"
+endpoint_url = "endpoint_url"
+s3_client_options = [max_pool_connections, retry_max_attempts, retry_mode, connect_timeout, read_timeout, tcp_keepalive]
+default_max_pool_connections = 50
+default_retry_max_attempts = 5
+presign_region_name = "presign_region_name"
+default_presign_region_name = "ap-south-1"
+multipart_download_part_size = "multipart_download_part_size"
+multipart_download_concurrency = "multipart_download_concurrency"
+multipart_download_threshold = "multipart_download_threshold"
+default_multipart_download_part_size = 8 * 1024 * 1024
+default_multipart_download_concurrency = 8
+default_multipart_download_threshold = 64 * 1024 * 1024
+max_async_parses = "max_async_parses"
+default_max_async_parses = 8
+result_cache = "result_cache"
+use_result_cache = "use_result_cache"
+# bump when readers, built-in edge cases or transforms change what a parse returns, cached results are then not reused
+result_cache_version = "1"
+default_result_cache_max_size_bytes = 1024 * 1024 * 1024
+object_cache = "object_cache"
+default_object_cache_max_memory_bytes = 256 * 1024 * 1024
+default_object_cache_max_disk_bytes = 4 * 1024 * 1024 * 1024
+excel_engine = "excel_engine"
+pandas_excel_engine = "pandas"
+streaming_excel_engine = "streaming"
+excel_sheet_names = "excel_sheet_names"
+usecols = "usecols"
+sheet_workers = "sheet_workers"
+prune_columns = "prune_columns"
+required_columns = "required_columns"
+edge_case_columns = "edge_case_columns"
+input_columns = "input_columns"
+memory_profile = "memory_profile"
+response_options = "response_options"
+multipart_upload_part_size = "multipart_upload_part_size"
+multipart_upload_concurrency = "multipart_upload_concurrency"
+default_multipart_upload_part_size = 8 * 1024 * 1024
+default_multipart_upload_concurrency = 4
+min_multipart_upload_part_size = 5 * 1024 * 1024
+upload_chunksize = "upload_chunksize"
+default_upload_chunksize = 100000
+upload_concurrency = "upload_concurrency"
+default_upload_concurrency = 8
+xml_options = "xml_options"
+pdf_options = "pdf_options"
+pdf_jvm_backend = "jvm"
+pdf_subprocess_backend = "subprocess"
+default_pdf_workers = 4
+default_pdf_page_cache_entries = 1024
+default_pdf_page_column = "page"
+log_config = "log_config"
+log_level = "level"
+log_memory_usage = "memory_usage"
+memory_sample_interval = "memory_sample_interval"
+default_memory_sample_interval = 1.0
+metrics = "metrics"
@@ -0,0 +1,113 @@
+import re
+
+import pandas as pd
+
+from ..enums.FilterType import FilterType
+from ..exceptions.expcetion import ConfigMissingException
+
+_and = "and"
+_or = "or"
+_not = "not"
+_value_filter_types = {FilterType.EQUALS.value, FilterType.NOT_EQUALS.value, FilterType.STARTSWITH.value,
+                       FilterType.CONTAINS.value, FilterType.REGEX.value}
+
+
+def _get_column(df, predicate):
+    column_name = predicate.get("filter_column")
+    if column_name not in df.columns:
+        raise ConfigMissingException(f"Filter column {column_name} not found in the file")
+    return df[column_name]
+
+
+def _as_list(values):
+    if values is None:
+        return []
+    if isinstance(values, (list, tuple, set)):
+        return list(values)
+    return [values]
+
+
+def _to_bool(mask):
+    # string methods return NaN for missing values, which never match
+    return mask.astype("boolean").fillna(False).astype(bool)
+
+
+def _range_mask(column, predicate):
+    lower, upper = predicate.get("min"), predicate.get("max")
+    inclusive = predicate.get("inclusive", "both")
+    if column.dtype == object and all(bound is None or isinstance(bound, (int, float)) for bound in (lower, upper)):
+        column = pd.to_numeric(column, errors="coerce")
+    mask = pd.Series(True, index=column.index)
+    if lower is not None:
+        mask &= column >= lower if inclusive in ("both", "left") else column > lower
+    if upper is not None:
+        mask &= column <= upper if inclusive in ("both", "right") else column < upper
+    return _to_bool(mask)
+
+
+def _leaf_mask(df, predicate):
+    filter_type = predicate.get("filter_type", FilterType.EQUALS.value)
+    if filter_type is None or (filter_type in _value_filter_types and predicate.get("filter_values") is None):
+        # no filter_type or no filter_values configured, nothing is filtered out
+        return pd.Series(True, index=df.index)
+    column = _get_column(df, predicate)
+    values = _as_list(predicate.get("filter_values"))
+    if filter_type == FilterType.EQUALS.value:
+        return column.isin(values)
+    if filter_type == FilterType.NOT_EQUALS.value:
+        return ~column.isin(values)
+    if filter_type == FilterType.STARTSWITH.value:
+        return _to_bool(column.str.startswith(tuple(values)))
+    if filter_type == FilterType.CONTAINS.value:
+        return _to_bool(column.str.contains("|".join(re.escape(value) for value in values), regex=True))
+    if filter_type == FilterType.REGEX.value:
+        flags = re.IGNORECASE if predicate.get("ignore_case") else 0
+        return _to_bool(column.str.contains("|".join(f"(?:{value})" for value in values), regex=True, flags=flags))
+    if filter_type == FilterType.RANGE.value:
+        return _range_mask(column, predicate)
+    if filter_type == FilterType.IS_NULL.value:
+        return column.isna()
+    if filter_type == FilterType.NOT_NULL.value:
+        return column.notna()
+    raise ConfigMissingException(f"Unsupported filter_type = {filter_type}")
+
+
+def build_mask(df, predicate):
+    """
+        Evaluate a filter_based_on_status predicate into one boolean mask over df. A predicate is either a leaf
+        {"filter_column", "filter_type", "filter_values"} (plus "min"/"max"/"inclusive" for ranges and "ignore_case"
+        for regex) or a combination {"and": [...]}, {"or": [...]} or {"not": predicate}. Every leaf is a single
+        vectorized pass over its column.
+    """
+    if _and in predicate:
+        mask = pd.Series(True, index=df.index)
+        for child in predicate[_and]:
+            mask &= build_mask(df, child)
+        return mask
+    if _or in predicate:
+        mask = pd.Series(False, index=df.index)
+        for child in predicate[_or]:
+            mask |= build_mask(df, child)
+        return mask
+    if _not in predicate:
+        return ~build_mask(df, predicate[_not])
+    mask = _leaf_mask(df, predicate)
+    return ~mask if predicate.get("negate") else mask
+
+
+def apply_filter(df, predicate):
+    """Keep the rows of df matching predicate, in their original order. A None predicate keeps every row."""
+    if predicate is None or len(predicate) == 0:
+        return df
+    return df[build_mask(df, predicate).to_numpy()]
+
+
+def get_filter_columns(predicate):
+    """Columns read by a predicate."""
+    if predicate is None:
+        return set()
+    if _and in predicate or _or in predicate:
+        return set().union(*[get_filter_columns(child) for child in predicate.get(_and, predicate.get(_or))])
+    if _not in predicate:
+        return get_filter_columns(predicate[_not])
+    return {predicate["filter_column"]} if predicate.get("filter_column") is not None else set()
@@ -1,43 +1,71 @@
-import json_logging, logging, sys
+import json_logging, logging, sys, time
 import psutil
 from ..enums.LogLevel import LogLevel
+from . import file_parser_constants
 from psutil._common import bytes2human
 
+_logging_levels = {
+    LogLevel.INFO.value: logging.INFO,
+    LogLevel.WARNING.value: logging.WARNING,
+    LogLevel.WARN.value: logging.WARNING,
+    LogLevel.ERROR.value: logging.ERROR,
+    LogLevel.EXCEPTION.value: logging.ERROR,
+    LogLevel.CRITICAL.value: logging.CRITICAL,
+    LogLevel.DEBUG.value: logging.DEBUG,
+}
+
+
+def _resolve(value):
+    return value() if callable(value) else value
+
+
 class CustomLogger:
-    def __init__(self):
+    """
+        JSON logger of the SDK. log_config: level, the minimum level logged (default INFO), memory_usage, whether
+        the used memory is attached to records (default True), and memory_sample_interval, the seconds a memory
+        sample is reused for (default 1), so the memory is not read on every record. The level belongs to the
+        instance, loggers of different levels share the "fileparser-logger" handlers.
+    """
+
+    def __init__(self, log_config=None):
+        log_config = log_config or {}
         json_logging.ENABLE_JSON_LOGGING = True
         json_logging.init_non_web()
         self._logger = logging.getLogger("fileparser-logger")
         if not self._logger.handlers:
-            self._logger.setLevel(logging.INFO)
+            # records are filtered by the level of each CustomLogger, not by the shared logger
+            self._logger.setLevel(logging.DEBUG)
             self._logger.addHandler(logging.StreamHandler(sys.stdout))
-    
-    def print_log(self, log_level=LogLevel.INFO.value, prefix='', message='', postfix='', exc_info=False):
+        level = log_config.get(file_parser_constants.log_level)
+        self._level = logging.INFO if level is None else _logging_levels.get(level, level)
+        self._memory_usage = log_config.get(file_parser_constants.log_memory_usage, True)
+        self._memory_sample_interval = log_config.get(file_parser_constants.memory_sample_interval, file_parser_constants.default_memory_sample_interval)
+        self._memory_sample = None
+
+    def is_enabled_for(self, log_level):
+        level = _logging_levels.get(log_level)
+        return level is not None and level >= self._level and self._logger.isEnabledFor(level)
+
+    def get_memory_usage(self):
+        now = time.monotonic()
+        sample = self._memory_sample
+        if sample is None or now - sample[0] >= self._memory_sample_interval:
+            sample = self._memory_sample = (now, bytes2human(psutil.virtual_memory().used))
+        return sample[1]
+
+    def print_log(self, log_level=LogLevel.INFO.value, prefix='', message='', postfix='', exc_info=False, **fields):
+        """
+        Log prefix :: message :: postfix with the keyword fields as structured fields of the JSON record. Records
+        below the level of the logger return before anything is formatted, message and field values may be
+        callables which are only called when the record is emitted.
+        """
+        if not self.is_enabled_for(log_level):
+            return
         try:
-            prefix=str(prefix)
-            message=str(message)
-            postfix=str(postfix)
-            postfix = postfix + " memory usage :: " + str(bytes2human(psutil.virtual_memory().used))      
-            if log_level == LogLevel.INFO.value:
-                self._logger.info(prefix+" :: "+message+" :: " +
-                            postfix, exc_info=exc_info)
-            elif log_level == LogLevel.WARNING.value:
-                self._logger.warning(prefix+" :: "+message+" :: " +
-                            postfix, exc_info=exc_info)
-            elif log_level == LogLevel.WARN.value:
-                self._logger.warn(prefix+" :: "+message+" :: " +
-                            postfix, exc_info=exc_info)
-            elif log_level == LogLevel.ERROR.value:
-                self._logger.error(prefix+" :: "+message+" :: " +
-                            postfix, exc_info=exc_info)
-            elif log_level == LogLevel.EXCEPTION.value:
-                self._logger.exception(prefix+" :: "+message+" :: " +
-                                postfix, exc_info=exc_info)
-            elif log_level == LogLevel.DEBUG.value:
-                self._logger.debug(prefix+" :: "+message+" :: " +
-                            postfix, exc_info=exc_info)
-            elif log_level == LogLevel.CRITICAL.value:
-                self._logger.critical(prefix+" :: "+message+" :: " +
-                                postfix, exc_info=exc_info)
+            text = " :: ".join(str(part) for part in map(_resolve, (prefix, message, postfix)) if part is not None and part != '')
+            props = {name: _resolve(value) for name, value in fields.items()}
+            if self._memory_usage:
+                props["memory_usage"] = self.get_memory_usage()
+            self._logger.log(_logging_levels[log_level], text, exc_info=exc_info, extra={"props": props}, stacklevel=2)
         except Exception as e:
             self._logger.exception("print_log :: Exception while printing log :: "+str(e))
@@ -0,0 +1,62 @@
+import io
+
+
+class MappedFile(io.RawIOBase):
+    """
+        File object over a read-only mmap, from offset to the end of the mapping. Reads are served straight from
+        the mapping and getbuffer() exposes it as a memoryview for consumers which can work on a buffer without
+        any copy. close() closes the mapping, unless a buffer returned by getbuffer() is still in use, then the
+        mapping is released once the last of them is.
+    """
+
+    def __init__(self, mapping, offset=0):
+        super().__init__()
+        self._mapping = mapping
+        self._offset = offset
+        mapping.seek(offset)
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_SET:
+            offset += self._offset
+        self._mapping.seek(offset, whence)
+        return self.tell()
+
+    def tell(self):
+        return self._mapping.tell() - self._offset
+
+    def read(self, size=-1):
+        return self._mapping.read(size if size is not None else -1)
+
+    def readall(self):
+        return self._mapping.read()
+
+    def readinto(self, buffer):
+        data = self._mapping.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+    def readline(self, size=-1):
+        line = self._mapping.readline()
+        if size is not None and 0 <= size < len(line):
+            self._mapping.seek(size - len(line), io.SEEK_CUR)
+            line = line[:size]
+        return line
+
+    def close(self):
+        if self.closed:
+            return
+        super().close()
+        try:
+            self._mapping.close()
+        except BufferError:
+            # memoryviews of getbuffer() are still alive, the mapping is unmapped when they are garbage collected
+            pass
+
+    def getbuffer(self):
+        return memoryview(self._mapping)[self._offset:]
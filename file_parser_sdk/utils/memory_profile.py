@@ -0,0 +1,144 @@
+"""
+    Compact dtypes for parsed dataframes, enabled per file_source through memory_profile. Low cardinality text
+    columns become categoricals, the remaining text columns Arrow backed strings (with pyarrow installed) and
+    numeric columns are downcast to the smallest dtype holding their values. Floats are only narrowed to float32
+    when no value changes, unless float_downcast is "float32".
+"""
+import numpy as np
+import pandas as pd
+
+from ..exceptions.expcetion import ConfigMissingException
+
+_default_profile = {
+    "categorical_max_unique_ratio": 0.5,
+    "categorical_max_unique": 10000,
+    "downcast": True,
+    "float_downcast": "lossless",
+    "arrow_strings": True,
+    "exclude_columns": [],
+}
+
+
+def get_profile(memory_profile):
+    """Resolve the memory_profile setting of a file_source (True or a dict of overrides), None when disabled."""
+    if memory_profile is None or memory_profile is False:
+        return None
+    if memory_profile is True:
+        return dict(_default_profile)
+    if not isinstance(memory_profile, dict):
+        raise ConfigMissingException(f"memory_profile must be true or a dict, got {memory_profile!r}")
+    unknown_options = set(memory_profile) - set(_default_profile)
+    if unknown_options:
+        raise ConfigMissingException(f"Unknown memory_profile options {sorted(unknown_options)}")
+    return {**_default_profile, **memory_profile}
+
+
+def _has_arrow():
+    try:
+        import pyarrow  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def _is_text(series):
+    return (series.dtype == object or isinstance(series.dtype, pd.StringDtype)) and pd.api.types.infer_dtype(series, skipna=True) in ("string", "empty")
+
+
+def _downcast_float(series, float_downcast):
+    if series.dtype != np.float64 or float_downcast not in ("lossless", "float32"):
+        return series
+    narrowed = series.astype(np.float32)
+    if float_downcast == "lossless" and not np.array_equal(narrowed.to_numpy(dtype=np.float64), series.to_numpy(), equal_nan=True):
+        return series
+    return narrowed
+
+
+def _plan_column(series, profile, arrow_strings, chunked):
+    """Target dtype of a column, None when the column is kept as is."""
+    if _is_text(series):
+        unique_count = series.nunique(dropna=True)
+        # the categories of the first chunk would not hold the values of the following ones
+        if not chunked and unique_count <= profile["categorical_max_unique"] and unique_count <= len(series) * profile["categorical_max_unique_ratio"]:
+            return "category"
+        return "string[pyarrow]" if arrow_strings else None
+    if profile["downcast"]:
+        if pd.api.types.is_integer_dtype(series.dtype) and not pd.api.types.is_extension_array_dtype(series.dtype):
+            if chunked:
+                # the values of the following chunks may need a wider integer
+                return None
+            narrowed = pd.to_numeric(series, downcast="unsigned" if len(series) and series.min() >= 0 else "integer")
+            return narrowed.dtype if narrowed.dtype != series.dtype else None
+        if pd.api.types.is_float_dtype(series.dtype):
+            if chunked:
+                return np.dtype(np.float32) if series.dtype == np.float64 and profile["float_downcast"] == "float32" else None
+            narrowed = _downcast_float(series, profile["float_downcast"])
+            return narrowed.dtype if narrowed is not series else None
+    return None
+
+
+def plan_dtypes(df, profile, chunked=False):
+    """
+    Return the dtype plan of df, {column: (dtype, compacted dtype)} of every column compact_dataframe changes.
+    A chunked plan is made from the first chunk of a file and applied to every chunk, so it only holds dtypes
+    which don't depend on the values of the chunk: text columns become Arrow backed strings instead of
+    categoricals, integers keep their width and floats are narrowed only with float_downcast "float32". Every
+    chunk then gets the same dtypes and concatenated chunks keep them.
+    """
+    arrow_strings = profile["arrow_strings"] and _has_arrow()
+    excluded_columns = set(profile["exclude_columns"])
+    plan = {}
+    for position, column in enumerate(df.columns):
+        series = df.iloc[:, position]
+        if column not in excluded_columns and len(series) > 0:
+            dtype = _plan_column(series, profile, arrow_strings, chunked)
+            if dtype is not None:
+                plan[column] = (series.dtype, dtype)
+    return plan
+
+
+def _apply_column(series, column, plan, profile):
+    source_dtype, dtype = plan[column]
+    if series.dtype != source_dtype:
+        return series
+    if dtype in ("category", "string[pyarrow]"):
+        return series.astype(dtype) if _is_text(series) else series
+    if pd.api.types.is_integer_dtype(dtype) and len(series) and not np.can_cast(
+            pd.to_numeric(series, downcast="unsigned" if series.min() >= 0 else "integer").dtype, dtype):
+        raise ValueError(f"Values of {column} don't fit the planned {dtype}, plan the chunks with chunked=True")
+    if dtype == np.float32 and profile["float_downcast"] == "lossless" and _downcast_float(series, "lossless") is series:
+        raise ValueError(f"Values of {column} would change as float32, plan the chunks with chunked=True")
+    return series.astype(dtype)
+
+
+def compact_dataframe(df, profile, plan=None):
+    """
+    Return the compacted dataframe and a report of its memory before and after, measured with
+    memory_usage(deep=True), with the changed dtypes per column. plan is a plan_dtypes result to apply instead of
+    planning from df, a plan made from another dataframe must be a chunked one.
+    """
+    before = df.memory_usage(deep=True, index=False)
+    if plan is None:
+        plan = plan_dtypes(df, profile)
+    columns = {}
+    changed_dtypes = {}
+    for position, column in enumerate(df.columns):
+        series = df.iloc[:, position]
+        if column in plan:
+            compacted = _apply_column(series, column, plan, profile)
+            if compacted is not series:
+                changed_dtypes[column] = (str(series.dtype), str(compacted.dtype))
+                series = compacted
+        columns[position] = series
+    if changed_dtypes:
+        compacted_df = pd.concat(columns, axis=1, copy=False)
+        compacted_df.columns = df.columns
+        df = compacted_df
+    after = df.memory_usage(deep=True, index=False)
+    report = {
+        "before_bytes": int(before.sum()),
+        "after_bytes": int(after.sum()),
+        "saved_bytes": int(before.sum() - after.sum()),
+        "dtypes": changed_dtypes,
+    }
+    return df, report
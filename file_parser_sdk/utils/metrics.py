@@ -0,0 +1,228 @@
+"""
+    Per parse timing and volume metrics. FileParser.parse_file, parse_file_async and parse_file_iter activate a
+    ParseStats for the call and the stages of FileParser and S3FileParser record spans (download, decode,
+    edge_cases, rename, filter, memory_profile, serialize, ...) and counters (bytes_downloaded, zip_members,
+    cache_hits, ...) on the active stats through current_stats(). Without active stats current_stats() returns
+    NULL_STATS whose spans do nothing, so stages cost a context variable lookup when metrics are off.
+"""
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+
+_active_stats = contextvars.ContextVar("file_parser_stats", default=None)
+
+
+class Span:
+    """A timed stage of a parse, attributes hold e.g. rows_in, rows_out or the file type."""
+    __slots__ = ("name", "start", "duration", "attributes")
+
+    def __init__(self, name, attributes):
+        self.name = name
+        self.start = None
+        self.duration = None
+        self.attributes = attributes
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+    def to_dict(self):
+        return {"name": self.name, "duration": self.duration, **self.attributes}
+
+    def __repr__(self):
+        return f"Span({self.name}, {self.duration}, {self.attributes})"
+
+
+class _SpanContext:
+
+    def __init__(self, stats, span):
+        self._stats = stats
+        self._span = span
+
+    def __enter__(self):
+        self._span.start = time.perf_counter()
+        return self._span
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._span.duration = time.perf_counter() - self._span.start
+        if exc_type is not None:
+            self._span.attributes["error"] = exc_type.__name__
+        self._stats.finish_span(self._span)
+        return False
+
+
+class ParseStats:
+    """
+        Spans and counters of one parse. hooks are called as hook(stats, span) whenever a span ends, the span of
+        the whole call ("parse_file") ends last. Spans may be recorded from several threads.
+    """
+    enabled = True
+
+    def __init__(self, input_file_path=None, file_source=None, hooks=None):
+        self.input_file_path = input_file_path
+        self.file_source = file_source
+        self.spans = []
+        self.counters = {}
+        self._hooks = list(hooks or [])
+        self._lock = threading.Lock()
+
+    def span(self, name, **attributes):
+        return _SpanContext(self, Span(name, attributes))
+
+    def add(self, name, value=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def finish_span(self, span):
+        with self._lock:
+            self.spans.append(span)
+        for hook in self._hooks:
+            try:
+                hook(self, span)
+            except Exception:
+                # a failing hook must not fail the parse it observes
+                self.add("hook_errors")
+
+    def merge(self, spans, counters):
+        """Add the spans and counters of a snapshot() taken in another process, e.g. a process pool worker."""
+        for span in spans:
+            self.finish_span(span)
+        for name, value in counters.items():
+            self.add(name, value)
+
+    def snapshot(self):
+        """Return (spans, counters), consistent copies of the spans and counters recorded so far."""
+        with self._lock:
+            return list(self.spans), dict(self.counters)
+
+    def get_durations(self):
+        """Total seconds per stage."""
+        durations = {}
+        for span in self.snapshot()[0]:
+            durations[span.name] = durations.get(span.name, 0.0) + span.duration
+        return durations
+
+    def to_dict(self):
+        spans, counters = self.snapshot()
+        return {"input_file_path": self.input_file_path, "file_source": self.file_source,
+                "spans": [span.to_dict() for span in spans], "counters": counters}
+
+    def __repr__(self):
+        return f"ParseStats({self.input_file_path}, {self.get_durations()}, {self.counters})"
+
+
+class _NullSpan:
+
+    def set(self, **attributes):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+class NullStats:
+    """Stats of a parse without metrics, every call is a no-op."""
+    enabled = False
+    _null_span = _NullSpan()
+
+    def span(self, name, **attributes):
+        return self._null_span
+
+    def add(self, name, value=1):
+        pass
+
+
+NULL_STATS = NullStats()
+
+
+def current_stats():
+    stats = _active_stats.get()
+    return NULL_STATS if stats is None else stats
+
+
+@contextmanager
+def collect(stats=None):
+    """Make stats (a new ParseStats by default) the active stats of this thread or task while the block runs."""
+    stats = ParseStats() if stats is None else stats
+    token = _active_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _active_stats.reset(token)
+
+
+def run_with_stats(stats, func, *args):
+    """Run func with stats active, for work submitted to other threads which don't inherit the active stats."""
+    if not stats.enabled:
+        return func(*args)
+    with collect(stats):
+        return func(*args)
+
+
+def _escape_label(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels):
+    return "{" + ",".join(f'{name}="{_escape_label(value)}"' for name, value in labels) + "}"
+
+
+class MetricsRegistry:
+    """
+        Aggregates the ParseStats of many parses into counters and stage duration summaries, exposed in the
+        Prometheus text format by to_prometheus_text(). Metrics are labelled by file_source.
+    """
+
+    def __init__(self, namespace="file_parser"):
+        self._namespace = namespace
+        self._lock = threading.Lock()
+        self._stage_durations = {}
+        self._stage_rows = {}
+        self._counters = {}
+
+    def record(self, stats, status="success"):
+        if not stats.enabled:
+            return
+        file_source = stats.file_source or ""
+        spans, counters = stats.snapshot()
+        with self._lock:
+            for span in spans:
+                key = (file_source, span.name)
+                total, count = self._stage_durations.get(key, (0.0, 0))
+                self._stage_durations[key] = (total + span.duration, count + 1)
+                for direction in ("rows_in", "rows_out"):
+                    if span.attributes.get(direction) is not None:
+                        rows_key = (file_source, span.name, direction[len("rows_"):])
+                        self._stage_rows[rows_key] = self._stage_rows.get(rows_key, 0) + span.attributes[direction]
+            for name, value in list(counters.items()) + [("parses", 1)]:
+                key = (name, file_source, status if name == "parses" else None)
+                self._counters[key] = self._counters.get(key, 0) + value
+
+    def to_prometheus_text(self):
+        prefix = self._namespace
+        lines = []
+        with self._lock:
+            if self._stage_durations:
+                lines += [f"# HELP {prefix}_stage_duration_seconds Time spent in each parse stage.",
+                          f"# TYPE {prefix}_stage_duration_seconds summary"]
+                for (file_source, stage), (total, count) in sorted(self._stage_durations.items()):
+                    labels = _format_labels([("file_source", file_source), ("stage", stage)])
+                    lines.append(f"{prefix}_stage_duration_seconds_sum{labels} {total}")
+                    lines.append(f"{prefix}_stage_duration_seconds_count{labels} {count}")
+            if self._stage_rows:
+                lines += [f"# HELP {prefix}_stage_rows_total Rows going into and out of each parse stage.",
+                          f"# TYPE {prefix}_stage_rows_total counter"]
+                for (file_source, stage, direction), rows in sorted(self._stage_rows.items()):
+                    labels = _format_labels([("file_source", file_source), ("stage", stage), ("direction", direction)])
+                    lines.append(f"{prefix}_stage_rows_total{labels} {rows}")
+            for name in sorted({key[0] for key in self._counters}):
+                lines += [f"# TYPE {prefix}_{name}_total counter"]
+                for (counter_name, file_source, status), value in sorted(self._counters.items(), key=lambda item: (item[0][0], item[0][1], item[0][2] or "")):
+                    if counter_name != name:
+                        continue
+                    labels = [("file_source", file_source)] + ([("status", status)] if status is not None else [])
+                    lines.append(f"{prefix}_{name}_total{_format_labels(labels)} {value}")
+        return "\n".join(lines) + "\n" if lines else ""
@@ -1,62 +1,191 @@
-import zipfile
 import io
+import re
+import zipfile
+
+import numpy as np
+import pandas as pd
+
+_encoding = 'iso-8859-1'
+_header_lines = 10
+_field_start = re.compile(r"^:(\d{2}[A-Z]?):", re.M)
+# {1:...}{2:...}{3:...}{4: block headers opening a message, on one line or a line per block
+_block_header = re.compile(r"^(?:\{[1-3]:(?:[^{}\n]|\{[^{}\n]*\})*\}[ \t]*\n?)*\{4:[ \t]*\n?", re.M)
+# "-}" or "-" on its own line closes a message, anything after it (e.g. {5:...} trailer blocks) is not a field value
+_message_end = re.compile(r"\n-(?:\}|\n|\Z).*", re.S)
+_statement_line = re.compile(r"""^
+    (?P<year>\d{2})(?P<month>\d{2})(?P<day>\d{2})  # 6!n value date
+    (?P<entry_date>\d{4})?  # [4!n] entry date (MMDD)
+    (?P<status>[A-Z]?[DC])  # 2a debit/credit mark
+    (?P<funds_code>[A-Z])?  # [1!a] funds code
+    \n?
+    (?P<amount>[\d,]{1,15})  # 15d amount
+    (?P<id>[A-Z][A-Z0-9 ]{3})?  # 1!a3!c transaction type identification code
+    (?P<customer_reference>(?:(?!//).){0,16})  # 16x customer reference, up to the bank reference
+    (?://(?P<bank_reference>.{0,23}))?  # [//23x] bank reference
+    (?:\n?(?P<extra_details>.{0,34}))?  # [34x] supplementary details
+    $""", re.X)
+_statement_fields = ["date", "entry_date", "status", "funds_code", "amount", "id", "customer_reference", "bank_reference", "extra_details"]
+
+
+def read_zip_members(zip_file_content):
+    """Return [(member name, bytes)] of the files in the zip, in archive order."""
+    with zipfile.ZipFile(io.BytesIO(zip_file_content.read())) as zip_file:
+        return [(info.filename, zip_file.read(info)) for info in zip_file.infolist() if not info.is_dir()]
+
 
+def _get_line_start(data, end):
+    """Start of the line ending at end, lines are split like readlines(), after every newline."""
+    return data.rfind(b"\n", 0, end - 1) + 1
 
-def join_mt940_statements(zip_file_content) -> str:
+
+def _get_header_lines(file_name, data):
+    """The first lines of a statement, decoded and stripped."""
+    end = 0
+    for _ in range(_header_lines):
+        end = data.find(b"\n", end) + 1
+        if end == 0:
+            end = len(data)
+            break
+    lines = data[:end].splitlines()
+    if len(lines) < 5 or len(lines[4].strip()) == 0:
+        raise ValueError(f"{file_name} is not an MT940 statement")
+    return [line.decode(_encoding).strip() for line in lines]
+
+
+def get_opening_balance(file_name, data):
+    """
+    Return (tag, balance) of the opening balance of a statement, ':60F:' for the first part of a statement and
+    ':60M:' for the following parts of a split statement, looked up in the first lines. (None, None) otherwise.
     """
-        Rearrange MT940 files contents based on 60M and 62M tags. 60M is the opening balance of a split
-        statement and 62M is closing balance of a split statement. This function concat all such statements based on
-        62M of the previous statement should be equal to the 60M of the next statement.
+    for line in _get_header_lines(file_name, data):
+        if ':60F:' in line:
+            return ':60F:', line[line.index(':60F:') + len(':60F:'):].strip()
+        if ':60M:' in line:
+            return ':60M:', line[line.index(':60M:') + len(':60M:'):].strip()
+    return None, None
+
+
+def get_account(file_name, data):
+    """Return the account identification (:25:) of a statement, looked up in the first lines, None without one."""
+    for line in _get_header_lines(file_name, data):
+        if line.startswith(':25:'):
+            return line[len(':25:'):].strip()
+    return None
+
+
+def join_mt940_statements(members):
+    """
+        Rearrange MT940 files based on 60M and 62M tags. 60M is the opening balance of a split statement and 62M is
+        the closing balance of a split statement, the 62M of a statement matches the 60M of the next part of the
+        same account (:25:). Every file with a 60F opening balance starts a chain of parts which is followed until
+        its 62F closing balance, a part joins one chain at most.
+
+        The 60M index is built in one pass over the files and parts are joined as byte buffers, the 62M line and
+        the message end of a part are dropped before the next part is appended.
 
         Parameters:
-            zip_file_content : The content to the ZIP file containing MT940 files.
+            members : [(file name, bytes)] of the MT940 files, e.g. read_zip_members of a zip file
+        Returns: [(file name of the first part, statement bytes)], one per chain
     """
-    with zipfile.ZipFile(io.BytesIO(zip_file_content.read())) as zip_file:
-        first_file = []
-        output_file_name = ""
-        files_content_mapping_60M = {}
-
-        for file_name in zip_file.namelist():
-            with zip_file.open(file_name) as file:
-                output_file_name = file_name
-                file_content = file.readlines()
-                fifth_line = file_content[4].decode('iso-8859-1').strip()
-                if fifth_line is None or len(fifth_line) == 0:
-                    return ""
-                elif len(find_tag_value(':60F:', file_content)) > 0:
-                    first_file = file_content
-                elif len(find_tag_value(':60M:', file_content)) > 0:
-                    inter_opening_balance_tag = find_tag_value(':60M:', file_content)
-                    inter_opening_balance = inter_opening_balance_tag[len(":60M:"):].strip()
-                    files_content_mapping_60M[inter_opening_balance] = file_content
-
-        if first_file is None or len(first_file) == 0:
-            return ""
-
-        concat_statement = first_file
-
-        while ':62F:' not in concat_statement[-2].decode('iso-8859-1').strip():
-            second_last_line = concat_statement[-2].decode('iso-8859-1').strip()
-            if ':62M:' in second_last_line:
-                inter_closing_balance = second_last_line[len(':62M:'):]
-                if inter_closing_balance not in files_content_mapping_60M:
-                    break
-                next_file_contents = files_content_mapping_60M.get(inter_closing_balance)
-                concat_statement = concat_statement[:-2]
-                concat_statement.extend(next_file_contents)
-            else:
+    first_parts = []
+    parts_by_opening_balance = {}
+    for file_name, data in members:
+        tag, balance = get_opening_balance(file_name, data)
+        if tag == ':60F:':
+            first_parts.append((file_name, data))
+        elif tag == ':60M:':
+            # the balance carries the date and currency, with the account it tells the statements apart
+            parts_by_opening_balance.setdefault((get_account(file_name, data), balance), []).append(data)
+
+    statements = []
+    for file_name, data in first_parts:
+        account = get_account(file_name, data)
+        chunks = []
+        while True:
+            second_last_line_start = _get_line_start(data, _get_line_start(data, len(data)))
+            second_last_line = data[second_last_line_start:].split(b"\n", 1)[0].decode(_encoding).strip()
+            closing_balance = second_last_line[len(':62M:'):] if ':62M:' in second_last_line else None
+            next_parts = parts_by_opening_balance.get((account, closing_balance))
+            if ':62F:' in second_last_line or not next_parts:
+                chunks.append(memoryview(data))
                 break
+            chunks.append(memoryview(data)[:second_last_line_start])
+            data = next_parts.pop(0)
+        statements.append((file_name, b"".join(chunks)))
+    return statements
+
+
+def _split_fields(text):
+    """
+    Yield (tag, value) of every field of the MT940 text, in order. The block headers of every message are dropped
+    first, the parts of a joined statement keep theirs, and message ends with their trailers are cut off values.
+    """
+    text = _block_header.sub("", text)
+    matches = list(_field_start.finditer(text))
+    for position, match in enumerate(matches):
+        end = matches[position + 1].start() if position + 1 < len(matches) else len(text)
+        value = _message_end.sub("", text[match.end():end].rstrip("\n"))
+        yield match.group(1), value.rstrip()
+
+
+def _to_dates(values, date_format):
+    return pd.to_datetime(pd.Series(values, dtype=object), format=date_format, errors="coerce")
 
-    with open(output_file_name, 'wb') as file:
-        for mt940_entry in concat_statement:
-            file.write(mt940_entry)
 
-    return output_file_name
+def read_mt940(data):
+    """
+    Read the transactions (:61: statement lines and their :86: details) of MT940 text into a dataframe, one row
+    per transaction with the account (:25:), statement number (:28C:) and currency of its statement. The columns
+    are named like the transaction data of the mt-940 package, amounts are signed (debits and reversed credits
+    are negative), dates are datetimes and the customer reference ends where the //bank reference starts.
+    """
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        data = bytes(data).decode(_encoding)
+    text = data.replace("\r\n", "\n")
+    columns = {name: [] for name in ["account_identification", "statement_number", "currency"] + _statement_fields + ["transaction_details"]}
+    statement = {"account_identification": None, "statement_number": None, "currency": None}
+    in_transaction = False
+    for tag, value in _split_fields(text):
+        if tag == "61":
+            match = _statement_line.match(value)
+            if match is None:
+                raise ValueError(f"Invalid MT940 statement line :61:{value}")
+            for name, statement_value in statement.items():
+                columns[name].append(statement_value)
+            fields = match.groupdict()
+            fields["date"] = fields.pop("year") + fields.pop("month") + fields.pop("day")
+            for name in _statement_fields:
+                columns[name].append(fields[name] if fields[name] != "" else None)
+            columns["transaction_details"].append(None)
+            in_transaction = True
+        elif tag == "86" and in_transaction:
+            columns["transaction_details"][-1] = value
+        else:
+            in_transaction = False
+            if tag == "25":
+                statement["account_identification"] = value
+            elif tag == "28C":
+                statement["statement_number"] = value
+            elif tag in ("60F", "60M"):
+                statement["currency"] = value[7:10] if len(value) >= 10 else None
+
+    df = pd.DataFrame(columns)
+    df["date"] = _to_dates(columns["date"], "%y%m%d")
+    # the entry date has no year, it is in the year of the value date unless they are on both sides of a new year
+    entry_dates = _to_dates([str(date.year) + entry_date if entry_date is not None and pd.notna(date) else None
+                             for date, entry_date in zip(df["date"], columns["entry_date"])], "%Y%m%d")
+    difference = (entry_dates - df["date"]).dt.days
+    entry_dates = entry_dates.mask(difference <= -330, entry_dates + pd.DateOffset(years=1))
+    df["entry_date"] = entry_dates.mask(difference >= 330, entry_dates - pd.DateOffset(years=1))
+    amounts = df["amount"].str.replace(",", ".", regex=False).astype(float)
+    df["amount"] = np.where(df["status"].isin(["D", "RC"]), -amounts, amounts)
+    return df
 
 
-def find_tag_value(tag, file_content):
-    for line_no in range(10):
-        line = file_content[line_no].decode('iso-8859-1').strip()
-        if tag in line:
-            return line
-    return ""
+def parse_statement(file_name, data, input_file_path=None, parser_func=None):
+    """Parse one joined statement, with parser_func(file object, input_file_path) when given, else read_mt940."""
+    if parser_func is None:
+        return read_mt940(data)
+    file_obj = io.BytesIO(data)
+    file_obj.name = file_name
+    return parser_func(file_obj, input_file_path)
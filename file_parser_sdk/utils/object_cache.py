@@ -0,0 +1,147 @@
+import hashlib
+import io
+import mmap
+import os
+import threading
+import uuid
+from collections import OrderedDict
+
+from . import file_parser_constants
+from .mapped_file import MappedFile
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+class ObjectCache:
+    """
+        In-process cache of raw object bytes with a memory tier and an optional disk tier, both evicted least
+        recently used first. Entries carry the ETag of the object so callers can revalidate them with a
+        conditional GET (If-None-Match) instead of downloading the body again. A disk entry is one file, the ETag
+        on the first line followed by the bytes, so it is replaced with a single os.replace. The bytes of disk
+        entries are memory-mapped.
+    """
+
+    def __init__(self, max_memory_bytes=file_parser_constants.default_object_cache_max_memory_bytes, cache_dir=None,
+                 max_disk_bytes=file_parser_constants.default_object_cache_max_disk_bytes):
+        self._max_memory_bytes = max_memory_bytes
+        self._cache_dir = cache_dir
+        self._max_disk_bytes = max_disk_bytes
+        self._memory = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        if cache_dir is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def _get_disk_path(self, key):
+        return os.path.join(self._cache_dir, hashlib.sha256(key.encode('utf-8')).hexdigest() + ".entry")
+
+    def get(self, key):
+        """Return (etag, body file object, size) of a cached object or None."""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                etag, data = entry
+                return etag, io.BytesIO(data), len(data)
+        entry = self._get_from_disk(key)
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+            else:
+                self.disk_hits += 1
+        return entry
+
+    def _get_from_disk(self, key):
+        if self._cache_dir is None:
+            return None
+        path = self._get_disk_path(key)
+        try:
+            with open(path, 'rb') as entry_file:
+                header = entry_file.readline()
+                if not header.endswith(b"\n"):
+                    return None
+                size = os.fstat(entry_file.fileno()).st_size - len(header)
+                if size == 0:
+                    body = io.BytesIO(b"")
+                else:
+                    body = MappedFile(mmap.mmap(entry_file.fileno(), 0, access=mmap.ACCESS_READ), offset=len(header))
+            os.utime(path)
+        except (FileNotFoundError, OSError):
+            return None
+        return header[:-1].decode('utf-8'), body, size
+
+    def put(self, key, etag, data):
+        if len(data) <= self._max_memory_bytes:
+            with self._lock:
+                if key in self._memory:
+                    self._memory_bytes -= len(self._memory.pop(key)[1])
+                self._memory[key] = (etag, data)
+                self._memory_bytes += len(data)
+                while self._memory_bytes > self._max_memory_bytes:
+                    _, (_, evicted_data) = self._memory.popitem(last=False)
+                    self._memory_bytes -= len(evicted_data)
+        if self._cache_dir is not None and len(data) <= self._max_disk_bytes:
+            self._put_on_disk(key, etag, data)
+
+    def _put_on_disk(self, key, etag, data):
+        path = self._get_disk_path(key)
+        temp_path = path + "." + uuid.uuid4().hex + ".tmp"
+        try:
+            with open(temp_path, 'wb') as cache_file:
+                cache_file.write(etag.encode('utf-8') + b"\n")
+                cache_file.write(data)
+            # readers see either the previous entry or the new ETag with its bytes, never a mix
+            os.replace(temp_path, path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        self._evict_disk()
+
+    def _evict_disk(self):
+        entries = []
+        for file_name in os.listdir(self._cache_dir):
+            if not file_name.endswith(".entry"):
+                continue
+            try:
+                stat = os.stat(os.path.join(self._cache_dir, file_name))
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, file_name))
+        entries.sort()
+        total_size = sum(entry[1] for entry in entries)
+        while entries and total_size > self._max_disk_bytes:
+            _, size, file_name = entries.pop(0)
+            try:
+                os.remove(os.path.join(self._cache_dir, file_name))
+            except FileNotFoundError:
+                pass
+            total_size -= size
+
+    def stats(self):
+        with self._lock:
+            return {"memory_hits": self.memory_hits, "disk_hits": self.disk_hits, "misses": self.misses,
+                    "memory_bytes": self._memory_bytes}
+
+
+def get_object_cache(object_cache_config):
+    """Return the process wide ObjectCache for the given object_cache settings of s3_config."""
+    if not object_cache_config:
+        return None
+    settings = (object_cache_config.get("max_memory_bytes", file_parser_constants.default_object_cache_max_memory_bytes),
+                object_cache_config.get("cache_dir", None),
+                object_cache_config.get("max_disk_bytes", file_parser_constants.default_object_cache_max_disk_bytes))
+    with _caches_lock:
+        cache = _caches.get(settings)
+        if cache is None:
+            cache = _caches[settings] = ObjectCache(*settings)
+        return cache
+
+
+def clear_object_caches():
+    with _caches_lock:
+        _caches.clear()
@@ -0,0 +1,276 @@
+"""
+    Page by page table extraction of pdf files through tabula-java. Pages are extracted concurrently and the tables
+    of every page are concatenated into one dataframe with the page number in page_column.
+
+    The "jvm" backend loads tabula-java once into the process through JPype (install file_parser_sdk[pdf]), so a
+    page costs a call into the running JVM instead of starting java. The "subprocess" backend is tabula.read_pdf,
+    one java process per page, used when JPype is not installed.
+"""
+import json
+import os
+import re
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+from tabula import read_pdf
+from tabula.io import DEFAULT_CONFIG, build_options
+
+from . import file_parser_constants
+from ..exceptions.expcetion import ConfigMissingException
+
+default_tabula_options = {"stream": True, "guess": True}
+default_java_options = ["-Dfile.encoding=UTF8", "-Djava.awt.headless=true",
+                        "-Dorg.slf4j.simpleLogger.defaultLogLevel=off",
+                        "-Dorg.apache.commons.logging.Log=org.apache.commons.logging.impl.NoOpLog"]
+# page objects, not the /Pages nodes of the page tree
+_page_object = re.compile(rb"/Type\s*/Page(?![A-Za-z])")
+
+_tabula_jvm = None
+_tabula_jvm_lock = threading.Lock()
+_page_caches = {}
+_page_caches_lock = threading.Lock()
+
+
+def parse_pages(pages):
+    """
+    Return the sorted page numbers of a page selection, None for every page. pages is "all", a page number, a list
+    of page numbers or a string of numbers and ranges such as "1-3,7".
+    """
+    if pages is None or pages == "all":
+        return None
+    if isinstance(pages, int):
+        parts = [pages]
+    elif isinstance(pages, str):
+        parts = [part.strip() for part in pages.split(",") if part.strip()]
+    else:
+        parts = list(pages)
+    page_numbers = set()
+    for part in parts:
+        if isinstance(part, str) and "-" in part:
+            start, end = (int(value) for value in part.split("-", 1))
+            if start > end:
+                raise ValueError(f"Invalid page range {part}")
+            page_numbers.update(range(start, end + 1))
+        else:
+            page_numbers.add(int(part))
+    if len(page_numbers) == 0 or min(page_numbers) < 1:
+        raise ValueError(f"Invalid pages {pages}, pages are numbered from 1")
+    return sorted(page_numbers)
+
+
+def count_pages(data):
+    """Number of page objects of a pdf, None when the page objects are hidden in compressed object streams."""
+    return len(_page_object.findall(data)) or None
+
+
+def get_jar_path():
+    return os.environ.get("TABULA_JAR", DEFAULT_CONFIG["JAR_PATH"])
+
+
+class TabulaJvm:
+    """tabula-java running inside this process. The JVM is started on first use and lives as long as the process."""
+
+    def __init__(self, java_options=None):
+        try:
+            import jpype
+        except ImportError:
+            raise ConfigMissingException("The jvm pdf backend requires JPype1, install file_parser_sdk[pdf]")
+        if not jpype.isJVMStarted():
+            jpype.startJVM(*(java_options or default_java_options), classpath=[get_jar_path()], convertStrings=False)
+        self._jpype = jpype
+        self._command_line_app = jpype.JClass("technology.tabula.CommandLineApp")
+        self._command_line_parser = jpype.JClass("org.apache.commons.cli.DefaultParser")
+        self._string_builder = jpype.JClass("java.lang.StringBuilder")
+        self._java_file = jpype.JClass("java.io.File")
+        self._pd_document = jpype.JClass("org.apache.pdfbox.pdmodel.PDDocument")
+
+    def extract(self, path, page, tabula_options):
+        """Tables of one page as tabula-java JSON, the same command line tabula.read_pdf runs."""
+        args = build_options(pages=page, format="JSON", **tabula_options) + [path]
+        line = self._command_line_parser().parse(self._command_line_app.buildOptions(),
+                                                 self._jpype.JArray(self._jpype.JString)(args))
+        output = self._string_builder()
+        self._command_line_app(output, line).extractTables(line)
+        return json.loads(str(output.toString()))
+
+    def get_page_count(self, path, password=None):
+        document = self._pd_document.load(self._java_file(path), password or "")
+        try:
+            return int(document.getNumberOfPages())
+        finally:
+            document.close()
+
+
+class TabulaSubprocess:
+    """tabula.read_pdf, a new java process for every call."""
+
+    def __init__(self, java_options=None):
+        self._java_options = java_options
+
+    def extract(self, path, page, tabula_options):
+        return read_pdf(path, pages=page, output_format="json", java_options=self._java_options, **tabula_options)
+
+    def get_page_count(self, path, password=None):
+        with open(path, 'rb') as pdf_file:
+            return count_pages(pdf_file.read())
+
+
+def is_jvm_backend_available():
+    try:
+        import jpype  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def get_extractor(backend=None, java_options=None):
+    """Return the extractor of backend, "jvm" (shared by the whole process) or "subprocess". None picks jvm when JPype is installed."""
+    global _tabula_jvm
+    if backend is None:
+        backend = file_parser_constants.pdf_jvm_backend if is_jvm_backend_available() else file_parser_constants.pdf_subprocess_backend
+    if backend == file_parser_constants.pdf_subprocess_backend:
+        return TabulaSubprocess(java_options)
+    if backend != file_parser_constants.pdf_jvm_backend:
+        raise ConfigMissingException(f"Unsupported pdf backend = {backend}")
+    with _tabula_jvm_lock:
+        if _tabula_jvm is None:
+            _tabula_jvm = TabulaJvm(java_options)
+        return _tabula_jvm
+
+
+class PdfPageCache:
+    """In-process LRU cache of the extracted tables of single pages, keyed by object, ETag, page and tabula options."""
+
+    def __init__(self, max_entries=file_parser_constants.default_pdf_page_cache_entries):
+        self._max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def build_key(location, etag, page, tabula_options):
+        return location, etag, page, json.dumps(tabula_options, sort_keys=True, default=repr)
+
+    def get(self, key):
+        with self._lock:
+            df = self._entries.get(key)
+            if df is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return df
+
+    def put(self, key, df):
+        with self._lock:
+            self._entries[key] = df
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+
+def get_page_cache(max_entries):
+    """Return the process wide PdfPageCache holding up to max_entries pages, None when max_entries is 0."""
+    if not max_entries:
+        return None
+    with _page_caches_lock:
+        cache = _page_caches.get(max_entries)
+        if cache is None:
+            cache = _page_caches[max_entries] = PdfPageCache(max_entries)
+        return cache
+
+
+def clear_page_caches():
+    with _page_caches_lock:
+        _page_caches.clear()
+
+
+def _get_unique_columns(header):
+    """Column names of a header row like tabula.read_pdf, "Unnamed: n" for empty cells and ".n" for repeated names."""
+    columns = []
+    counts = {}
+    unnamed = 0
+    for name in header:
+        if name is None:
+            name = f"Unnamed: {unnamed}"
+            unnamed += 1
+        count = counts.get(name, 0)
+        counts[name] = count + 1
+        columns.append(name if count == 0 else f"{name}.{count}")
+    return columns
+
+
+def tables_to_dataframe(tables, page, page_column=file_parser_constants.default_pdf_page_column):
+    """Concatenate tabula-java JSON tables of a page, the first row of every table is its header."""
+    dfs = []
+    for table in tables:
+        rows = [[cell["text"] or None for cell in row] for row in table["data"]]
+        if len(rows) == 0:
+            continue
+        width = max(len(row) for row in rows)
+        rows = [row + [None] * (width - len(row)) for row in rows]
+        dfs.append(pd.DataFrame(rows[1:], columns=_get_unique_columns(rows[0]), dtype=object))
+    df = pd.concat(dfs, ignore_index=True) if dfs else pd.DataFrame()
+    df[page_column] = page
+    return df
+
+
+def _to_numeric(df, exclude_column):
+    # like tabula.read_pdf, columns holding only numbers become numeric, done once so every page gets the same dtype
+    for column in df.columns:
+        if column == exclude_column:
+            continue
+        try:
+            df[column] = pd.to_numeric(df[column])
+        except (ValueError, TypeError):
+            pass
+    return df
+
+
+def read_pdf_pages(data, pages=None, workers=file_parser_constants.default_pdf_workers, backend=None, java_options=None,
+                   tabula_options=None, page_column=file_parser_constants.default_pdf_page_column, location=None, etag=None,
+                   page_cache_entries=file_parser_constants.default_pdf_page_cache_entries):
+    """
+    Extract the tables of the selected pages of a pdf into one dataframe with the page number in page_column.
+    Pages are extracted by up to workers threads, the jvm backend runs them concurrently in one JVM.
+    :param data: pdf bytes
+    :param pages: page selection, see parse_pages, every page by default
+    :param tabula_options: read_pdf options of tabula-py (stream, lattice, guess, area, columns, password)
+    :param location, etag: object location and ETag, pages of objects with an ETag are cached in process
+    """
+    page_numbers = parse_pages(pages)
+    tabula_options = {**default_tabula_options, **(tabula_options or {})}
+    extractor = get_extractor(backend, java_options)
+    page_cache = get_page_cache(page_cache_entries) if etag is not None else None
+    with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as pdf_file:
+        pdf_file.write(data)
+    try:
+        if page_numbers is None:
+            page_count = extractor.get_page_count(pdf_file.name, tabula_options.get("password"))
+            if page_count is None:
+                # without a page count the pages cannot be told apart, extract them all at once
+                return _to_numeric(tables_to_dataframe(extractor.extract(pdf_file.name, "all", tabula_options), None, page_column), page_column)
+            page_numbers = list(range(1, page_count + 1))
+
+        def extract_page(page):
+            key = PdfPageCache.build_key(location, etag, page, tabula_options)
+            df = page_cache.get(key) if page_cache is not None else None
+            if df is None:
+                df = tables_to_dataframe(extractor.extract(pdf_file.name, page, tabula_options), page, page_column)
+                if page_cache is not None:
+                    page_cache.put(key, df)
+            return df
+
+        if workers is None or workers <= 1 or len(page_numbers) <= 1:
+            dfs = [extract_page(page) for page in page_numbers]
+        else:
+            with ThreadPoolExecutor(max_workers=min(workers, len(page_numbers)), thread_name_prefix="pdf-page") as executor:
+                dfs = list(executor.map(extract_page, page_numbers))
+    finally:
+        os.remove(pdf_file.name)
+    df = pd.concat(dfs, ignore_index=True) if dfs else pd.DataFrame({page_column: []})
+    return _to_numeric(df, page_column)
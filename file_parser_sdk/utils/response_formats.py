@@ -0,0 +1,134 @@
+"""
+    Columnar encodings of parsed dataframes for the ARROW and PARQUET response types (requires pyarrow, install
+    file_parser_sdk[arrow]). Numeric and Arrow backed string columns are handed to Arrow without copying, and the
+    IPC stream is returned as a pyarrow.Buffer which exposes the buffer protocol, so it can be written to a socket
+    or wrapped with pyarrow.ipc.open_stream on the receiving side without another copy.
+    The FILE response type is written as csv, chunk by chunk, by write_csv.
+"""
+import gzip
+import io
+import os
+import uuid
+
+from ..exceptions.expcetion import ConfigMissingException
+
+arrow_ipc_format = "ipc"
+arrow_reader_format = "reader"
+arrow_table_format = "table"
+default_parquet_compression = "snappy"
+_compression_suffixes = {"gzip": ".gz", "zstd": ".zst"}
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+        return pyarrow
+    except ImportError:
+        raise ConfigMissingException("ARROW and PARQUET responses require pyarrow, install file_parser_sdk[arrow]")
+
+
+def to_arrow_table(df):
+    pa = _import_pyarrow()
+    return pa.Table.from_pandas(df, preserve_index=False)
+
+
+def to_arrow(df, options=None):
+    """
+    options: arrow_format, "ipc" (default) for the IPC stream in a pyarrow.Buffer, "reader" for a
+    pyarrow.RecordBatchReader or "table" for the pyarrow.Table, and max_chunksize, the rows per record batch.
+    """
+    options = options or {}
+    arrow_format = options.get("arrow_format", arrow_ipc_format)
+    table = to_arrow_table(df)
+    batches = table.to_batches(max_chunksize=options.get("max_chunksize"))
+    if arrow_format == arrow_table_format:
+        return table
+    if arrow_format == arrow_reader_format:
+        return _import_pyarrow().RecordBatchReader.from_batches(table.schema, batches)
+    if arrow_format == arrow_ipc_format:
+        pa = _import_pyarrow()
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            for batch in batches:
+                writer.write_batch(batch)
+        return sink.getvalue()
+    raise ConfigMissingException(f"Unsupported arrow_format = {arrow_format}")
+
+
+def to_parquet(df, options=None):
+    """
+    options: destination, a path or writable binary file object, compression (default snappy, None for
+    uncompressed), compression_level and row_group_size. Returns the destination, or the parquet file as a
+    pyarrow.Buffer when no destination is given.
+    """
+    options = options or {}
+    pa = _import_pyarrow()
+    import pyarrow.parquet as pq
+
+    destination = options.get("destination")
+    sink = pa.BufferOutputStream() if destination is None else destination
+    pq.write_table(to_arrow_table(df), sink, compression=options.get("compression", default_parquet_compression),
+                   compression_level=options.get("compression_level"), row_group_size=options.get("row_group_size"))
+    return sink.getvalue() if destination is None else destination
+
+
+def get_output_path(destination, file_name, compression=None):
+    """Path of the FILE response, parsed_<file name> in destination when it is a directory or None (the working directory)."""
+    if destination is None or os.path.isdir(destination):
+        destination = os.path.join(destination or "", f"parsed_{file_name}{_compression_suffixes.get(compression, '')}")
+    return os.fspath(destination)
+
+
+def _open_compressed(binary_stream, compression):
+    if compression is None:
+        return binary_stream
+    if compression == "gzip":
+        return gzip.GzipFile(fileobj=binary_stream, mode="wb")
+    if compression == "zstd":
+        try:
+            import zstandard
+        except ImportError:
+            raise ConfigMissingException("zstd compression requires zstandard, install file_parser_sdk[zstd]")
+        return zstandard.ZstdCompressor().stream_writer(binary_stream, closefd=False)
+    raise ConfigMissingException(f"Unsupported compression = {compression}")
+
+
+def _write_csv_chunks(chunks, binary_stream, compression):
+    compressed_stream = _open_compressed(binary_stream, compression)
+    text_stream = io.TextIOWrapper(compressed_stream, encoding="utf-8", newline="", write_through=True)
+    try:
+        header = True
+        for chunk in chunks:
+            chunk.to_csv(text_stream, index=False, header=header)
+            header = False
+    finally:
+        # detaching flushes the wrapper without closing the stream underneath
+        text_stream.detach()
+    if compressed_stream is not binary_stream:
+        # ends the compressed frame, binary_stream itself stays open for the caller
+        compressed_stream.close()
+
+
+def write_csv(chunks, file_name, options=None):
+    """
+    Write dataframes (a whole dataframe or the chunks of parse_file_iter) as one csv file, so the output is
+    produced while the input is consumed. options: destination, a file path, a directory or a writable binary
+    stream (default: the working directory), and compression, "gzip" or "zstd". Files are written under a
+    temporary name and renamed once complete. Returns the path of the file, or the stream.
+    """
+    options = options or {}
+    destination = options.get("destination")
+    compression = options.get("compression")
+    if hasattr(destination, "write"):
+        _write_csv_chunks(chunks, destination, compression)
+        return destination
+    path = get_output_path(destination, file_name, compression)
+    temp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    try:
+        with open(temp_path, "wb") as output_file:
+            _write_csv_chunks(chunks, output_file, compression)
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    return path
@@ -0,0 +1,130 @@
+import functools
+import hashlib
+import importlib.metadata
+import inspect
+import json
+import os
+import threading
+import uuid
+
+import pandas as pd
+
+from . import file_parser_constants
+from ..exceptions.expcetion import ConfigMissingException
+
+
+def get_config_hash(file_config):
+    """Stable hash of a resolved file_source config, dtypes such as str are hashed through their repr."""
+    return hashlib.sha256(json.dumps(file_config, sort_keys=True, default=repr).encode('utf-8')).hexdigest()
+
+
+def get_edge_case_version(edge_cases):
+    """
+        Version of the user_edge_cases module, its __version__ when defined and otherwise a hash of its source, so
+        that cached results are not reused after the edge case functions change.
+    """
+    if edge_cases is None:
+        return "none"
+    version = getattr(edge_cases, "__version__", None)
+    if version is not None:
+        return str(version)
+    try:
+        return hashlib.sha256(inspect.getsource(edge_cases).encode('utf-8')).hexdigest()
+    except (OSError, TypeError):
+        return "unknown"
+
+
+@functools.lru_cache(maxsize=None)
+def get_sdk_version():
+    """Version of the SDK's own readers and transforms, the installed package version and result_cache_version."""
+    try:
+        package_version = importlib.metadata.version("file_parser_sdk")
+    except importlib.metadata.PackageNotFoundError:
+        package_version = "unknown"
+    return f"{package_version}+{file_parser_constants.result_cache_version}"
+
+
+class ResultCache:
+    """
+        Content addressed on-disk cache of sanitized dataframes stored as parquet files. Entries are keyed by the
+        object location, its version tag (ETag), the file_source config hash, the edge case module version and the
+        SDK version, and the least recently used entries are evicted once the cache grows beyond max_size_bytes or
+        max_entries.
+    """
+
+    def __init__(self, cache_dir, max_size_bytes=file_parser_constants.default_result_cache_max_size_bytes, max_entries=None):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise ConfigMissingException("result_cache requires pyarrow, install file_parser_sdk[arrow]")
+        self._cache_dir = cache_dir
+        self._max_size_bytes = max_size_bytes
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def build_key(location, version_tag, config_hash, edge_case_version, sdk_version=None):
+        sdk_version = get_sdk_version() if sdk_version is None else sdk_version
+        return hashlib.sha256("|".join([location, str(version_tag), config_hash, edge_case_version, sdk_version]).encode('utf-8')).hexdigest()
+
+    def get_path(self, key):
+        return os.path.join(self._cache_dir, key + ".parquet")
+
+    def contains(self, key):
+        return os.path.exists(self.get_path(key))
+
+    def get(self, key):
+        path = self.get_path(key)
+        try:
+            df = pd.read_parquet(path)
+            # the modification time orders entries for LRU eviction
+            os.utime(path)
+        except (FileNotFoundError, OSError):
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return df
+
+    def put(self, key, df):
+        path = self.get_path(key)
+        temp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        try:
+            df.to_parquet(temp_path)
+            # readers in other threads/processes only ever see complete files
+            os.replace(temp_path, path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        self.evict()
+
+    def evict(self):
+        entries = []
+        for file_name in os.listdir(self._cache_dir):
+            if not file_name.endswith(".parquet"):
+                continue
+            try:
+                stat = os.stat(os.path.join(self._cache_dir, file_name))
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, file_name))
+        entries.sort()
+        total_size = sum(entry[1] for entry in entries)
+        while entries and (total_size > self._max_size_bytes or (self._max_entries is not None and len(entries) > self._max_entries)):
+            _, size, file_name = entries.pop(0)
+            try:
+                os.remove(os.path.join(self._cache_dir, file_name))
+            except FileNotFoundError:
+                pass
+            total_size -= size
+            with self._lock:
+                self.evictions += 1
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions}
@@ -0,0 +1,61 @@
+import os
+import threading
+
+import boto3
+import botocore.config
+
+from . import file_parser_constants
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def build_client_config(s3_config=None, signature_version=None, region_name=None):
+    """
+        Build the botocore config for the shared S3 clients from s3_config. Supported keys are
+        max_pool_connections, retry_max_attempts, retry_mode, connect_timeout, read_timeout and tcp_keepalive
+        (ignored when the installed botocore does not support it).
+    """
+    s3_config = s3_config or {}
+    options = {
+        'max_pool_connections': s3_config.get(file_parser_constants.max_pool_connections) or file_parser_constants.default_max_pool_connections,
+        'retries': {'max_attempts': s3_config.get(file_parser_constants.retry_max_attempts) or file_parser_constants.default_retry_max_attempts}
+    }
+    if s3_config.get(file_parser_constants.retry_mode):
+        options['retries']['mode'] = s3_config.get(file_parser_constants.retry_mode)
+    for option in [file_parser_constants.connect_timeout, file_parser_constants.read_timeout]:
+        if s3_config.get(option) is not None:
+            options[option] = s3_config.get(option)
+    if s3_config.get(file_parser_constants.tcp_keepalive) is not None and file_parser_constants.tcp_keepalive in botocore.config.Config.OPTION_DEFAULTS:
+        options[file_parser_constants.tcp_keepalive] = s3_config.get(file_parser_constants.tcp_keepalive)
+    if signature_version is not None:
+        options['signature_version'] = signature_version
+    if region_name is not None:
+        options['region_name'] = region_name
+    return botocore.config.Config(**options)
+
+
+def get_s3_client(s3_config=None, signature_version=None, region_name=None):
+    """
+        Return the process wide S3 client for the given settings, creating it on first use. boto3 clients are
+        thread safe, so one client (and its connection pool) is shared by every S3FileParser and thread.
+    """
+    s3_config = s3_config or {}
+    endpoint_url = s3_config.get(file_parser_constants.endpoint_url)
+    key = (os.getpid(), signature_version, region_name, endpoint_url,
+           tuple(sorted((option, str(s3_config.get(option))) for option in file_parser_constants.s3_client_options)))
+    client = _clients.get(key)
+    if client is not None:
+        return client
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = boto3.client('s3', endpoint_url=endpoint_url,
+                                  config=build_client_config(s3_config, signature_version, region_name))
+            _clients[key] = client
+    return client
+
+
+def clear_s3_clients():
+    with _clients_lock:
+        _clients.clear()
@@ -1,6 +1,8 @@
 #!/usr/bin/python
+import copy
 import io
 import os
+import pickle
 from datetime import datetime
 from io import StringIO
 from urllib.parse import urlparse
@@ -8,22 +10,57 @@ from zipfile import ZipFile
 from io import BytesIO
 import pyzipper
 
-import boto3
-import botocore.config
 import pandas as pd
 from tabula import read_pdf
 import csv
-from . import file_parser_constants
+from . import file_parser_constants, common_utils
 from ..exceptions.expcetion import S3Exception, ConfigMissingException
-import mt940_utils
+from . import mt940_utils
+from . import s3_client_registry
+from . import excel_reader
+from . import delimited_writer
+from . import xml_reader
+from . import pdf_reader
+from . import metrics
+from .s3_multipart_upload import MultipartUploadWriter, SharedPartUploads
+import gzip
+from .storage_backends import S3StorageBackend, LocalFileStorageBackend, InMemoryStorageBackend
 from ..enums.LogLevel import LogLevel
-from lxml import etree
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+
+class UploadResult:
+    """Outcome of one dataframe of an upload_many batch, error is set instead of path and url when the upload failed."""
+
+    def __init__(self, file_name, product_folder=None, path=None, url=None, error=None):
+        self.file_name = file_name
+        self.product_folder = product_folder
+        self.path = path
+        self.url = url
+        self.error = error
+
+    @property
+    def succeeded(self):
+        return self.error is None
+
+    def __repr__(self):
+        status = "succeeded" if self.succeeded else "failed :: " + str(self.error)
+        return f"UploadResult({self.file_name}, {self.path}, {status})"
+
 
 class S3FileParser:
     def __init__(self, logger, config):
         self._logger = logger
         self._config = config
         self._upload_bucket = self.get_s3_config('upload_bucket')
+        s3_storage_backend = S3StorageBackend(self._config.get('s3_config'), lambda: self.get_s3_client())
+        self._storage_backends = {
+            's3': s3_storage_backend,
+            'file': LocalFileStorageBackend(),
+            # Hadoop style S3 urls have always been read from S3 like s3:// ones
+            **{scheme: s3_storage_backend for scheme in file_parser_constants.s3_scheme_aliases}
+        }
+        self._prefetched_paths = frozenset()
 
     def detect_type(self, input_file_path):
         """
@@ -34,64 +71,152 @@ class S3FileParser:
         :param input_file_path:
         :return: File type (csv, txt, etc)
         """
-        self._logger.print_log(LogLevel.INFO.value, "detect_type::Detect File type")
-        file_type = os.path.splitext(input_file_path)[1][1:]
-        self._logger.print_log(LogLevel.INFO.value, "detect_type::fileType - "+str(file_type))
-        return file_type.lower()
+        file_type = os.path.splitext(input_file_path)[1][1:].lower()
+        self._logger.print_log(LogLevel.DEBUG.value, "detect_type", file_path=input_file_path, file_type=file_type)
+        return file_type
 
-    def getS3_object(self, inputFilePath):
+    def getS3_object(self, inputFilePath, stream=False):
         obj = None
         try:
-            s3 = boto3.client('s3')
-            relativePath = urlparse(inputFilePath).path
-            self._logger.print_log(LogLevel.INFO.value, "getS3_object::relativePath = " + str(relativePath[1:]))
-            bucket = self.get_s3_config('download_bucket')
-            obj = s3.get_object(Bucket=bucket, Key=relativePath[1:])
+            self._logger.print_log(LogLevel.DEBUG.value, "getS3_object", relative_path=lambda: urlparse(inputFilePath).path[1:])
+            stats = self.get_download_stats(inputFilePath)
+            with stats.span("download", stream=stream) as span:
+                obj = self.get_storage_backend(inputFilePath).get_object(inputFilePath, stream=stream)
+                span.set(bytes=obj.get('ContentLength'))
+            stats.add("bytes_downloaded", obj.get('ContentLength') or 0)
         except Exception as e:
             self._logger.print_log(LogLevel.EXCEPTION.value,
                                   "exception in reading "+inputFilePath+" in s3 client :"+str(e), exc_info=True)
 
         return obj
 
-    def convert_pdf_to_df(self, obj_stream):
-        dfs = read_pdf(obj_stream, stream=True, pages="all")
-        return dfs
+    def download_object(self, bucket, key, stream=False):
+        """
+        Fetch an S3 object. Unless stream is set, large objects are downloaded with concurrent ranged GETs into a
+        single in-memory buffer, configured through multipart_download_part_size, multipart_download_concurrency and
+        multipart_download_threshold in s3_config. stream returns the plain streaming body for chunked readers.
+        """
+        return self._storage_backends['s3'].get_object_from_bucket(bucket, key, stream=stream)
+
+    def register_storage_backend(self, scheme, backend):
+        """Read input paths with the given url scheme (e.g. "file", "memory") through backend."""
+        self._storage_backends = {**self._storage_backends, scheme: backend}
+
+    def get_storage_backend(self, inputFilePath):
+        # paths without a scheme have always been read from the download bucket
+        scheme = urlparse(inputFilePath).scheme or 's3'
+        if scheme not in self._storage_backends:
+            raise ConfigMissingException(f"No storage backend registered for scheme = {scheme}")
+        return self._storage_backends[scheme]
+
+    def get_download_stats(self, inputFilePath):
+        # objects prefetched by parse_file_async were downloaded, and recorded, before the parse
+        return metrics.NULL_STATS if inputFilePath in self._prefetched_paths else metrics.current_stats()
+
+    def read_object_bytes(self, inputFilePath):
+        stats = self.get_download_stats(inputFilePath)
+        with stats.span("download") as span:
+            data = self.get_storage_backend(inputFilePath).read_bytes(inputFilePath)
+            span.set(bytes=len(data))
+        stats.add("bytes_downloaded", len(data))
+        return data
+
+    def with_prefetched_objects(self, prefetched_objects, cache_identities=None):
+        """
+        Return a copy of this parser which serves the given {input path: bytes} objects from memory instead of
+        their storage backend, used to decode objects which were already downloaded (e.g. by parse_file_async)
+        without any I/O. cache_identities {input path: (location, ETag)} are the identities looked up before the
+        download, objects without one are identified by their storage backend, so results are cached under the
+        same keys as parses of the storage backend.
+        """
+        s3_file_parser = copy.copy(self)
+        s3_file_parser._storage_backends = dict(self._storage_backends)
+        s3_file_parser._prefetched_paths = self._prefetched_paths | frozenset(prefetched_objects)
+        for inputFilePath, data in prefetched_objects.items():
+            scheme = urlparse(inputFilePath).scheme or 's3'
+            s3_file_parser._storage_backends[scheme] = InMemoryStorageBackend(
+                {inputFilePath: data}, fallback=s3_file_parser._storage_backends.get(scheme), cache_identities=cache_identities)
+        return s3_file_parser
+
+    def convert_pdf_to_df(self, obj_stream, pages=None, pdf_options=None, location=None, etag=None):
+        """
+        Without pdf_options the tables of the pages are returned as a list of dfs by tabula.read_pdf. With pdf_options
+        the pages are extracted concurrently into one df with a page column and cached by ETag, see
+        pdf_reader.read_pdf_pages for the options.
+        """
+        if pdf_options is None:
+            return read_pdf(obj_stream, stream=True, pages="all" if pages is None else pages)
+        return pdf_reader.read_pdf_pages(obj_stream.read(), pages=pages, location=location, etag=etag, **pdf_options)
+
+    def get_usecols(self, usecols, has_column_names):
+        """usecols selecting columns by name (a callable) only applies to files whose columns have names."""
+        if callable(usecols) and not has_column_names:
+            return None
+        return usecols
 
-    def create_df_from_csv(self, file_name, file_dtype=None, chunksize=None, sep=",", header=None, has_header=True, skiprows=0, skip_header = False, names = None):
+    def create_df_from_csv(self, file_name, file_dtype=None, chunksize=None, sep=",", header=None, has_header=True, skiprows=0, skip_header = False, names = None, usecols=None):
         if skip_header is True:
-            return pd.read_csv(file_name, dtype=file_dtype, names = names, skiprows=skiprows, index_col=False)
+            return pd.read_csv(file_name, dtype=file_dtype, names = names, skiprows=skiprows, index_col=False, chunksize=chunksize,
+                               usecols=self.get_usecols(usecols, names is not None))
         if has_header is True:
             df = pd.read_csv(file_name, skiprows=skiprows,
-                        on_bad_lines='skip', dtype=file_dtype, chunksize=chunksize, sep=sep, index_col=False)
+                        on_bad_lines='skip', dtype=file_dtype, chunksize=chunksize, sep=sep, index_col=False, usecols=usecols)
         else:
             df = pd.read_csv(file_name, skiprows=skiprows,
-                        on_bad_lines='skip', dtype=file_dtype, chunksize=chunksize, sep=sep, header=header, index_col=False)
+                        on_bad_lines='skip', dtype=file_dtype, chunksize=chunksize, sep=sep, header=header, index_col=False,
+                        usecols=self.get_usecols(usecols, header is not None))
         return df
 
-    def create_df_from_excel_file(self, file_name, file_dtype, header, sheet_name, has_header, skiprows):
+    def create_df_from_excel_file(self, file_name, file_dtype, header, sheet_name, has_header, skiprows, excel_engine=None, usecols=None):
+        file_name = excel_reader.as_seekable(file_name)
+        if sheet_name is None and has_header is not True:
+            header_row = header
+        else:
+            header_row = 0
+        usecols = self.get_usecols(usecols, header_row is not None)
+        if excel_engine == file_parser_constants.streaming_excel_engine and (header_row is None or isinstance(header_row, int)) \
+                and excel_reader.is_streaming_supported(file_name):
+            return excel_reader.read_excel(file_name, sheet_name=sheet_name, dtype=file_dtype, header=header_row,
+                                           skiprows=skiprows, usecols=usecols)
         if sheet_name is None:
             if has_header is True:
-                df = pd.read_excel(io.BytesIO(
-                    file_name.read()), dtype=file_dtype, skiprows=skiprows)
+                df = pd.read_excel(file_name, dtype=file_dtype, skiprows=skiprows, usecols=usecols)
             else:
-                df = pd.read_excel(io.BytesIO(file_name.read()), dtype=file_dtype, header=header,
-                                        skiprows=skiprows)
+                df = pd.read_excel(file_name, dtype=file_dtype, header=header,
+                                        skiprows=skiprows, usecols=usecols)
         else:
-            df = pd.read_excel(io.BytesIO(file_name.read()), sheet_name=sheet_name, dtype=file_dtype,
-                                skiprows=skiprows)
+            df = pd.read_excel(file_name, sheet_name=sheet_name, dtype=file_dtype,
+                                skiprows=skiprows, usecols=usecols)
         return df
 
-    def creating_df_based_on_file_types(self, file_name, input_file_path, file_type, file_dtype=None, chunksize=None, sep=",", parser_func=None, sheet_name=None, skiprows=0, names = None, engine="c", header_info={'header': None, 'has_header': True, 'skip_header': False}, skip_footer=0):
+    def read_excel_sheet(self, excel_file, sheet_name, file_dtype, skiprows=0, usecols=None, skip_footer=0):
+        df = pd.read_excel(excel_file, sheet_name=sheet_name, dtype=file_dtype, skiprows=skiprows, usecols=usecols)
+        if skip_footer > 0:
+            df = df.iloc[:-skip_footer]
+        return df
+
+    def creating_df_based_on_file_types(self, file_name, input_file_path, file_type, file_dtype=None, chunksize=None, sep=",", parser_func=None, sheet_name=None, skiprows=0, names = None, engine="c", header_info={'header': None, 'has_header': True, 'skip_header': False}, skip_footer=0, excel_engine=None, usecols=None, xml_options=None, pages=None, pdf_options=None, etag=None):
+        """Decode file_name (a file object) by file type, recorded as the decode stage of the active metrics."""
+        with metrics.current_stats().span("decode", file_type=file_type) as span:
+            df = self.decode_file_type(file_name, input_file_path, file_type, file_dtype, chunksize, sep, parser_func, sheet_name, skiprows, names, engine, header_info, skip_footer,
+                                       excel_engine=excel_engine, usecols=usecols, xml_options=xml_options, pages=pages, pdf_options=pdf_options, etag=etag)
+            if isinstance(df, pd.DataFrame):
+                span.set(rows_out=df.shape[0])
+        return df
+
+    def decode_file_type(self, file_name, input_file_path, file_type, file_dtype=None, chunksize=None, sep=",", parser_func=None, sheet_name=None, skiprows=0, names = None, engine="c", header_info={'header': None, 'has_header': True, 'skip_header': False}, skip_footer=0, excel_engine=None, usecols=None, xml_options=None, pages=None, pdf_options=None, etag=None):
         if file_type in file_parser_constants.csv_file_type:
             # The errors are becasue the payouts and refunds are also in the same file but in a different format
-            df = self.create_df_from_csv(file_name, file_dtype=file_dtype, chunksize=chunksize, sep=sep, header=None, has_header=header_info['has_header'], skiprows=skiprows, skip_header = header_info['skip_header'], names = header_info['header'])
+            df = self.create_df_from_csv(file_name, file_dtype=file_dtype, chunksize=chunksize, sep=sep, header=None, has_header=header_info['has_header'], skiprows=skiprows, skip_header = header_info['skip_header'], names = header_info['header'], usecols=usecols)
         elif file_type in file_parser_constants.excel_file_type:
-            df = self.create_df_from_excel_file(file_name, file_dtype, header_info['header'], sheet_name, header_info['has_header'], skiprows)
+            df = self.create_df_from_excel_file(file_name, file_dtype, header_info['header'], sheet_name, header_info['has_header'], skiprows, excel_engine=excel_engine, usecols=usecols)
         elif file_type in file_parser_constants.txt_swt_sta_file_type:
             if header_info['has_header'] is True and isinstance(header_info['header'], list):
+                # positions keep the names aligned with the columns when the file has more columns than names
+                positions = [i for i, name in enumerate(header_info['header']) if usecols is None or (usecols(name) if callable(usecols) else name in usecols)]
                 df = pd.read_csv(file_name, skiprows=skiprows, sep=sep, skip_blank_lines=True, dtype=file_dtype,
-                                skipinitialspace=True, on_bad_lines='skip', names=header_info['header'],
-                                usecols=[i for i in range(len(header_info['header']))],chunksize=chunksize, engine=engine)
+                                skipinitialspace=True, on_bad_lines='skip', names=[header_info['header'][i] for i in positions],
+                                usecols=positions,chunksize=chunksize, engine=engine)
             else:
                 if parser_func:
                     return parser_func(file_name, input_file_path)
@@ -100,34 +225,23 @@ class S3FileParser:
                                     on_bad_lines='skip', dtype=file_dtype, chunksize=chunksize)
                 else:
                     df = pd.read_csv(file_name, skiprows=skiprows, sep=sep, skipinitialspace=True,
-                                        on_bad_lines='skip', dtype=file_dtype, chunksize=chunksize)
+                                        on_bad_lines='skip', dtype=file_dtype, chunksize=chunksize, usecols=usecols)
         elif file_type in file_parser_constants.pdf_file_type:
-            return self.convert_pdf_to_df(io.BytesIO(file_name.read()))
+            return self.convert_pdf_to_df(io.BytesIO(file_name.read()), pages=pages, pdf_options=pdf_options,
+                                          location=input_file_path, etag=etag)
         elif file_type in file_parser_constants.xml_file_type:
-            tree = etree.parse(file_name)
-            root = tree.getroot()  
-            txn_blocks = root.findall('.//Txn')
-            txn_data = []
-
-            for txn in txn_blocks:
-                txn_record = {child.tag: child.text for child in txn if child.tag != 'Fee'}
-
-                fees = txn.findall('.//Fee')
-                fee_records = {}
-                for i, fee in enumerate(fees):
-                    for child in fee:
-                        fee_records[f"{child.tag}_{i+1}"] = child.text
-                txn_record = {**txn_record, **fee_records}
-                txn_data.append(txn_record)
-            return pd.DataFrame(txn_data)
+            return xml_reader.read_xml(file_name, chunksize=chunksize, usecols=usecols, **(xml_options or {}))
         else:
             self._logger.print_log(LogLevel.EXCEPTION.value, "readFromS3::File format not handled")
             raise Exception("Format not handled")
         if skip_footer > 0:
-            df = df.iloc[:-skip_footer]
+            if chunksize:
+                df = common_utils.trim_footer_from_chunks(df, skip_footer)
+            else:
+                df = df.iloc[:-skip_footer]
         return df
 
-    def readFromS3(self, input_file_path, file_dtype=None, skiprows=0, sep=",", header=None, sheet_name=None, has_header=True, parser_func=None, chunksize=None, skip_header = False, names = None, skip_footer=0):
+    def readFromS3(self, input_file_path, file_dtype=None, skiprows=0, sep=",", header=None, sheet_name=None, has_header=True, parser_func=None, chunksize=None, skip_header = False, names = None, skip_footer=0, excel_engine=None, usecols=None, xml_options=None, pages=None, pdf_options=None):
         '''
         This function will fetch the file from S3, create a data frame and return the same to the caller.
         In case of pdf, it will also confert the pdf
@@ -138,15 +252,23 @@ class S3FileParser:
         @param header: list of all headers
         @param sheet_name: In case of xls/xlsx a specific sheet name.
         @param has_header: whether the file already has headers
-        @return: a single df for all except for PDF. For PDF it will return a list of dfs
+        @param chunksize: when set, csv/txt files are returned as an iterator of dataframes of this many rows
+        @param excel_engine: "streaming" reads xlsx files row by row, parsing the sheet xml with lxml iterparse (see excel_reader)
+        @param usecols: columns to read, names or a callable on the column name
+        @param xml_options: record_tag, repeated_groups and columns of xml files, see xml_reader.iter_xml
+        @param pages: pages of pdf files to read, e.g. "1-3,7", all pages by default
+        @param pdf_options: page parallel extraction of pdf files, see pdf_reader.read_pdf_pages
+        @return: a single df for all except for PDF. For PDF it will return a list of dfs, or one df with pdf_options
         '''
         self._logger.print_log(LogLevel.INFO.value, "readFromS3::Start")
         file_type = None
-        obj = self.getS3_object(input_file_path)
+        obj = self.getS3_object(input_file_path, stream=chunksize is not None)
         try:
             file_type = self.detect_type(input_file_path)
             df = self.creating_df_based_on_file_types(obj['Body'], input_file_path, file_type, file_dtype, chunksize, sep,
-                                            parser_func, sheet_name, skiprows, names, header_info={'header': header, 'has_header': has_header, 'skip_header': skip_header}, skip_footer=skip_footer)
+                                            parser_func, sheet_name, skiprows, names, header_info={'header': header, 'has_header': has_header, 'skip_header': skip_header}, skip_footer=skip_footer,
+                                            excel_engine=excel_engine, usecols=usecols, xml_options=xml_options,
+                                            pages=pages, pdf_options=pdf_options, etag=obj.get('ETag'))
         except Exception as e:
             self._logger.print_log(LogLevel.EXCEPTION.value, "readFromS3::Failed to load dataframe " + str(e))
             raise Exception(e)
@@ -156,32 +278,70 @@ class S3FileParser:
         '''
         This function will fetch the file from S3, create a data frame and return the same to the caller.
         In case of pdf, it will also confert the pdf
+        When range_read_zip is enabled in s3_config the archive is not downloaded upfront, the returned zip file
+        reads the central directory and the members that are opened through ranged GETs.
+        file:// archives are memory-mapped.
         @param inputFilePath: Path to s3
         @return: list of zip files
         '''
 
         self._logger.print_log(LogLevel.INFO.value, "readZipFromS3::Start")
-        obj = self.getS3_object(inputFilePath)
-
         try:
+            range_read_zip = self.get_s3_config(file_parser_constants.range_read_zip)
+            stats = self.get_download_stats(inputFilePath)
+            with stats.span("download", range_reads=bool(range_read_zip)) as span:
+                zip_content = self.get_storage_backend(inputFilePath).open_file(inputFilePath, range_reads=range_read_zip)
+                if hasattr(zip_content, "getbuffer"):
+                    span.set(bytes=zip_content.getbuffer().nbytes)
+                    stats.add("bytes_downloaded", zip_content.getbuffer().nbytes)
             if compression_type == "aes":
-              zfile = pyzipper.AESZipFile(BytesIO(obj['Body'].read()))
+              zfile = pyzipper.AESZipFile(zip_content)
             else:
-              zfile = ZipFile(BytesIO(obj['Body'].read()))
+              zfile = ZipFile(zip_content)
         except Exception as e:
             self._logger.print_log(LogLevel.EXCEPTION.value, "readZipFromS3::Failed to unzip file " + str(e))
             raise Exception(e)
         return zfile
 
-    def read_split_mt940_from_s3(self, input_file_path, parser_func):
+    def read_split_mt940_from_s3(self, input_file_path, parser_func=None, workers=1, executor=file_parser_constants.thread_executor):
+        """
+        Read a zip of split MT940 statements. The parts are joined in memory into one statement per chain (see
+        mt940_utils.join_mt940_statements) and every statement is parsed with parser_func(file object,
+        input_file_path), or read into a dataframe of transactions by mt940_utils.read_mt940 when parser_func is None.
+        Chains are parsed by up to workers threads or processes (executor "thread" or "process"). With the process
+        executor parser_func is sent to the worker processes, it must be picklable (a module level function, not a
+        lambda or a nested function).
+        @return: the parsed statement, dataframes of several chains are concatenated, other results returned as a list
+        """
         self._logger.print_log(LogLevel.INFO.value, "read_split_mt940_from_s3 :: Start")
+        if executor == file_parser_constants.process_executor and parser_func is not None:
+            try:
+                pickle.dumps(parser_func)
+            except Exception as e:
+                raise ConfigMissingException(f"parser_func must be picklable with the process executor, use a module level function :: {e}")
         obj = self.getS3_object(input_file_path)
         try:
-            file_name = mt940_utils.join_mt940_statements(obj['Body'])
-            file_type = self.detect_type(file_name)
-            df = self.creating_df_based_on_file_types(file_name, input_file_path, file_type, parser_func=parser_func)
-            self.delete_file(file_name)
-            return df
+            stats = metrics.current_stats()
+            with stats.span("decompress") as span:
+                members = mt940_utils.read_zip_members(obj['Body'])
+                statements = mt940_utils.join_mt940_statements(members)
+                span.set(members=len(members), statements=len(statements))
+            stats.add("zip_members", len(members))
+            if len(statements) == 0:
+                raise ValueError("No MT940 statement with an opening balance (60F) found")
+            with stats.span("decode", file_type="mt940"):
+                if workers is None or workers <= 1 or len(statements) <= 1:
+                    results = [mt940_utils.parse_statement(file_name, data, input_file_path, parser_func) for file_name, data in statements]
+                else:
+                    pool = ProcessPoolExecutor if executor == file_parser_constants.process_executor else ThreadPoolExecutor
+                    with pool(max_workers=min(workers, len(statements))) as statement_executor:
+                        futures = [statement_executor.submit(mt940_utils.parse_statement, file_name, data, input_file_path, parser_func) for file_name, data in statements]
+                        results = [future.result() for future in futures]
+            if len(results) == 1:
+                return results[0]
+            if all(isinstance(result, pd.DataFrame) for result in results):
+                return pd.concat(results, ignore_index=True)
+            return results
         except Exception as e:
             self._logger.print_log(
                 LogLevel.EXCEPTION.value, "read_split_mt940_from_s3 :: Failed to concatenate the file :: "
@@ -192,37 +352,41 @@ class S3FileParser:
         self._logger.print_log(LogLevel.INFO.value, "read_from_s3::Start:: report input_file_directory "
                                                                  "%s, input_file_path = %s " % (str(input_file_directory), str(input_file_path)))
         try:
-            s3 = boto3.client('s3')
-            obj = s3.get_object(Bucket=input_file_directory,
-                                Key=input_file_path)
+            obj = self.download_object(input_file_directory, input_file_path)
             return obj
         except Exception as e:
             self._logger.print_log(
                 LogLevel.EXCEPTION.value, "read_from_s3:: exception :: " + str(e))
             raise S3Exception(e)
 
-    def read_complete_excel_file(self, inputFilePath, file_dtype, return_df_list=False, skip_footer=0):
+    def read_complete_excel_file(self, inputFilePath, file_dtype, return_df_list=False, skip_footer=0, excel_engine=None, sheet_names=None, usecols=None):
+        '''
+        Read all sheets (or only sheet_names) of a workbook. With excel_engine "streaming" xlsx workbooks are
+        streamed row by row with lxml iterparse instead of being loaded through pd.ExcelFile, only the usecols
+        columns are materialized and columns are typed from file_dtype while reading.
+        '''
 
         self._logger.print_log(LogLevel.INFO.value, "read_complete_excel_file::Start")
         try:
-            s3 = boto3.client('s3')
-            relativePath = urlparse(inputFilePath).path
-            self._logger.print_log(LogLevel.INFO.value, "read_complete_excel_file::relativePath = " + str(relativePath[1:]))
-            bucket = self.get_s3_config('download_bucket')
-            obj = s3.get_object(Bucket=bucket, Key=relativePath[1:])
-            xl = pd.ExcelFile(io.BytesIO(obj['Body'].read()))
-            df_list = []
-            if(return_df_list==True):
-                for name in xl.sheet_names:
-                    df = pd.read_excel(xl, sheet_name=name, dtype=file_dtype,header=None)
+            self._logger.print_log(LogLevel.DEBUG.value, "read_complete_excel_file", relative_path=lambda: urlparse(inputFilePath).path[1:])
+            file = self.get_storage_backend(inputFilePath).open_file(inputFilePath)
+            header = None if return_df_list is True else 0
+            usecols = self.get_usecols(usecols, header is not None)
+            if excel_engine == file_parser_constants.streaming_excel_engine and excel_reader.is_streaming_supported(file):
+                dfs = excel_reader.read_excel_sheets(file, sheet_names, dtype=file_dtype, header=header,
+                                                     usecols=usecols, skip_footer=skip_footer)
+            else:
+                xl = pd.ExcelFile(file)
+                dfs = {}
+                for name in (xl.sheet_names if sheet_names is None else sheet_names):
+                    df = pd.read_excel(xl, sheet_name=name, dtype=file_dtype, header=header, usecols=usecols)
                     if skip_footer > 0:
                         df = df.iloc[:-skip_footer]
-                    df_list.append(df)
-                return df_list
-            for name in xl.sheet_names:
-                df = pd.read_excel(xl, sheet_name=name, dtype=file_dtype)
-                if skip_footer > 0:
-                    df = df.iloc[:-skip_footer]
+                    dfs[name] = df
+            if(return_df_list==True):
+                return list(dfs.values())
+            df_list = []
+            for name, df in dfs.items():
                 df[file_parser_constants.sheet_name] = name
                 df_list.append(df)
             df = pd.concat(df_list)
@@ -231,42 +395,19 @@ class S3FileParser:
             self._logger.print_log(LogLevel.EXCEPTION.value, "read_complete_excel_file::Failed to load dataframe" + str(e))
             raise Exception(e)
 
-    def upload_to_s3(self, df, file_name, product_folder=None, get_signed_url=None, link_expiry=None, return_path=False, base_location=None, sep=",", use_default_file_name=True):
+    def upload_to_s3(self, df, file_name, product_folder=None, get_signed_url=None, link_expiry=None, return_path=False, base_location=None, sep=",", use_default_file_name=True, compression=None):
         try:
             self._logger.print_log(LogLevel.INFO.value, "upload_to_s3::File name = " + file_name)
 
-            csv_buffer = self.df_to_csv(df, sep)
-            s3_resource = boto3.resource("s3")
-            # Write buffer to S3 object
-            now = datetime.now()
-
-            prefix_path = self.get_s3_config('backup_path')
-            if base_location:
-                prefix_path = self.get_s3_config(base_location)
-
-            product_path = ""
-            if product_folder is not None:
-                product_path = product_folder + "/"
-            file_path_prefix = prefix_path + str(now.year) + "_" + str(now.month) + "_" + str(now.day) + "/" + product_path
-            if use_default_file_name:
-                file_path = file_path_prefix + str(now.hour) + "_" + str(
-                    now.minute) + "_" + str(now.second) + "_" + file_name + ".csv"
-            else:
-                file_path = file_path_prefix + file_name
-            s3_resource.Object(self._upload_bucket, file_path).put(
-                Body=csv_buffer.getvalue())
+            file_path = self.get_upload_path(file_name, product_folder, base_location, use_default_file_name, compression)
+            quoting = csv.QUOTE_NONNUMERIC if sep == "," else csv.QUOTE_MINIMAL
+            self.stream_df_to_s3(df, self._upload_bucket, file_path, sep=sep, quoting=quoting, compression=compression)
             self._logger.print_log(LogLevel.INFO.value, "upload_to_s3::Upload successful")
             if not get_signed_url:
                 return
 
             self._logger.print_log(LogLevel.INFO.value, "upload_to_s3::Link Requested")
-            s3_client = boto3.client("s3",
-                                     config=botocore.config.Config(
-                                         signature_version='s3v4',
-                                         region_name='ap-south-1')
-                                     )
-            url = self.create_presigned_url(
-                s3_client, self._upload_bucket, file_path, link_expiry)
+            url = self.get_presigned_url(file_path, link_expiry)
             if return_path:
                 return url, file_path
             return url
@@ -274,17 +415,83 @@ class S3FileParser:
             self._logger.print_log(LogLevel.EXCEPTION.value, "upload_to_s3::Failed to write to DB " +str(e))
             raise Exception(e)
 
-    def upload_file_to_s3(self, input_file_directory, input_file_path, data_frame):
+    def get_upload_path(self, file_name, product_folder=None, base_location=None, use_default_file_name=True, compression=None, now=None):
+        """Key of an upload: <backup_path or base_location><year>_<month>_<day>/<product_folder>/<hour>_<minute>_<second>_<file_name>.csv"""
+        now = now or datetime.now()
+
+        prefix_path = self.get_s3_config('backup_path')
+        if base_location:
+            prefix_path = self.get_s3_config(base_location)
+
+        product_path = ""
+        if product_folder is not None:
+            product_path = product_folder + "/"
+        file_path_prefix = prefix_path + str(now.year) + "_" + str(now.month) + "_" + str(now.day) + "/" + product_path
+        if use_default_file_name:
+            return file_path_prefix + str(now.hour) + "_" + str(
+                now.minute) + "_" + str(now.second) + "_" + file_name + (".csv.gz" if compression == "gzip" else ".csv")
+        return file_path_prefix + file_name
+
+    def get_presigned_url(self, file_path, link_expiry=None):
+        # the s3v4 client is created once per process by s3_client_registry and shared by every upload
+        s3_client = self.get_s3_client(signature_version='s3v4',
+                                       region_name=self.get_s3_config(file_parser_constants.presign_region_name) or file_parser_constants.default_presign_region_name)
+        return self.create_presigned_url(s3_client, self._upload_bucket, file_path, link_expiry)
+
+    def upload_many(self, items, get_signed_url=None, link_expiry=None, base_location=None, sep=",", use_default_file_name=True, compression=None, max_workers=None):
+        """
+        Serialize and upload many dataframes concurrently, with the keys upload_to_s3 uses. At most max_workers
+        (default upload_concurrency of s3_config, then default_upload_concurrency) dataframes are uploaded at once
+        through the shared S3 clients. A failing upload is reported through its UploadResult and does not stop the
+        others.
+        The parts of all the uploads go through one pool of multipart_upload_concurrency threads, so at most
+        max_workers + multipart_upload_concurrency parts are held in memory at once. Every key is taken from the
+        time the batch starts, items with the same key (same file_name and product_folder) would overwrite each
+        other and fail with a ValueError instead, only the first of them is uploaded.
+        :param items: iterable of (df, file_name) or (df, file_name, product_folder) tuples
+        :return: list of UploadResult in the order of items, with the key and, with get_signed_url, the presigned url
+        """
+        items = [tuple(item) + (None,) * (3 - len(item)) for item in items]
+        max_workers = max_workers or self.get_s3_config(file_parser_constants.upload_concurrency) or file_parser_constants.default_upload_concurrency
+        quoting = csv.QUOTE_NONNUMERIC if sep == "," else csv.QUOTE_MINIMAL
+        now = datetime.now()
+        seen_paths = set()
+
+        def get_path(item):
+            file_path = self.get_upload_path(item[1], item[2], base_location, use_default_file_name, compression, now=now)
+            if file_path in seen_paths:
+                return ValueError(f"Duplicate upload key {file_path} in upload_many")
+            seen_paths.add(file_path)
+            return file_path
+
+        def upload(item, file_path):
+            df, file_name, product_folder = item
+            try:
+                if isinstance(file_path, Exception):
+                    raise file_path
+                self.stream_df_to_s3(df, self._upload_bucket, file_path, sep=sep, quoting=quoting, compression=compression,
+                                     shared_part_uploads=shared_part_uploads)
+                url = self.get_presigned_url(file_path, link_expiry) if get_signed_url else None
+                return UploadResult(file_name, product_folder, path=file_path, url=url)
+            except Exception as e:
+                self._logger.print_log(LogLevel.EXCEPTION.value, "upload_many :: Failed to upload", file_name=file_name, error=str(e))
+                return UploadResult(file_name, product_folder, error=e)
+
+        if len(items) == 0:
+            return []
+        file_paths = [get_path(item) for item in items]
+        self._logger.print_log(LogLevel.INFO.value, "upload_many", files=len(items), workers=max_workers)
+        stats = metrics.current_stats()
+        with SharedPartUploads(self.get_s3_config(file_parser_constants.multipart_upload_concurrency) or file_parser_constants.default_multipart_upload_concurrency) as shared_part_uploads, \
+                ThreadPoolExecutor(max_workers=min(max_workers, len(items)), thread_name_prefix="s3-upload") as executor:
+            return list(executor.map(lambda item, file_path: metrics.run_with_stats(stats, upload, item, file_path), items, file_paths))
+
+    def upload_file_to_s3(self, input_file_directory, input_file_path, data_frame, compression=None):
         self._logger.print_log(LogLevel.INFO.value, "upload_file_to_s3:: bucket :: " +
                           input_file_directory + "File path :: " + input_file_path)
         try:
-            s3 = boto3.resource('s3')
-
-            csv_buffer = StringIO()
-            data_frame.to_csv(csv_buffer, sep=",",
-                              quoting=csv.QUOTE_NONNUMERIC, index=False)
-            s3.Object(input_file_directory, input_file_path).put(
-                Body=csv_buffer.getvalue())
+            self.stream_df_to_s3(data_frame, input_file_directory, input_file_path, sep=",",
+                                 quoting=csv.QUOTE_NONNUMERIC, compression=compression)
             self._logger.print_log(
                 LogLevel.INFO.value, "upload_to_s3 :: Upload successful")
         except Exception as e:
@@ -292,6 +499,44 @@ class S3FileParser:
                 LogLevel.EXCEPTION.value, "upload_to_s3:: exception" + str(e))
             raise S3Exception(e)
 
+    def stream_df_to_s3(self, df, bucket, key, sep=",", quoting=csv.QUOTE_MINIMAL, compression=None, shared_part_uploads=None):
+        """
+        Serialize df upload_chunksize rows at a time straight into the parts of a multipart upload, optionally
+        gzip compressed, so memory stays bounded by the part size whatever the size of df. The upload is aborted
+        when serialization fails. shared_part_uploads, a SharedPartUploads, uploads the parts instead of a pool of
+        the upload's own.
+        """
+        if compression not in (None, "gzip"):
+            raise ConfigMissingException(f"Unsupported upload compression = {compression}")
+        writer = MultipartUploadWriter(
+            self.get_s3_client(), bucket, key,
+            part_size=self.get_s3_config(file_parser_constants.multipart_upload_part_size) or file_parser_constants.default_multipart_upload_part_size,
+            concurrency=self.get_s3_config(file_parser_constants.multipart_upload_concurrency) or file_parser_constants.default_multipart_upload_concurrency,
+            shared_part_uploads=shared_part_uploads)
+        stats = metrics.current_stats()
+        with stats.span("upload", rows_in=df.shape[0], compression=compression) as span:
+            try:
+                binary_stream = gzip.GzipFile(fileobj=writer, mode="wb") if compression == "gzip" else writer
+                text_stream = io.TextIOWrapper(binary_stream, encoding="utf-8", newline="", write_through=True)
+                try:
+                    delimited_writer.write_delimited(df, text_stream, sep=sep, quoting=quoting,
+                                                     chunksize=self.get_s3_config(file_parser_constants.upload_chunksize) or file_parser_constants.default_upload_chunksize)
+                finally:
+                    text_stream.detach()
+                if binary_stream is not writer:
+                    binary_stream.close()
+            except BaseException:
+                writer.abort()
+                raise
+            writer.close()
+            span.set(bytes=writer.bytes_written)
+        stats.add("bytes_uploaded", writer.bytes_written)
+        return writer.bytes_written
+
+    def get_s3_client(self, signature_version=None, region_name=None):
+        s3_config = self._config.get('s3_config') if self._config is not None else None
+        return s3_client_registry.get_s3_client(s3_config, signature_version=signature_version, region_name=region_name)
+
     def create_presigned_url(self, s3_client, bucket_name, object_name, expiration=86400):
         self._logger.print_log(LogLevel.INFO.value, "create_presigned_url :: requested-file")
         params = {
@@ -314,13 +559,8 @@ class S3FileParser:
 
     def df_to_csv(self, df, delim=","):
         local_buffer = StringIO()
-        if delim == "~~":
-            local_buffer = df.to_csv(index=False)
-            local_buffer = StringIO(local_buffer)
-            buffer_data = local_buffer.read()
-            buffer_data = buffer_data.replace(",", delim)
-            local_buffer.seek(0)
-            local_buffer.write(buffer_data)
+        if len(delim) > 1:
+            delimited_writer.write_delimited(df, local_buffer, sep=delim)
             local_buffer.seek(0)
         elif delim != ",":
             df.to_csv(local_buffer, sep=delim, index=False)
@@ -0,0 +1,104 @@
+import io
+from concurrent.futures import ThreadPoolExecutor
+
+from botocore.exceptions import ClientError
+
+from . import file_parser_constants
+
+
+def is_not_modified(error):
+    return error.response.get('Error', {}).get('Code') in ('304', 'NotModified') or \
+        error.response.get('ResponseMetadata', {}).get('HTTPStatusCode') == 304
+
+
+def get_part_ranges(start, total_size, part_size):
+    return [(part_start, min(part_start + part_size, total_size)) for part_start in range(start, total_size, part_size)]
+
+
+def allocate_buffer(size):
+    """
+    Return a zero filled BytesIO of size bytes. Growing an empty BytesIO allocates its buffer once, unlike
+    BytesIO(bytes(size)) whose shared bytes are copied again by the first getbuffer().
+    """
+    buffer = io.BytesIO()
+    buffer.seek(size - 1)
+    buffer.write(b"\0")
+    buffer.seek(0)
+    return buffer
+
+
+def read_into(body, view):
+    """Fill view from a response body, straight into the buffer when the body supports readinto."""
+    if not hasattr(body, 'readinto'):
+        view[:] = body.read()
+        return
+    filled = 0
+    while filled < len(view):
+        count = body.readinto(view[filled:])
+        if not count:
+            raise IOError(f"Incomplete read, {filled} of {len(view)} bytes")
+        filled += count
+
+
+def download_s3_object(s3_client, bucket, key, part_size=file_parser_constants.default_multipart_download_part_size,
+                       concurrency=file_parser_constants.default_multipart_download_concurrency,
+                       threshold=file_parser_constants.default_multipart_download_threshold, if_none_match=None):
+    """
+        Download an S3 object with ranged GETs. The first part_size bytes are requested first, objects which fit in
+        it are returned with the streaming body of that response. Larger objects are written into one preallocated
+        buffer, the remaining bytes are fetched with a single ranged GET below threshold and split into parts of
+        part_size fetched by concurrency threads above it.
+
+        if_none_match makes the first request conditional, an unchanged object then raises the 304 ClientError
+        without any body being transferred.
+
+        :return: get_object like response whose Body is a seekable, in-memory buffer for multipart downloads
+    """
+    conditional_params = {'IfNoneMatch': if_none_match} if if_none_match is not None else {}
+    try:
+        first_part = s3_client.get_object(Bucket=bucket, Key=key, Range="bytes=0-%d" % (part_size - 1), **conditional_params)
+    except ClientError as e:
+        # ranged GETs of empty objects are rejected with InvalidRange
+        if e.response.get('Error', {}).get('Code') != 'InvalidRange':
+            raise
+        return s3_client.get_object(Bucket=bucket, Key=key, **conditional_params)
+
+    content_range = first_part.get('ContentRange')
+    total_size = int(content_range.split("/")[-1]) if content_range else first_part['ContentLength']
+    first_part_size = first_part['ContentLength']
+    if first_part_size >= total_size:
+        return first_part
+
+    buffer = allocate_buffer(total_size)
+    view = buffer.getbuffer()
+    try:
+        read_into(first_part['Body'], view[:first_part_size])
+        if total_size < threshold:
+            parts = [(first_part_size, total_size)]
+        else:
+            parts = get_part_ranges(first_part_size, total_size, part_size)
+
+        request_params = {'Bucket': bucket, 'Key': key}
+        if first_part.get('ETag'):
+            # fail instead of stitching together parts of two different versions of the object
+            request_params['IfMatch'] = first_part['ETag']
+
+        def download_part(part):
+            part_start, part_end = part
+            response = s3_client.get_object(Range="bytes=%d-%d" % (part_start, part_end - 1), **request_params)
+            read_into(response['Body'], view[part_start:part_end])
+
+        if len(parts) == 1 or concurrency <= 1:
+            for part in parts:
+                download_part(part)
+        else:
+            with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                # list() re-raises the first failed part
+                list(executor.map(download_part, parts))
+    finally:
+        view.release()
+
+    response = {key: value for key, value in first_part.items() if key not in ('Body', 'ContentRange')}
+    response['ContentLength'] = total_size
+    response['Body'] = buffer
+    return response
@@ -0,0 +1,138 @@
+import io
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from . import file_parser_constants
+
+
+class MultipartUploadWriter(io.RawIOBase):
+    """
+        Writable binary stream uploading to S3. Written bytes are collected into parts of part_size which are
+        uploaded as parts of a multipart upload by up to concurrency threads, so at most concurrency + 1 parts are
+        held in memory whatever the size of the object. An object smaller than one part is uploaded with a single
+        put_object on close. close() completes the upload and abort() discards it.
+
+        Writers uploading concurrently can share a SharedPartUploads, their parts are then uploaded by its pool
+        and at most its concurrency parts of all the writers are in flight at once.
+    """
+
+    def __init__(self, s3_client, bucket, key, part_size=file_parser_constants.default_multipart_upload_part_size,
+                 concurrency=file_parser_constants.default_multipart_upload_concurrency, extra_args=None, shared_part_uploads=None):
+        super().__init__()
+        if part_size < file_parser_constants.min_multipart_upload_part_size:
+            raise ValueError(f"part_size must be at least {file_parser_constants.min_multipart_upload_part_size} bytes")
+        self._s3_client = s3_client
+        self._bucket = bucket
+        self._key = key
+        self._part_size = part_size
+        self._concurrency = max(concurrency, 1)
+        self._extra_args = extra_args or {}
+        self._shared_part_uploads = shared_part_uploads
+        self._buffer = bytearray()
+        self._upload_id = None
+        self._executor = None
+        self._pending_parts = set()
+        self._parts = []
+        self.bytes_written = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._buffer += data
+        self.bytes_written += len(data)
+        while len(self._buffer) >= self._part_size:
+            self._submit_part(bytes(self._buffer[:self._part_size]))
+            del self._buffer[:self._part_size]
+        return len(data)
+
+    def _upload_part(self, part_number, data):
+        response = self._s3_client.upload_part(Bucket=self._bucket, Key=self._key, UploadId=self._upload_id,
+                                               PartNumber=part_number, Body=data)
+        return {'PartNumber': part_number, 'ETag': response['ETag']}
+
+    def _collect_parts(self, futures):
+        for future in futures:
+            self._pending_parts.discard(future)
+            self._parts.append(future.result())
+
+    def _submit_part(self, data):
+        if self._upload_id is None:
+            self._upload_id = self._s3_client.create_multipart_upload(Bucket=self._bucket, Key=self._key, **self._extra_args)['UploadId']
+            if self._shared_part_uploads is None:
+                self._executor = ThreadPoolExecutor(max_workers=self._concurrency, thread_name_prefix="s3-multipart-upload")
+        part_number = len(self._parts) + len(self._pending_parts) + 1
+        executor = self._shared_part_uploads or self._executor
+        self._pending_parts.add(executor.submit(self._upload_part, part_number, data))
+        if len(self._pending_parts) >= self._concurrency:
+            # back pressure, serialization waits for a part upload instead of buffering more parts
+            done, _ = wait(self._pending_parts, return_when=FIRST_COMPLETED)
+            self._collect_parts(done)
+
+    def close(self):
+        if self.closed:
+            return
+        try:
+            if self._upload_id is None:
+                self._s3_client.put_object(Bucket=self._bucket, Key=self._key, Body=bytes(self._buffer), **self._extra_args)
+            else:
+                if self._buffer:
+                    self._submit_part(bytes(self._buffer))
+                self._collect_parts(list(self._pending_parts))
+                self._s3_client.complete_multipart_upload(
+                    Bucket=self._bucket, Key=self._key, UploadId=self._upload_id,
+                    MultipartUpload={'Parts': sorted(self._parts, key=lambda part: part['PartNumber'])})
+        except BaseException:
+            self.abort()
+            raise
+        self._release()
+        super().close()
+
+    def abort(self):
+        if self.closed:
+            return
+        try:
+            if self._upload_id is not None:
+                wait(self._pending_parts)
+                self._s3_client.abort_multipart_upload(Bucket=self._bucket, Key=self._key, UploadId=self._upload_id)
+        finally:
+            self._release()
+            super().close()
+
+    def _release(self):
+        self._buffer = bytearray()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+
+
+class SharedPartUploads:
+    """
+        Thread pool uploading the parts of several MultipartUploadWriters. submit blocks while concurrency parts
+        are in flight, so writers sharing it hold at most concurrency parts in flight plus one part being filled
+        each.
+    """
+
+    def __init__(self, concurrency=file_parser_constants.default_multipart_upload_concurrency):
+        self._concurrency = max(concurrency, 1)
+        self._slots = threading.BoundedSemaphore(self._concurrency)
+        self._executor = ThreadPoolExecutor(max_workers=self._concurrency, thread_name_prefix="s3-multipart-upload")
+
+    def submit(self, func, *args):
+        self._slots.acquire()
+        try:
+            future = self._executor.submit(func, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.shutdown()
+        return False
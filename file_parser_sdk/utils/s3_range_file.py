@@ -0,0 +1,116 @@
+import io
+from collections import OrderedDict
+
+from . import file_parser_constants
+
+
+class S3RangeFile(io.RawIOBase):
+    """
+        Read-only, seekable file object over an S3 object which downloads only the byte ranges that are read.
+        Ranges are fetched block_size bytes at a time with ranged GETs and the most recent cache_blocks blocks are
+        kept in memory, so ZipFile/AESZipFile can read the central directory and the required members without the
+        whole archive being downloaded.
+    """
+
+    def __init__(self, s3_client, bucket, key, block_size=file_parser_constants.default_range_read_block_size,
+                 cache_blocks=file_parser_constants.default_range_read_cache_blocks, size=None):
+        super().__init__()
+        self._s3_client = s3_client
+        self._bucket = bucket
+        self._key = key
+        self._block_size = block_size
+        self._cache_blocks = cache_blocks
+        self._blocks = OrderedDict()
+        self._position = 0
+        self.requests_made = 0
+        self.bytes_fetched = 0
+        if size is None:
+            size = s3_client.head_object(Bucket=bucket, Key=key)['ContentLength']
+        self._size = size
+
+    @property
+    def size(self):
+        return self._size
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._position
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self._position + offset
+        elif whence == io.SEEK_END:
+            position = self._size + offset
+        else:
+            raise ValueError("Invalid whence value: " + str(whence))
+        if position < 0:
+            raise ValueError("Negative seek position " + str(position))
+        self._position = position
+        return self._position
+
+    def read(self, size=-1):
+        if self.closed:
+            raise ValueError("I/O operation on closed file")
+        start = self._position
+        end = self._size if size is None or size < 0 else min(start + size, self._size)
+        if start >= end:
+            return b""
+        first_block = start // self._block_size
+        last_block = (end - 1) // self._block_size
+        if last_block - first_block + 1 > self._cache_blocks:
+            # a read larger than the cache would only evict everything, fetch it in one request instead
+            data = self._fetch_range(start, end)
+        else:
+            self._load_blocks(first_block, last_block)
+            data = b"".join(self._blocks[index] for index in range(first_block, last_block + 1))
+            offset = start - first_block * self._block_size
+            data = data[offset:offset + end - start]
+        self._position = end
+        return data
+
+    def readall(self):
+        return self.read(-1)
+
+    def readinto(self, buffer):
+        data = self.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+    def _load_blocks(self, first_block, last_block):
+        missing = []
+        for index in range(first_block, last_block + 1):
+            if index in self._blocks:
+                self._blocks.move_to_end(index)
+            else:
+                missing.append(index)
+        # consecutive missing blocks are fetched with a single ranged GET
+        while missing:
+            run_start = missing[0]
+            run_end = run_start
+            while len(missing) > run_end - run_start + 1 and missing[run_end - run_start + 1] == run_end + 1:
+                run_end += 1
+            missing = missing[run_end - run_start + 1:]
+            data = self._fetch_range(run_start * self._block_size, min((run_end + 1) * self._block_size, self._size))
+            for index in range(run_start, run_end + 1):
+                offset = (index - run_start) * self._block_size
+                self._blocks[index] = data[offset:offset + self._block_size]
+        while len(self._blocks) > max(self._cache_blocks, last_block - first_block + 1):
+            self._blocks.popitem(last=False)
+
+    def _fetch_range(self, start, end):
+        response = self._s3_client.get_object(Bucket=self._bucket, Key=self._key, Range="bytes=%d-%d" % (start, end - 1))
+        data = response['Body'].read()
+        self.requests_made += 1
+        self.bytes_fetched += len(data)
+        return data
+
+    def close(self):
+        self._blocks.clear()
+        super().close()
@@ -0,0 +1,173 @@
+import abc
+import hashlib
+import io
+import mmap
+import os
+from urllib.parse import urlparse
+from urllib.request import url2pathname
+
+from botocore.exceptions import ClientError
+
+from . import file_parser_constants, s3_multipart_download
+from .object_cache import get_object_cache
+from .s3_range_file import S3RangeFile
+from .mapped_file import MappedFile
+from ..exceptions.expcetion import ResourceNotFoundException
+
+
+class StorageBackend(abc.ABC):
+    """
+        Interface through which S3FileParser reads input files. Backends are registered per url scheme
+        (s3://, file://, ...) and return get_object like responses, i.e. a dict with a readable 'Body'.
+    """
+
+    @abc.abstractmethod
+    def get_object(self, location, stream=False):
+        pass
+
+    def open_file(self, location, range_reads=False):
+        """Return a seekable binary file object for readers which need random access (zip, excel)."""
+        body = self.get_object(location)['Body']
+        if hasattr(body, 'seekable') and body.seekable():
+            return body
+        return io.BytesIO(body.read())
+
+    def read_bytes(self, location):
+        return self.get_object(location)['Body'].read()
+
+    @abc.abstractmethod
+    def get_cache_identity(self, location):
+        """
+        Return (resolved location, version tag) of an object without downloading it, used as cache key. The tag
+        changes whenever the content does, e.g. the ETag of an S3 object.
+        """
+
+
+class S3StorageBackend(StorageBackend):
+    """
+        Reads objects from S3 through the shared client. The key is the path of the url and the bucket is
+        download_bucket from s3_config, falling back to the bucket of the url.
+    """
+
+    def __init__(self, s3_config, get_s3_client):
+        self._s3_config = s3_config or {}
+        self._get_s3_client = get_s3_client
+
+    def get_location(self, location):
+        parsed_location = urlparse(location)
+        return self._s3_config.get('download_bucket') or parsed_location.netloc, parsed_location.path[1:]
+
+    def get_object(self, location, stream=False):
+        bucket, key = self.get_location(location)
+        return self.get_object_from_bucket(bucket, key, stream=stream)
+
+    def get_cache_identity(self, location):
+        bucket, key = self.get_location(location)
+        response = self._get_s3_client().head_object(Bucket=bucket, Key=key)
+        return f"s3://{bucket}/{key}", response['ETag']
+
+    def get_object_from_bucket(self, bucket, key, stream=False):
+        """
+        Download an object, through the object cache when object_cache is configured in s3_config. Cached objects
+        are revalidated with a conditional GET, so an unchanged object costs one round-trip without a body.
+        """
+        s3 = self._get_s3_client()
+        if stream:
+            return s3.get_object(Bucket=bucket, Key=key)
+        object_cache = get_object_cache(self._s3_config.get(file_parser_constants.object_cache))
+        cache_key = f"{bucket}/{key}"
+        cached = object_cache.get(cache_key) if object_cache is not None else None
+        try:
+            response = s3_multipart_download.download_s3_object(
+                s3, bucket, key,
+                part_size=self._s3_config.get(file_parser_constants.multipart_download_part_size) or file_parser_constants.default_multipart_download_part_size,
+                concurrency=self._s3_config.get(file_parser_constants.multipart_download_concurrency) or file_parser_constants.default_multipart_download_concurrency,
+                threshold=self._s3_config.get(file_parser_constants.multipart_download_threshold) or file_parser_constants.default_multipart_download_threshold,
+                if_none_match=cached[0] if cached is not None else None)
+        except ClientError as e:
+            if cached is None or not s3_multipart_download.is_not_modified(e):
+                raise
+            etag, body, size = cached
+            return {'Body': body, 'ContentLength': size, 'ETag': etag}
+        if object_cache is not None and response.get('ETag'):
+            data = response['Body'].read()
+            object_cache.put(cache_key, response['ETag'], data)
+            response['Body'] = io.BytesIO(data)
+        return response
+
+    def open_file(self, location, range_reads=False):
+        if not range_reads:
+            return super().open_file(location)
+        bucket, key = self.get_location(location)
+        block_size = self._s3_config.get(file_parser_constants.range_read_block_size) or file_parser_constants.default_range_read_block_size
+        cache_blocks = self._s3_config.get(file_parser_constants.range_read_cache_blocks) or file_parser_constants.default_range_read_cache_blocks
+        return S3RangeFile(self._get_s3_client(), bucket, key, block_size=block_size, cache_blocks=cache_blocks)
+
+
+class LocalFileStorageBackend(StorageBackend):
+    """
+        Reads file:// urls from local disk. Files are memory-mapped and handed to pandas, zipfile and lxml as a
+        MappedFile, so the file content is paged in by the OS instead of being downloaded or read into memory upfront.
+    """
+
+    def get_path(self, location):
+        parsed_location = urlparse(location)
+        return url2pathname(parsed_location.netloc + parsed_location.path)
+
+    def get_object(self, location, stream=False):
+        path = self.get_path(location)
+        if not os.path.isfile(path):
+            raise ResourceNotFoundException(f"File not found :: {path}")
+        size = os.path.getsize(path)
+        if size == 0:
+            # empty files cannot be memory-mapped
+            return {'Body': io.BytesIO(b""), 'ContentLength': 0}
+        with open(path, 'rb') as file:
+            mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        return {'Body': MappedFile(mapping), 'ContentLength': size}
+
+    def open_file(self, location, range_reads=False):
+        return self.get_object(location)['Body']
+
+    def get_cache_identity(self, location):
+        path = os.path.abspath(self.get_path(location))
+        stat = os.stat(path)
+        return "file://" + path, f"{stat.st_mtime_ns}-{stat.st_size}"
+
+
+class InMemoryStorageBackend(StorageBackend):
+    """
+        Serves objects from a {location: bytes} dict, for tests and for objects which were already downloaded.
+        Locations which are not in the dict are delegated to fallback when one is given. The cache identity of an
+        object is taken from cache_identities, then from fallback (e.g. the ETag of the S3 object the bytes were
+        downloaded from) and only without either is it a hash of the bytes.
+    """
+
+    def __init__(self, objects=None, fallback=None, cache_identities=None):
+        self.objects = dict(objects or {})
+        self._fallback = fallback
+        self._cache_identities = dict(cache_identities or {})
+
+    def put_object(self, location, data):
+        self.objects[location] = data
+
+    def get_object(self, location, stream=False):
+        if location not in self.objects:
+            if self._fallback is not None:
+                return self._fallback.get_object(location, stream=stream)
+            raise ResourceNotFoundException(f"Object not found :: {location}")
+        data = self.objects[location]
+        # BytesIO shares the buffer of a bytes object until it is written to
+        return {'Body': io.BytesIO(data), 'ContentLength': len(data)}
+
+    def open_file(self, location, range_reads=False):
+        if location not in self.objects and self._fallback is not None:
+            return self._fallback.open_file(location, range_reads=range_reads)
+        return self.get_object(location)['Body']
+
+    def get_cache_identity(self, location):
+        if location in self._cache_identities:
+            return self._cache_identities[location]
+        if self._fallback is not None:
+            return self._fallback.get_cache_identity(location)
+        return location, hashlib.md5(self.get_object(location)['Body'].getbuffer()).hexdigest()
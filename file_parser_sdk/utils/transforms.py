@@ -0,0 +1,184 @@
+"""
+    Built-in, fully vectorized edge case transforms. They are configured in the edge_case section of a file_source
+    like user_edge_cases functions, e.g. "edge_case": {"parse_dates": {"columns": ["MisDate"], "format": "%d-%m-%Y"}},
+    and a list of parameter dicts runs the same transform several times. A function of the same name in
+    user_edge_cases takes precedence over the built-in one.
+"""
+import numpy as np
+import pandas as pd
+
+from ..exceptions.expcetion import ConfigMissingException
+
+
+def _get_string_dtype():
+    """Arrow backed strings run the string kernels in C++, plain python strings are used without pyarrow."""
+    try:
+        import pyarrow  # noqa: F401
+        return "string[pyarrow]"
+    except ImportError:
+        return "string"
+
+
+def _as_text(series):
+    return series.astype(_get_string_dtype())
+
+
+def _to_object(text):
+    # back to the object strings with NaN for missing values which the rest of the pipeline works with
+    return pd.Series(text.to_numpy(dtype=object, na_value=np.nan), index=text.index, name=text.name)
+
+
+def _get_columns(df, params):
+    columns = params.get("columns")
+    if columns is None:
+        raise ConfigMissingException("columns missing in transform parameters")
+    missing_columns = [column for column in columns if column not in df.columns]
+    if missing_columns:
+        raise ConfigMissingException(f"Columns {missing_columns} not found in the file")
+    return columns
+
+
+def parse_dates(df, params):
+    """
+    Parse date columns with one pd.to_datetime call per column. params: columns, format (strptime format, inferred
+    when missing), dayfirst, errors ("coerce" by default) and output_format to render the dates back as strings.
+    """
+    for column in _get_columns(df, params):
+        dates = pd.to_datetime(df[column], format=params.get("format"), dayfirst=params.get("dayfirst", False),
+                               errors=params.get("errors", "coerce"))
+        if params.get("output_format") is not None:
+            dates = dates.dt.strftime(params["output_format"])
+        df[column] = dates
+    return df
+
+
+def convert_amounts(df, params):
+    """
+    Turn amount text such as "INR 1,234.50", "(12.00)" or "12.00 CR" into numbers. params: columns, thousands
+    (default ","), decimal (default "."), negative_parentheses (default True), debit_suffixes (e.g. ["DR"]),
+    multiply_by/divide_by, round, and currency_column with rates ({currency: rate}) to convert every row into
+    one currency.
+    """
+    for column in _get_columns(df, params):
+        amounts = df[column]
+        if not pd.api.types.is_numeric_dtype(amounts):
+            text = _as_text(amounts).str.strip()
+            negative = pd.Series(False, index=df.index)
+            if params.get("negative_parentheses", True):
+                negative |= text.str.startswith("(", na=False) & text.str.endswith(")", na=False)
+            for suffix in params.get("debit_suffixes", []):
+                negative |= text.str.upper().str.endswith(suffix.upper(), na=False)
+            thousands = params.get("thousands", ",")
+            if thousands:
+                text = text.str.replace(thousands, "", regex=False)
+            decimal = params.get("decimal", ".")
+            if decimal != ".":
+                text = text.str.replace(decimal, ".", regex=False)
+            # drops currency symbols, codes and CR/DR markers around the number
+            text = text.str.extract(r"(-?\d*\.?\d+(?:[eE][-+]?\d+)?)", expand=False)
+            amounts = pd.to_numeric(text, errors="coerce")
+            amounts = amounts.mask(negative, -amounts.abs())
+        if params.get("multiply_by") is not None:
+            amounts = amounts * params["multiply_by"]
+        if params.get("divide_by") is not None:
+            amounts = amounts / params["divide_by"]
+        if params.get("currency_column") is not None:
+            amounts = amounts * df[params["currency_column"]].map(params.get("rates", {})).fillna(params.get("default_rate", 1))
+        if params.get("round") is not None:
+            amounts = amounts.round(params["round"])
+        df[column] = amounts
+    return df
+
+
+def clean_strings(df, params):
+    """
+    Clean text columns. params: columns, strip (default True), case ("upper", "lower" or "title"), remove (regex of
+    characters to delete), replace ({regex: replacement}), collapse_whitespace and empty_as_null.
+    """
+    for column in _get_columns(df, params):
+        text = _as_text(df[column])
+        if params.get("strip", True):
+            text = text.str.strip()
+        if params.get("collapse_whitespace"):
+            text = text.str.replace(r"\s+", " ", regex=True)
+        if params.get("remove") is not None:
+            text = text.str.replace(params["remove"], "", regex=True)
+        for pattern, replacement in params.get("replace", {}).items():
+            text = text.str.replace(pattern, replacement, regex=True)
+        case = params.get("case")
+        if case in ("upper", "lower", "title"):
+            text = getattr(text.str, case)()
+        if params.get("empty_as_null"):
+            text = text.mask(text == "")
+        df[column] = _to_object(text)
+    return df
+
+
+def split_column(df, params):
+    """Split column on separator into the columns listed in into. params: column, separator, into, regex, keep."""
+    column = params["column"]
+    into = params["into"]
+    parts = _as_text(df[column]).str.split(params.get("separator", " "), n=len(into) - 1, expand=True,
+                                                   regex=params.get("regex", False))
+    for index, name in enumerate(into):
+        df[name] = _to_object(parts[index]) if index in parts.columns else np.nan
+    if params.get("keep", True) is False and column not in into:
+        df = df.drop(columns=[column])
+    return df
+
+
+def merge_columns(df, params):
+    """Join columns into one text column. params: columns, into, separator (default ""), na_rep (default "")."""
+    columns = _get_columns(df, params)
+    texts = [df[column].astype("string") for column in columns]
+    merged = texts[0].str.cat(texts[1:], sep=params.get("separator", ""), na_rep=params.get("na_rep", ""))
+    df[params["into"]] = _to_object(merged)
+    return df
+
+
+def constant_columns(df, params):
+    """Add columns with a constant value, params: {"values": {column: value}}."""
+    for column, value in params["values"].items():
+        df[column] = value
+    return df
+
+
+def cast_columns(df, params):
+    """
+    Cast columns, params: {"dtypes": {column: dtype}}. "numeric" and "datetime" parse with errors coerced, every
+    other dtype (str, "Int64", "float32", "category", ...) goes through astype.
+    """
+    for column, dtype in params["dtypes"].items():
+        if column not in df.columns:
+            raise ConfigMissingException(f"Column {column} not found in the file")
+        if dtype == "numeric":
+            df[column] = pd.to_numeric(df[column], errors="coerce")
+        elif dtype == "datetime":
+            df[column] = pd.to_datetime(df[column], errors="coerce")
+        elif dtype in (str, "str"):
+            df[column] = df[column].where(df[column].isna(), df[column].astype(str))
+        else:
+            df[column] = df[column].astype(dtype)
+    return df
+
+
+builtin_transforms = {
+    "parse_dates": parse_dates,
+    "convert_amounts": convert_amounts,
+    "clean_strings": clean_strings,
+    "split_column": split_column,
+    "merge_columns": merge_columns,
+    "constant_columns": constant_columns,
+    "cast_columns": cast_columns,
+}
+
+
+def get_builtin_transform(name):
+    return builtin_transforms.get(name)
+
+
+def apply_builtin_transform(df, name, params):
+    transform = builtin_transforms[name]
+    for transform_params in (params if isinstance(params, list) else [params]):
+        df = transform(df, transform_params or {})
+    return df
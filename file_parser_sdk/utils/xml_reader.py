@@ -0,0 +1,107 @@
+from lxml import etree
+import pandas as pd
+
+default_record_tag = "Txn"
+default_repeated_groups = ["Fee"]
+
+
+class _ColumnBuffers:
+    """Column lists filled record by record, missing values are padded with None when the next value arrives."""
+
+    def __init__(self):
+        self.columns = {}
+        self.rows = 0
+
+    def set(self, name, value):
+        column = self.columns.get(name)
+        if column is None:
+            column = self.columns[name] = []
+        missing = self.rows - len(column)
+        if missing >= 0:
+            if missing > 0:
+                column.extend([None] * missing)
+            column.append(value)
+        else:
+            # a repeated field, the last value wins
+            column[-1] = value
+
+    def to_dataframe(self):
+        for column in self.columns.values():
+            column.extend([None] * (self.rows - len(column)))
+        return pd.DataFrame(self.columns, index=pd.RangeIndex(self.rows))
+
+
+def iter_xml(file_obj, record_tag=default_record_tag, repeated_groups=None, columns=None, usecols=None, chunksize=None):
+    """
+    Stream the records of an xml document with iterparse and yield dataframes of chunksize records (one dataframe
+    of every record when chunksize is None). Each record element is cleared and dropped once read and values go
+    straight into column lists, so memory is bounded by the parsed values rather than the document.
+
+    Direct children of a record become columns named by their tag. The children of every repeated group element
+    below a record are numbered by occurrence, e.g. Value of the second Fee becomes Value_2.
+    :param record_tag: tag of the record elements, found at any depth
+    :param repeated_groups: tags of repeated child groups which are flattened into numbered columns
+    :param columns: {generated column name: column name} renames
+    :param usecols: names or a callable on the (renamed) column name, other fields are not buffered
+    """
+    repeated_groups = set(default_repeated_groups if repeated_groups is None else repeated_groups)
+    group_tags = ["{*}" + group for group in repeated_groups]
+    columns = columns or {}
+    # (tag, occurrence) -> column name, None for fields which are not read and for repeated groups
+    column_names = {}
+
+    def get_column_name(tag, occurrence):
+        name = etree.QName(tag).localname
+        if occurrence is None and name in repeated_groups:
+            column_name = None
+        else:
+            name = name if occurrence is None else f"{name}_{occurrence}"
+            column_name = columns.get(name, name)
+            if usecols is not None and not (usecols(column_name) if callable(usecols) else column_name in usecols):
+                column_name = None
+        column_names[(tag, occurrence)] = column_name
+        return column_name
+
+    buffers = _ColumnBuffers()
+    for _, record in etree.iterparse(file_obj, events=("end",), tag="{*}" + record_tag, huge_tree=True):
+        for child in record:
+            tag = child.tag
+            # comments and processing instructions have no string tag
+            if not isinstance(tag, str):
+                continue
+            column_name = column_names.get((tag, None), False)
+            if column_name is False:
+                column_name = get_column_name(tag, None)
+            if column_name is not None:
+                buffers.set(column_name, child.text)
+        if group_tags:
+            occurrences = {}
+            for group_element in record.iterdescendants(*group_tags):
+                occurrence = occurrences[group_element.tag] = occurrences.get(group_element.tag, 0) + 1
+                for child in group_element:
+                    tag = child.tag
+                    if not isinstance(tag, str):
+                        continue
+                    column_name = column_names.get((tag, occurrence), False)
+                    if column_name is False:
+                        column_name = get_column_name(tag, occurrence)
+                    if column_name is not None:
+                        buffers.set(column_name, child.text)
+        buffers.rows += 1
+        record.clear()
+        # drop the already processed records from the partially built tree
+        while record.getprevious() is not None:
+            del record.getparent()[0]
+        if chunksize is not None and buffers.rows >= chunksize:
+            yield buffers.to_dataframe()
+            buffers = _ColumnBuffers()
+    if chunksize is None or buffers.rows > 0:
+        yield buffers.to_dataframe()
+
+
+def read_xml(file_obj, chunksize=None, **kwargs):
+    """Read the records of an xml document as one dataframe, or as an iterator of dataframes with chunksize."""
+    chunks = iter_xml(file_obj, chunksize=chunksize, **kwargs)
+    if chunksize is not None:
+        return chunks
+    return next(chunks)
@@ -27,5 +27,10 @@ setup(
         "lxml==5.2.2",
         "tabula-py==2.1.1"
     ],
-    python_requires=">=3.6",
+    extras_require={
+        "arrow": ["pyarrow>=10.0.0"],
+        "zstd": ["zstandard>=0.15.0"],
+        "pdf": ["JPype1>=1.2.0"]
+    },
+    python_requires=">=3.8",
 )
\ No newline at end of file
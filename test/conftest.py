@@ -0,0 +1,99 @@
+import hashlib
+import io
+import threading
+
+import pytest
+from botocore.exceptions import ClientError
+
+
+class LocalS3Client:
+    """In-memory stand-in for the boto3 S3 client used by the tests instead of AWS."""
+
+    def __init__(self, objects=None):
+        self.objects = dict(objects or {})
+        self.ranges = []
+        self.calls = []
+        self.uploads = {}
+        self._lock = threading.Lock()
+
+    def _etag(self, data):
+        return '"' + hashlib.md5(data).hexdigest() + '"'
+
+    def _object(self, Bucket, Key):
+        if (Bucket, Key) not in self.objects:
+            raise ClientError({'Error': {'Code': 'NoSuchKey', 'Message': 'Not Found'}}, 'GetObject')
+        return self.objects[(Bucket, Key)]
+
+    def head_object(self, Bucket, Key):
+        data = self._object(Bucket, Key)
+        with self._lock:
+            self.calls.append(('head_object', Key))
+        return {'ContentLength': len(data), 'ETag': self._etag(data)}
+
+    def get_object(self, Bucket, Key, Range=None, IfNoneMatch=None, IfMatch=None):
+        data = self._object(Bucket, Key)
+        etag = self._etag(data)
+        with self._lock:
+            self.calls.append(('get_object', Key))
+        if IfMatch is not None and IfMatch != etag:
+            raise ClientError({'Error': {'Code': 'PreconditionFailed', 'Message': 'Precondition Failed'}}, 'GetObject')
+        if IfNoneMatch is not None and IfNoneMatch == etag:
+            raise ClientError({'Error': {'Code': '304', 'Message': 'Not Modified'}}, 'GetObject')
+        response = {'ETag': etag, 'ContentType': 'binary/octet-stream'}
+        if Range is not None:
+            start, end = Range[len("bytes="):].split("-")
+            start, end = int(start), int(end)
+            if start >= len(data):
+                raise ClientError({'Error': {'Code': 'InvalidRange', 'Message': 'Invalid Range'}}, 'GetObject')
+            end = min(end, len(data) - 1)
+            with self._lock:
+                self.ranges.append((start, end))
+            response['ContentRange'] = "bytes %d-%d/%d" % (start, end, len(data))
+            data = data[start:end + 1]
+        response['ContentLength'] = len(data)
+        response['Body'] = io.BytesIO(data)
+        return response
+
+    def put_object(self, Bucket, Key, Body, **kwargs):
+        if isinstance(Body, str):
+            Body = Body.encode('utf-8')
+        elif not isinstance(Body, bytes):
+            Body = Body.read()
+        self.objects[(Bucket, Key)] = Body
+        with self._lock:
+            self.calls.append(('put_object', Key))
+        return {'ETag': self._etag(Body)}
+
+    def create_multipart_upload(self, Bucket, Key, **kwargs):
+        with self._lock:
+            self.calls.append(('create_multipart_upload', Key))
+            upload_id = "upload-%d" % len(self.calls)
+            self.uploads[upload_id] = {}
+        return {'UploadId': upload_id}
+
+    def upload_part(self, Bucket, Key, UploadId, PartNumber, Body):
+        with self._lock:
+            self.calls.append(('upload_part', Key))
+            self.uploads[UploadId][PartNumber] = bytes(Body)
+        return {'ETag': self._etag(bytes(Body))}
+
+    def complete_multipart_upload(self, Bucket, Key, UploadId, MultipartUpload):
+        parts = self.uploads.pop(UploadId)
+        self.objects[(Bucket, Key)] = b"".join(parts[part['PartNumber']] for part in MultipartUpload['Parts'])
+        with self._lock:
+            self.calls.append(('complete_multipart_upload', Key))
+        return {'ETag': self._etag(self.objects[(Bucket, Key)])}
+
+    def abort_multipart_upload(self, Bucket, Key, UploadId):
+        self.uploads.pop(UploadId, None)
+        with self._lock:
+            self.calls.append(('abort_multipart_upload', Key))
+        return {}
+
+    def generate_presigned_url(self, ClientMethod, Params, ExpiresIn=None):
+        return "https://%s.local/%s?expires=%s" % (Params['Bucket'], Params['Key'], ExpiresIn)
+
+
+@pytest.fixture
+def local_s3():
+    return LocalS3Client()
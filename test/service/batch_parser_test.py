@@ -0,0 +1,76 @@
+import threading, time
+import pandas as pd
+import pytest
+from file_parser_sdk import FileParserSDK
+from file_parser_sdk.service.batch_parser import parse_many, ParseResult
+from file_parser_sdk.service.file_parser import FileParser
+from file_parser_sdk.exceptions.expcetion import ConfigMissingException
+
+_config = {
+    "file_config": {
+        "file_source_1": {
+            "read_from_s3_func": "readFromS3",
+            "parameters_for_read_s3": None,
+            "file_dtype": None,
+            "columns_mapping": {},
+            "edge_case": None
+        }
+    },
+    "s3_config": {
+        "upload_bucket": "test-bucket",
+        "download_bucket": "test-bucket"
+    }
+}
+
+
+class TestParseMany:
+
+    def test_parse_many_reports_failures_without_aborting(self, mocker):
+        def fake_parse_file(parser, file_path, file_source, response_type=None):
+            if "bad" in file_path:
+                raise Exception("corrupt file")
+            parser.resolve_file_config(file_path, file_source)
+            return pd.DataFrame({"path": [file_path]})
+        mocker.patch.object(FileParser, "parse_file", autospec=True, side_effect=fake_parse_file)
+        items = [(f"s3://bucket/good_{i}.csv", "file_source_1") for i in range(6)] + [("s3://bucket/bad.csv", "file_source_1")]
+
+        results = list(FileParserSDK(_config).parse_many(items, max_workers=3, executor="thread"))
+
+        assert len(results) == 7
+        failed = [result for result in results if not result.succeeded]
+        assert [result.file_path for result in failed] == ["s3://bucket/bad.csv"]
+        assert str(failed[0].error) == "corrupt file"
+        assert sorted(result.data["path"][0] for result in results if result.succeeded) == sorted(item[0] for item in items[:6])
+
+    def test_parse_many_bounds_files_in_flight(self, mocker):
+        lock = threading.Lock()
+        state = {"running": 0, "peak": 0}
+
+        def fake_parse_file(parser, file_path, file_source, response_type=None):
+            with lock:
+                state["running"] += 1
+                state["peak"] = max(state["peak"], state["running"])
+            time.sleep(0.01)
+            with lock:
+                state["running"] -= 1
+            return file_path
+        mocker.patch.object(FileParser, "parse_file", autospec=True, side_effect=fake_parse_file)
+        items = [(f"s3://bucket/file_{i}.csv", "file_source_1") for i in range(20)]
+
+        results = list(parse_many(_config, items, max_workers=8, executor="thread", max_in_flight=2))
+
+        assert sorted(result.data for result in results) == sorted(item[0] for item in items)
+        assert state["peak"] <= 2
+
+    def test_parse_many_process_executor_reports_errors(self):
+        items = [("s3://bucket/file_1.csv", "unknown_source"), ("s3://bucket/file_2.csv", None)]
+
+        results = list(parse_many(_config, items, max_workers=2, executor="process"))
+
+        assert len(results) == 2
+        assert all(isinstance(result, ParseResult) and not result.succeeded for result in results)
+        assert any(isinstance(result.error, ConfigMissingException) for result in results)
+
+    def test_parse_many_unsupported_executor(self):
+        with pytest.raises(ConfigMissingException):
+            list(parse_many(_config, [], executor="cluster"))
@@ -0,0 +1,117 @@
+import asyncio, threading, time
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
+import pytest
+from file_parser_sdk import FileParserSDK
+from file_parser_sdk.service.file_parser import FileParser
+from file_parser_sdk.utils.s3_file_parser import S3FileParser
+from file_parser_sdk.exceptions.expcetion import ConfigMissingException
+
+_config = {
+    "file_config": {
+        "file_source_csv": {
+            "read_from_s3_func": "readFromS3",
+            "parameters_for_read_s3": None,
+            "file_dtype": {"Order_Number": str},
+            "columns_mapping": {"Order_Number": "MisTxRef", "Amount": "MisAmount"},
+            "edge_case": None
+        }
+    },
+    "s3_config": {
+        "upload_bucket": "test-bucket",
+        "download_bucket": "test-bucket"
+    },
+    "max_async_parses": 2
+}
+
+
+def add_files(local_s3, count):
+    for i in range(count):
+        local_s3.objects[("test-bucket", f"path/file_{i}.csv")] = f"Order_Number,Amount\n{i:03d},{i}\n".encode()
+
+
+class TestParseFileAsync:
+
+    def test_parse_async_parses_concurrently(self, mocker, local_s3):
+        add_files(local_s3, 5)
+        mocker.patch.object(S3FileParser, "get_s3_client", return_value=local_s3)
+        sdk = FileParserSDK(_config)
+
+        async def parse_all():
+            return await asyncio.gather(*[sdk.parse_async(f"s3://test-bucket/path/file_{i}.csv", "file_source_csv") for i in range(5)])
+        results = asyncio.run(parse_all())
+
+        assert [df["MisTxRef"].tolist() for df in results] == [[f"{i:03d}"] for i in range(5)]
+        assert sorted(call for call in local_s3.calls) == sorted(("get_object", f"path/file_{i}.csv") for i in range(5))
+
+    def test_parse_file_async_limits_concurrency_and_keeps_loop_free(self, mocker, local_s3):
+        add_files(local_s3, 6)
+        lock = threading.Lock()
+        state = {"running": 0, "peak": 0}
+        get_object = local_s3.get_object
+
+        def slow_get_object(**kwargs):
+            with lock:
+                state["running"] += 1
+                state["peak"] = max(state["peak"], state["running"])
+            time.sleep(0.05)
+            with lock:
+                state["running"] -= 1
+            return get_object(**kwargs)
+        mocker.patch.object(local_s3, "get_object", side_effect=slow_get_object)
+        mocker.patch.object(S3FileParser, "get_s3_client", return_value=local_s3)
+        parser = FileParser(_config)
+
+        async def parse_all():
+            ticks = 0
+            tasks = [asyncio.ensure_future(parser.parse_file_async(f"s3://test-bucket/path/file_{i}.csv", "file_source_csv")) for i in range(6)]
+            while not all(task.done() for task in tasks):
+                ticks += 1
+                await asyncio.sleep(0.01)
+            return [task.result() for task in tasks], ticks
+        results, ticks = asyncio.run(parse_all())
+
+        assert len(results) == 6
+        assert state["peak"] <= 2
+        assert ticks > 5
+
+    def test_parse_file_async_process_executor(self, mocker, local_s3):
+        add_files(local_s3, 2)
+        mocker.patch.object(S3FileParser, "get_s3_client", return_value=local_s3)
+        parser = FileParser(_config)
+
+        async def parse_all():
+            with ProcessPoolExecutor(max_workers=2) as executor:
+                return await asyncio.gather(*[parser.parse_file_async(f"s3://test-bucket/path/file_{i}.csv", "file_source_csv", executor=executor) for i in range(2)])
+        results = asyncio.run(parse_all())
+
+        assert [df["MisTxRef"].tolist() for df in results] == [["000"], ["001"]]
+
+    def test_parse_file_async_unknown_file_source(self):
+        parser = FileParser(_config)
+
+        with pytest.raises(ConfigMissingException):
+            asyncio.run(parser.parse_file_async("s3://test-bucket/path/file_0.csv", "unknown_source"))
+
+    def test_parse_file_async_result_cache_hit_skips_download(self, mocker, local_s3, tmp_path):
+        add_files(local_s3, 1)
+        mocker.patch.object(S3FileParser, "get_s3_client", return_value=local_s3)
+        parser = FileParser({**_config, "result_cache": {"cache_dir": str(tmp_path)}})
+        expected = parser.parse_file("s3://test-bucket/path/file_0.csv", "file_source_csv")
+        local_s3.calls.clear()
+
+        df = asyncio.run(parser.parse_file_async("s3://test-bucket/path/file_0.csv", "file_source_csv"))
+
+        pd.testing.assert_frame_equal(df, expected)
+        assert local_s3.calls == [("head_object", "path/file_0.csv")]
+
+    def test_parse_file_async_shares_cache_keys_with_parse_file(self, mocker, local_s3, tmp_path):
+        add_files(local_s3, 1)
+        mocker.patch.object(S3FileParser, "get_s3_client", return_value=local_s3)
+        parser = FileParser({**_config, "result_cache": {"cache_dir": str(tmp_path)}})
+
+        expected = asyncio.run(parser.parse_file_async("s3://test-bucket/path/file_0.csv", "file_source_csv"))
+        df = parser.parse_file("s3://test-bucket/path/file_0.csv", "file_source_csv")
+
+        pd.testing.assert_frame_equal(df, expected)
+        assert [call[0] for call in local_s3.calls] == ["head_object", "get_object", "head_object"]
@@ -1,5 +1,7 @@
-import copy, pytest
+import copy, io, zipfile, pytest
+import pyzipper
 from file_parser_sdk.service.file_parser import FileParser
+from file_parser_sdk.service import file_parser as file_parser_module
 import pandas as pd
 from unittest import mock
 from unittest.mock import MagicMock
@@ -342,4 +344,209 @@ class TestMISTemplateParser:
 
         self._mis_template_parser.parse_file("xyz")
         mocked_fetch_data_from_s3_using_input_path.assert_called_once()
-        mocked_sanitize_mis_file.assert_called_once()
\ No newline at end of file
+        mocked_sanitize_mis_file.assert_called_once()
+
+class TestParseFileIter:
+    _config = {
+        "file_config": {
+            "file_source_csv": {
+                "read_from_s3_func": "readFromS3",
+                "parameters_for_read_s3": None,
+                "file_dtype": {"Order_Number": str},
+                "columns_mapping": {
+                    "Order_Number": "MisTxRef",
+                    "Transaction_Type": "MisTransactionType",
+                    "Amount": "MisAmount"
+                },
+                "filter_based_on_status": {
+                    "filter_column": "MisTransactionType",
+                    "filter_values": ["SALE"]
+                },
+                "edge_case": None,
+                "skipfooter": 2
+            }
+        },
+        "s3_config": {
+            "upload_bucket": "test-bucket",
+            "download_bucket": "test-bucket"
+        }
+    }
+    _csv_content = (b"Order_Number,Transaction_Type,Amount\n"
+                    b"001,SALE,10\n002,REFUND,20\n003,SALE,30\n004,SALE,40\n005,SALE,50\n"
+                    b"TOTAL,,150\nEND,,\n")
+
+    def test_parse_file_iter_yields_sanitized_chunks(self, mocker):
+        parser = FileParser(self._config)
+        mocker.patch.object(parser.s3_file_parser, "getS3_object", return_value={"Body": io.BytesIO(self._csv_content)})
+
+        chunks = list(parser.parse_file_iter("s3://bucket/file.csv", "file_source_csv", chunksize=2))
+
+        assert all(len(chunk) <= 2 for chunk in chunks)
+        df = pd.concat(chunks)
+        assert df["MisTxRef"].tolist() == ["001", "003", "004", "005"]
+        assert df["MisTransactionType"].unique().tolist() == ["SALE"]
+
+    def test_parse_file_iter_matches_parse_file(self, mocker):
+        parser = FileParser(self._config)
+        mocker.patch.object(parser.s3_file_parser, "getS3_object", side_effect=lambda *args, **kwargs: {"Body": io.BytesIO(self._csv_content)})
+
+        expected_df = parser.parse_file("s3://bucket/file.csv", "file_source_csv")
+        df = pd.concat(parser.parse_file_iter("s3://bucket/file.csv", "file_source_csv", chunksize=3))
+
+        assert df.reset_index(drop=True).equals(expected_df.reset_index(drop=True))
+
+    def test_parse_file_iter_streams_zip_members(self, mocker):
+        config = copy.deepcopy(self._config)
+        config["file_config"]["file_source_csv"]["read_from_s3_func"] = "readZipFromS3"
+        config["file_config"]["file_source_csv"]["skipfooter"] = 0
+        config["file_config"]["file_source_csv"]["filter_based_on_status"] = None
+        parser = FileParser(config)
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w") as zfile:
+            zfile.writestr("a.csv", "Order_Number,Transaction_Type,Amount\n001,SALE,10\n002,SALE,20\n")
+            zfile.writestr("b.csv", "Order_Number,Transaction_Type,Amount\n003,SALE,30\n")
+        buffer.seek(0)
+        mocker.patch.object(parser.s3_file_parser, "readZipFromS3", return_value=zipfile.ZipFile(buffer))
+
+        df = pd.concat(parser.parse_file_iter("s3://bucket/file.zip", "file_source_csv", chunksize=1))
+
+        assert df["MisTxRef"].tolist() == ["001", "002", "003"]
+
+
+class TestCreateDataframeParallel:
+    _config = {
+        "file_config": {
+            "file_source_zip": {
+                "read_from_s3_func": "readZipFromS3",
+                "parameters_for_read_s3": None,
+                "file_dtype": {"Order_Number": str},
+                "columns_mapping": {},
+                "edge_case": None
+            }
+        },
+        "s3_config": {
+            "upload_bucket": "test-bucket",
+            "download_bucket": "test-bucket"
+        }
+    }
+
+    def _zip_file(self, member_count):
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w") as zfile:
+            for i in range(member_count):
+                zfile.writestr(f"folder/member_{i}.csv", f"Order_Number,Amount\n{i:03d},{i}\n{i:03d},{i * 10}\n")
+            zfile.writestr("folder/readme", "ignored")
+        buffer.seek(0)
+        return zipfile.ZipFile(buffer)
+
+    def _parser(self, workers, executor):
+        parser = FileParser(self._config)
+        parser.resolve_file_config("s3://bucket/file.zip", "file_source_zip")
+        parser.file_config = {**parser.file_config, "zip_member_workers": workers, "zip_member_executor": executor}
+        return parser
+
+    @pytest.mark.parametrize("executor", ["thread", "process"])
+    def test_create_dataframe_parallel_keeps_member_order(self, executor):
+        parser = self._parser(4, executor)
+
+        df = parser.create_dataframe(self._zip_file(6), "s3://bucket/file.zip", {"Order_Number": str})
+
+        assert df["Order_Number"].tolist() == [f"{i:03d}" for i in range(6) for _ in range(2)]
+
+    @pytest.mark.parametrize("max_bytes_in_flight, max_in_flight", [(1, 1), (None, 4)])
+    def test_create_dataframe_process_members_in_flight(self, mocker, max_bytes_in_flight, max_in_flight):
+        parser = self._parser(2, "process")
+        parser.file_config["zip_member_max_bytes_in_flight"] = max_bytes_in_flight
+        in_flight = []
+        wait = file_parser_module.wait
+        mocker.patch.object(file_parser_module, "wait", side_effect=lambda futures, **kwargs: in_flight.append(len(futures)) or wait(futures, **kwargs))
+
+        df = parser.create_dataframe(self._zip_file(6), "s3://bucket/file.zip", {"Order_Number": str})
+
+        assert df["Order_Number"].tolist() == [f"{i:03d}" for i in range(6) for _ in range(2)]
+        assert max(in_flight) == max_in_flight
+
+    def test_create_dataframe_parallel_matches_sequential(self):
+        sequential_df = self._parser(1, "thread").create_dataframe(self._zip_file(5), "s3://bucket/file.zip", {"Order_Number": str})
+        parallel_df = self._parser(3, "thread").create_dataframe(self._zip_file(5), "s3://bucket/file.zip", {"Order_Number": str})
+
+        assert parallel_df.equals(sequential_df)
+
+    def test_create_dataframe_unsupported_executor(self):
+        parser = self._parser(2, "fork")
+
+        with pytest.raises(Exception, match="Unsupported zip_member_executor"):
+            parser.create_dataframe(self._zip_file(2), "s3://bucket/file.zip")
+
+    def test_create_dataframe_parallel_aes_password(self, monkeypatch):
+        monkeypatch.setenv("TEST_ZIP_PASSWORD", "secret")
+        buffer = io.BytesIO()
+        with pyzipper.AESZipFile(buffer, "w", encryption=pyzipper.WZ_AES) as zfile:
+            zfile.setpassword(b"secret")
+            for i in range(3):
+                zfile.writestr(f"member_{i}.csv", f"Order_Number,Amount\n{i:03d},{i}\n")
+        buffer.seek(0)
+        parser = self._parser(3, "thread")
+
+        df = parser.create_dataframe(pyzipper.AESZipFile(buffer), "s3://bucket/file.zip", {"Order_Number": str}, password_protected=True, password_secret_key="TEST_ZIP_PASSWORD")
+
+        assert df["Order_Number"].tolist() == ["000", "001", "002"]
+
+
+class TestCreateDataframeWithSheets:
+    _mark_entry_type_based_on_sheets = {
+        "column_name": "EntryType",
+        "sheet_type": {"sale": ["Sale", "Sale Adjustments"], "refund": ["Refund"]}
+    }
+
+    def _zip_file(self):
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w") as zfile:
+            for i in range(2):
+                workbook = io.BytesIO()
+                with pd.ExcelWriter(workbook) as writer:
+                    for sheet_name, order in [("Sale", 1), ("Sale Adjustments", 2), ("Refund", 3), ("Summary", 4)]:
+                        pd.DataFrame({"Order_Number": [f"{i}{order}"], "Amount": [order]}).to_excel(writer, sheet_name=sheet_name, index=False)
+                zfile.writestr(f"folder/member_{i}.xlsx", workbook.getvalue())
+        buffer.seek(0)
+        return zipfile.ZipFile(buffer)
+
+    def _parser(self, **file_source):
+        parser = FileParser({"file_config": {"file_source_zip": {"read_from_s3_func": "readZipFromS3", "parameters_for_read_s3": None,
+                                                                   "file_dtype": {"Order_Number": str}, "columns_mapping": {},
+                                                                   "edge_case": None, **file_source}},
+                             "s3_config": {"download_bucket": "test-bucket"}})
+        parser.resolve_file_config("s3://bucket/file.zip", "file_source_zip")
+        return parser
+
+    @pytest.mark.parametrize("file_source", [{}, {"excel_engine": "streaming"}, {"excel_engine": "streaming", "sheet_workers": 1}])
+    def test_all_members_and_sheets_are_marked(self, file_source):
+        parser = self._parser(**file_source)
+        zfile = self._zip_file()
+        sheet_names = parser.get_sheet_names({"mark_entry_type_based_on_sheets": self._mark_entry_type_based_on_sheets})
+
+        with mock.patch.object(parser, "open_zip_member", wraps=parser.open_zip_member) as open_zip_member:
+            df = parser.create_dataframe_with_sheets(zfile, "s3://bucket/file.zip", {"Order_Number": str},
+                                                     mark_entry_type_based_on_sheets=self._mark_entry_type_based_on_sheets, sheet_names=sheet_names)
+
+        # every workbook is decompressed once, not once per sheet
+        assert open_zip_member.call_count == 2
+        assert df["Order_Number"].tolist() == ["01", "02", "03", "11", "12", "13"]
+        assert df["EntryType"].tolist() == ["sale", "sale", "refund"] * 2
+
+    def test_disable_skip_rows_and_dropna(self):
+        parser = self._parser(dropna_column="Amount")
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w") as zfile:
+            workbook = io.BytesIO()
+            with pd.ExcelWriter(workbook) as writer:
+                pd.DataFrame({"Order_Number": ["title", "Order_Number", "1", "2"], "Amount": [None, "Amount", 10, None]}).to_excel(writer, sheet_name="Sale", index=False, header=False)
+                pd.DataFrame({"Order_Number": ["3"], "Amount": [30]}).to_excel(writer, sheet_name="Refund", index=False)
+            zfile.writestr("member.xlsx", workbook.getvalue())
+        mark_entry_type_based_on_sheets = {"column_name": "EntryType", "sheet_type": {"sale": ["Sale"], "refund": ["Refund"]}}
+
+        df = parser.create_dataframe_with_sheets(zipfile.ZipFile(buffer), "s3://bucket/file.zip", {"Order_Number": str}, skiprows=1,
+                                                 mark_entry_type_based_on_sheets=mark_entry_type_based_on_sheets,
+                                                 sheet_names=["Sale", "Refund"], disable_skip_rows_sheets=["Refund"])
+
+        assert df["Order_Number"].tolist() == ["1", "3"]
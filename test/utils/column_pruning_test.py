@@ -0,0 +1,110 @@
+import pickle
+import types
+
+import pytest
+
+from file_parser_sdk.service.file_parser import FileParser
+from file_parser_sdk.utils.column_pruning import ColumnSelector, get_required_columns
+
+_file_config = {
+    "columns_mapping": {"Order_Number": "MisTxRef", "Amount": "MisAmount", "Status": "MisStatus"},
+    "filter_based_on_status": {"and": [{"filter_column": "MisStatus", "filter_values": ["SUCCESS"]},
+                                       {"filter_column": "Channel", "filter_values": ["WEB"]}]},
+    "dropna_column": "Order_Number",
+    "edge_case": {"parse_dates": {"columns": ["Txn_Date"], "format": "%d/%m/%Y"}},
+    "prune_columns": True,
+}
+
+
+def _user_edge_cases(**functions):
+    return types.SimpleNamespace(**functions)
+
+
+class TestGetRequiredColumns:
+
+    def test_collects_mapping_filter_dropna_and_transform_columns(self):
+        assert get_required_columns(_file_config) == {"Order_Number", "Amount", "Status", "Channel", "Txn_Date"}
+
+    def test_required_columns_are_added(self):
+        assert "Remarks" in get_required_columns({**_file_config, "required_columns": ["Remarks"]})
+
+    @pytest.mark.parametrize("file_config", [
+        {**_file_config, "prune_columns": False},
+        {key: value for key, value in _file_config.items() if key != "prune_columns"},
+        {**_file_config, "columns_mapping": {}},
+        {**_file_config, "edge_case": {"unknown_edge_case": None}},
+    ])
+    def test_every_column_is_read(self, file_config):
+        assert get_required_columns(file_config) is None
+
+    def test_undeclared_user_edge_case_disables_pruning(self):
+        edge_cases = _user_edge_cases(fix_amount=lambda df: df)
+
+        assert get_required_columns({**_file_config, "edge_case": {"fix_amount": None}}, edge_cases) is None
+
+    def test_declared_user_edge_case_inputs(self):
+        fix_amount = lambda df: df
+        fix_amount.input_columns = ["Gross_Amount"]
+        edge_cases = _user_edge_cases(fix_amount=fix_amount, fix_status=lambda df: df)
+        file_config = {**_file_config, "edge_case": {"fix_amount": None, "fix_status": None},
+                       "edge_case_columns": {"fix_status": ["Raw_Status"]}}
+
+        columns = get_required_columns(file_config, edge_cases)
+
+        assert {"Gross_Amount", "Raw_Status"} <= columns
+        assert "Txn_Date" not in columns
+
+    def test_column_selector_is_picklable(self):
+        selector = ColumnSelector(["a", "b"])
+
+        assert pickle.loads(pickle.dumps(selector)) == selector
+        assert selector("a") and not selector("c")
+
+
+class TestColumnPruning:
+
+    def _config(self, file_type_settings, **file_source):
+        return {
+            "file_config": {
+                "file_source": {
+                    "read_from_s3_func": "readFromS3",
+                    "parameters_for_read_s3": file_type_settings,
+                    "file_dtype": {"Order_Number": str},
+                    "columns_mapping": {"Order_Number": "MisTxRef", "Amount": "MisAmount"},
+                    "edge_case": None,
+                    **file_source
+                }
+            },
+            "s3_config": {"download_bucket": "test-bucket"}
+        }
+
+    def _write_csv(self, path, sep=","):
+        rows = [["Order_Number", "Amount", "Remarks", "Branch"], ["1", "10", "a", "X"], ["2", "20", "b", "Y"]]
+        path.write_text("\n".join(sep.join(row) for row in rows) + "\n")
+
+    def test_csv_reads_only_needed_columns(self, tmp_path):
+        file_path = tmp_path / "file.csv"
+        self._write_csv(file_path)
+
+        df = FileParser(self._config(None, prune_columns=True)).parse_file(file_path.as_uri(), "file_source")
+
+        assert df.columns.tolist() == ["MisTxRef", "MisAmount"]
+        assert df["MisTxRef"].tolist() == ["1", "2"]
+
+    def test_txt_with_header_names(self, tmp_path):
+        file_path = tmp_path / "file.txt"
+        file_path.write_text("1|10|a|X\n2|20|b|Y\n")
+        settings = {"sep": "|", "has_header": True, "header": ["Order_Number", "Amount", "Remarks", "Branch"]}
+
+        df = FileParser(self._config(settings, prune_columns=True)).parse_file(file_path.as_uri(), "file_source")
+
+        assert df.columns.tolist() == ["MisTxRef", "MisAmount"]
+        assert df["MisAmount"].tolist() == [10, 20]
+
+    def test_every_column_is_kept_by_default(self, tmp_path):
+        file_path = tmp_path / "file.csv"
+        self._write_csv(file_path)
+
+        df = FileParser(self._config(None)).parse_file(file_path.as_uri(), "file_source")
+
+        assert df.columns.tolist() == ["MisTxRef", "MisAmount", "Remarks", "Branch"]
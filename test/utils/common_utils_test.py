@@ -1,6 +1,6 @@
 from datetime import date
 import pandas as pd
-from file_parser_sdk.utils.common_utils import get_dynamic_password_based_on_time, filter_entries_by_transaction_types_list
+from file_parser_sdk.utils.common_utils import get_dynamic_password_based_on_time, filter_entries_by_transaction_types_list, trim_footer_from_chunks
 
 def test_get_dynamic_password_based_on_time():
     today = date.today()
@@ -51,3 +51,24 @@ def test_filter_entries_by_transaction_types_list_with_startswith_filter():
     # Assert
     assert actual_output.equals(expected_output)
 
+
+
+def test_trim_footer_from_chunks_across_chunk_boundary():
+    # Arrange
+    chunks = [pd.DataFrame({'col1': [1, 2, 3]}), pd.DataFrame({'col1': [4, 5]}), pd.DataFrame({'col1': [6]})]
+
+    # Act
+    actual_output = pd.concat(list(trim_footer_from_chunks(chunks, 2)))
+
+    # Assert
+    assert actual_output['col1'].tolist() == [1, 2, 3, 4]
+
+def test_trim_footer_from_chunks_footer_larger_than_chunk():
+    # Arrange
+    chunks = [pd.DataFrame({'col1': [1]}), pd.DataFrame({'col1': [2]}), pd.DataFrame({'col1': [3, 4, 5]})]
+
+    # Act
+    actual_output = pd.concat(list(trim_footer_from_chunks(chunks, 3)))
+
+    # Assert
+    assert actual_output['col1'].tolist() == [1, 2]
@@ -0,0 +1,212 @@
+import datetime
+import io
+import zipfile
+
+import openpyxl
+import pandas as pd
+import pytest
+
+from file_parser_sdk.service.file_parser import FileParser
+from file_parser_sdk.utils import excel_reader
+
+
+def _workbook_bytes(sheets):
+    workbook = openpyxl.Workbook()
+    workbook.remove(workbook.active)
+    for sheet_name, rows in sheets.items():
+        worksheet = workbook.create_sheet(sheet_name)
+        for row in rows:
+            worksheet.append(row)
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    return buffer.getvalue()
+
+
+_rows = [
+    ["Order_Number", "Amount", None, "Amount"],
+    [1, "x", None, 2.0],
+    [None, None, None, None],
+    [2.5, None, None, 3],
+    [datetime.datetime(2024, 1, 2), "", None, 4],
+    [None, None, None, None],
+]
+
+
+class TestExcelReader:
+
+    @pytest.mark.parametrize("kwargs", [{}, {"dtype": str}, {"header": None}, {"skiprows": 1}, {"dtype": {"Amount": str}},
+                                        {"usecols": ["Order_Number", "Amount"]}])
+    def test_matches_pandas(self, kwargs):
+        data = _workbook_bytes({"Sheet": _rows})
+
+        expected = pd.read_excel(io.BytesIO(data), **kwargs)
+        df = excel_reader.read_excel(io.BytesIO(data), **kwargs)
+
+        pd.testing.assert_frame_equal(df, expected)
+
+    def test_usecols_callable_and_skip_footer(self):
+        data = _workbook_bytes({"Sheet": [["a", "b", "c"], [1, 2, 3], [4, 5, 6], ["total", None, 9]]})
+
+        df = excel_reader.read_excel(io.BytesIO(data), usecols=lambda name: name in {"a", "c", "missing"}, skip_footer=1)
+
+        assert df.columns.tolist() == ["a", "c"]
+        assert df.values.tolist() == [[1, 3], [4, 6]]
+
+    @pytest.mark.parametrize("skip_footer, expected", [
+        (0, {"a": [1.0, None, 4.0], "b": [2.0, None, None], "Unnamed: 2": [None, None, 7.0]}),
+        (1, {"a": [1.0, None], "b": [2.0, None]}),
+        (2, {"a": [1.0], "b": [2.0]}),
+        (4, {"a": [], "b": []}),
+    ])
+    def test_read_sheet_blank_rows_and_footer(self, skip_footer, expected):
+        rows = [("a", "b"), (1, 2), (), (4, None, 7), (None, None), (), (None,)]
+
+        df = excel_reader.read_sheet(iter(rows), skip_footer=skip_footer)
+
+        assert df.astype(object).where(df.notna(), None).to_dict("list") == expected
+
+    def test_read_sheet_selects_columns_of_wider_rows(self):
+        df = excel_reader.read_sheet(iter([("a", "b"), (1, 2, 3), (4, 5)]), usecols=lambda name: name in {"b", "Unnamed: 2"})
+
+        assert df.columns.tolist() == ["b", "Unnamed: 2"]
+        assert df["b"].tolist() == [2, 5]
+        assert df["Unnamed: 2"].tolist()[0] == 3 and pd.isna(df["Unnamed: 2"].tolist()[1])
+
+    def test_read_selected_sheets(self):
+        data = _workbook_bytes({"Sale": [["a"], [1]], "Refund": [["a"], [2]], "Summary": [["total"], [3]]})
+
+        dfs = excel_reader.read_excel_sheets(io.BytesIO(data), ["Refund", "Sale"], dtype={"a": str})
+
+        assert list(dfs) == ["Refund", "Sale"]
+        assert dfs["Refund"]["a"].tolist() == ["2"]
+        assert excel_reader.read_excel(io.BytesIO(data), sheet_name=2)["total"].tolist() == [3]
+
+    def test_streaming_support_and_seekable(self):
+        data = _workbook_bytes({"Sheet": [["a"]]})
+        buffer = io.BytesIO(data)
+        with zipfile.ZipFile(io.BytesIO(_zip_with(data))) as zfile:
+            member = zfile.open("file.xlsx")
+            assert isinstance(excel_reader.as_seekable(member), io.BytesIO)
+
+        assert excel_reader.is_streaming_supported(buffer)
+        assert buffer.tell() == 0
+        assert excel_reader.as_seekable(buffer) is buffer
+        assert not excel_reader.is_streaming_supported(io.BytesIO(b"\xd0\xcf\x11\xe0"))
+
+
+def _excel_written_workbook():
+    """Workbook laid out like excel writes it, shared strings, formulas, date styles, errors and skipped rows."""
+    main = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+    relationships = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+    package_relationships = "http://schemas.openxmlformats.org/package/2006/relationships"
+    files = {
+        "[Content_Types].xml": '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+                               '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+                               '<Default Extension="xml" ContentType="application/xml"/>'
+                               '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+                               '<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+                               '<Override PartName="/xl/sharedStrings.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml"/>'
+                               '<Override PartName="/xl/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+                               '</Types>',
+        "_rels/.rels": f'<Relationships xmlns="{package_relationships}"><Relationship Id="rId1" '
+                       'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/></Relationships>',
+        "xl/workbook.xml": f'<workbook xmlns="{main}" xmlns:r="{relationships}"><sheets><sheet name="MIS" sheetId="1" r:id="rId1"/></sheets></workbook>',
+        "xl/_rels/workbook.xml.rels": f'<Relationships xmlns="{package_relationships}">'
+                                      f'<Relationship Id="rId1" Type="{relationships}/worksheet" Target="worksheets/sheet1.xml"/>'
+                                      f'<Relationship Id="rId2" Type="{relationships}/sharedStrings" Target="sharedStrings.xml"/>'
+                                      f'<Relationship Id="rId3" Type="{relationships}/styles" Target="styles.xml"/></Relationships>',
+        "xl/sharedStrings.xml": f'<sst xmlns="{main}"><si><t>Order_Number</t></si><si><t>Date</t></si><si><t>Amount</t></si>'
+                                '<si><t>Flag</t></si><si><r><t>rich </t></r><r><t>text</t></r><rPh sb="0" eb="1"><t>x</t></rPh></si></sst>',
+        "xl/styles.xml": f'<styleSheet xmlns="{main}"><numFmts count="1"><numFmt numFmtId="164" formatCode="dd/mm/yyyy"/></numFmts>'
+                         '<fonts count="1"><font/></fonts><fills count="1"><fill><patternFill patternType="none"/></fill></fills><borders count="1"><border/></borders>'
+                         '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+                         '<cellXfs count="3"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+                         '<xf numFmtId="164" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+                         '<xf numFmtId="14" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/></cellXfs></styleSheet>',
+        "xl/worksheets/sheet1.xml": f'<worksheet xmlns="{main}"><sheetData>'
+                                    '<row r="1"><c r="A1" t="s"><v>0</v></c><c r="B1" t="s"><v>1</v></c><c r="C1" t="s"><v>2</v></c><c r="D1" t="s"><v>3</v></c></row>'
+                                    '<row r="2"><c r="A2" t="s"><v>4</v></c><c r="B2" s="1"><v>45292</v></c><c r="C2"><f>1+1</f><v>2</v></c><c r="D2" t="b"><v>1</v></c></row>'
+                                    '<row r="4"><c r="A4"><v>1001</v></c><c r="B4" s="2"><v>45293.5</v></c><c r="D4" t="e"><v>#N/A</v></c></row>'
+                                    '<row r="5"><c r="C5" t="str"><f>A4</f><v>text</v></c></row>'
+                                    '</sheetData></worksheet>',
+    }
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zfile:
+        for name, content in files.items():
+            zfile.writestr(name, content)
+    return buffer.getvalue()
+
+
+class TestXlsxWorkbook:
+
+    # pandas turns a boolean column with blanks into floats, the streaming reader keeps the booleans
+    @pytest.mark.parametrize("kwargs", [{"usecols": ["Order_Number", "Date", "Amount"]}, {"dtype": str}, {"header": None, "dtype": str},
+                                        {"dtype": {"Order_Number": str}, "usecols": [0, 1, 2]}])
+    def test_matches_pandas(self, kwargs):
+        data = _excel_written_workbook()
+
+        expected = pd.read_excel(io.BytesIO(data), **kwargs)
+        df = excel_reader.read_excel(io.BytesIO(data), **kwargs)
+
+        pd.testing.assert_frame_equal(df, expected)
+
+    def test_rows(self):
+        workbook = excel_reader.open_workbook(io.BytesIO(_excel_written_workbook()))
+
+        rows = list(workbook.iter_rows("MIS"))
+
+        assert workbook.sheetnames == ["MIS"]
+        assert rows[1][:3] == ("rich text", datetime.datetime(2024, 1, 1), 2)
+        assert rows[1][3] is True
+        assert rows[2] == ()
+        assert rows[4] == (None, None, "text")
+
+
+def _zip_with(data):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zfile:
+        zfile.writestr("file.xlsx", data)
+    return buffer.getvalue()
+
+
+class TestStreamingExcelEngine:
+
+    def _config(self, read_from_s3_func, **file_source):
+        return {
+            "file_config": {
+                "file_source_excel": {
+                    "read_from_s3_func": read_from_s3_func,
+                    "parameters_for_read_s3": None,
+                    "file_dtype": {"Order_Number": str},
+                    "columns_mapping": {"Order_Number": "MisTxRef"},
+                    "edge_case": None,
+                    "excel_engine": "streaming",
+                    **file_source
+                }
+            },
+            "s3_config": {"download_bucket": "test-bucket"}
+        }
+
+    def test_read_complete_excel_file(self, tmp_path):
+        file_path = tmp_path / "file.xlsx"
+        file_path.write_bytes(_workbook_bytes({
+            "Sale": [["Order_Number", "Amount", "Remarks"], [1, 10, "a"]],
+            "Refund": [["Order_Number", "Amount", "Remarks"], [2, 20, "b"]],
+            "Summary": [["Total"], [30]]
+        }))
+        config = self._config("read_complete_excel_file", excel_sheet_names=["Sale", "Refund"], usecols=["Order_Number", "Amount"])
+
+        df = FileParser(config).parse_file(file_path.as_uri(), "file_source_excel")
+
+        assert df.columns.tolist() == ["MisTxRef", "Amount", "sheet_name"]
+        assert df["MisTxRef"].tolist() == ["1", "2"]
+        assert df["sheet_name"].tolist() == ["Sale", "Refund"]
+
+    def test_read_from_s3_excel(self, tmp_path):
+        file_path = tmp_path / "file.xlsx"
+        file_path.write_bytes(_workbook_bytes({"Sheet": [["Order_Number", "Amount"], [1, 10], [2, 20]]}))
+
+        df = FileParser(self._config("readFromS3")).parse_file(file_path.as_uri(), "file_source_excel")
+
+        assert df["MisTxRef"].tolist() == ["1", "2"]
+        assert df["Amount"].tolist() == [10, 20]
@@ -0,0 +1,71 @@
+import warnings
+
+import pandas as pd
+import pytest
+
+from file_parser_sdk.exceptions.expcetion import ConfigMissingException
+from file_parser_sdk.utils.filter_engine import apply_filter, build_mask, get_filter_columns
+
+_df = pd.DataFrame({
+    "MisTransactionType": ["SALE", "REFUND", "SALE_REV", None, "CHARGEBACK", "SALE"],
+    "MisPaymentMode": ["CRD", "UPI", "CRD", "NB", "CRD", "UPI"],
+    "MisAmount": [10, 250, 35.5, 4, 1000, 99],
+}, index=[10, 11, 12, 13, 14, 15])
+
+
+class TestFilterEngine:
+
+    def test_equals_keeps_row_order_without_duplicates(self):
+        df = apply_filter(_df, {"filter_column": "MisTransactionType", "filter_values": ["SALE", "REFUND", "SALE"]})
+
+        assert df.index.tolist() == [10, 11, 15]
+
+    def test_startswith_with_multiple_prefixes(self):
+        df = apply_filter(_df, {"filter_column": "MisTransactionType", "filter_type": "startswith", "filter_values": ["CHARGE", "SALE"]})
+
+        # overlapping prefixes used to return SALE rows twice and grouped by prefix
+        assert df.index.tolist() == [10, 12, 14, 15]
+
+    @pytest.mark.parametrize("predicate, expected_index", [
+        ({"filter_column": "MisTransactionType", "filter_type": "not_equals", "filter_values": ["SALE"]}, [11, 12, 13, 14]),
+        ({"filter_column": "MisTransactionType", "filter_type": "contains", "filter_values": ["_REV", "BACK"]}, [12, 14]),
+        ({"filter_column": "MisTransactionType", "filter_type": "regex", "filter_values": ["^sale$"], "ignore_case": True}, [10, 15]),
+        ({"filter_column": "MisAmount", "filter_type": "range", "min": 10, "max": 99}, [10, 12, 15]),
+        ({"filter_column": "MisAmount", "filter_type": "range", "min": 10, "max": 99, "inclusive": "neither"}, [12]),
+        ({"filter_column": "MisAmount", "filter_type": "range", "min": 100}, [11, 14]),
+        ({"filter_column": "MisTransactionType", "filter_type": "is_null"}, [13]),
+        ({"filter_column": "MisTransactionType", "filter_type": "not_null", "negate": True}, [13]),
+    ])
+    def test_filter_types(self, predicate, expected_index):
+        assert apply_filter(_df, predicate).index.tolist() == expected_index
+
+    def test_and_or_not(self):
+        predicate = {"and": [
+            {"or": [{"filter_column": "MisTransactionType", "filter_type": "startswith", "filter_values": ["SALE"]},
+                    {"filter_column": "MisAmount", "filter_type": "range", "min": 500}]},
+            {"not": {"filter_column": "MisPaymentMode", "filter_values": ["UPI"]}},
+        ]}
+
+        assert apply_filter(_df, predicate).index.tolist() == [10, 12, 14]
+        assert get_filter_columns(predicate) == {"MisTransactionType", "MisAmount", "MisPaymentMode"}
+
+    def test_range_on_string_amounts(self):
+        df = pd.DataFrame({"MisAmount": ["10", "x", "300"]})
+
+        assert build_mask(df, {"filter_column": "MisAmount", "filter_type": "range", "max": 100}).tolist() == [True, False, False]
+
+    def test_missing_values_and_config(self):
+        assert apply_filter(_df, None) is _df
+        assert apply_filter(_df, {"filter_column": "MisTransactionType", "filter_values": None}).equals(_df)
+        assert apply_filter(_df, {"filter_column": "MisTransactionType", "filter_type": None, "filter_values": ["SALE"]}).equals(_df)
+        with pytest.raises(ConfigMissingException):
+            apply_filter(_df, {"filter_column": "Missing", "filter_values": ["SALE"]})
+        with pytest.raises(ConfigMissingException):
+            apply_filter(_df, {"filter_column": "MisAmount", "filter_type": "between", "filter_values": [1]})
+
+    def test_missing_values_without_future_warning(self):
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            df = apply_filter(_df, {"filter_column": "MisTransactionType", "filter_type": "startswith", "filter_values": ["SALE"]})
+
+        assert df.index.tolist() == [10, 12, 15]
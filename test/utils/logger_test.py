@@ -0,0 +1,83 @@
+import logging
+
+import pytest
+
+from file_parser_sdk.enums.LogLevel import LogLevel
+from file_parser_sdk.utils import logger as logger_module
+from file_parser_sdk.utils.logger import CustomLogger
+
+
+class RecordingHandler(logging.Handler):
+
+    def __init__(self):
+        super().__init__(logging.DEBUG)
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+@pytest.fixture
+def records():
+    CustomLogger()
+    sdk_logger = logging.getLogger("fileparser-logger")
+    handler = RecordingHandler()
+    sdk_logger.addHandler(handler)
+    yield handler.records
+    sdk_logger.removeHandler(handler)
+
+
+class TestCustomLogger:
+
+    def test_structured_fields(self, records):
+        CustomLogger({"memory_usage": False}).print_log(LogLevel.WARNING.value, "file.csv", "FileParser :: parse_file",
+                                                        input_path="s3://bucket/file.csv", rows=lambda: 3)
+
+        assert records[-1].levelno == logging.WARNING
+        assert records[-1].getMessage() == "file.csv :: FileParser :: parse_file"
+        assert records[-1].props == {"input_path": "s3://bucket/file.csv", "rows": 3}
+        assert records[-1].module == "logger_test"
+
+    def test_disabled_levels_are_not_formatted(self, records, mocker):
+        virtual_memory = mocker.spy(logger_module.psutil, "virtual_memory")
+        custom_logger = CustomLogger({"level": "WARNING"})
+        message = mocker.Mock(return_value="expensive")
+
+        custom_logger.print_log(LogLevel.DEBUG.value, "detect_type", message, columns=message)
+        custom_logger.print_log(LogLevel.INFO.value, "readFromS3::Start")
+
+        assert not custom_logger.is_enabled_for(LogLevel.INFO.value)
+        assert custom_logger.is_enabled_for(LogLevel.EXCEPTION.value)
+        message.assert_not_called()
+        virtual_memory.assert_not_called()
+        assert len(records) == 0
+
+    def test_level_is_per_instance(self, records):
+        debug_logger = CustomLogger({"level": "DEBUG", "memory_usage": False})
+        CustomLogger({"level": "ERROR"})
+
+        debug_logger.print_log(LogLevel.DEBUG.value, "detect_type")
+        CustomLogger({"memory_usage": False}).print_log(LogLevel.DEBUG.value, "detect_type")
+
+        assert [record.levelno for record in records] == [logging.DEBUG]
+        assert debug_logger.is_enabled_for(LogLevel.INFO.value)
+
+    def test_memory_usage_is_sampled_once_per_interval(self, records, mocker):
+        virtual_memory = mocker.spy(logger_module.psutil, "virtual_memory")
+        custom_logger = CustomLogger({"memory_sample_interval": 60})
+
+        for _ in range(5):
+            custom_logger.print_log(LogLevel.INFO.value, "readFromS3::Start")
+
+        assert virtual_memory.call_count == 1
+        assert len(records) == 5
+        assert all("memory_usage" in record.props for record in records)
+
+    def test_exception_level_keeps_exc_info(self, records):
+        try:
+            raise ValueError("broken")
+        except ValueError:
+            CustomLogger().print_log(LogLevel.EXCEPTION.value, "readFromS3::Failed to load dataframe", exc_info=True)
+
+        assert records[-1].levelno == logging.ERROR
+        assert records[-1].exc_info[0] is ValueError
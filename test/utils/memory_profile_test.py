@@ -0,0 +1,122 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from file_parser_sdk.exceptions.expcetion import ConfigMissingException
+from file_parser_sdk.service.file_parser import FileParser
+from file_parser_sdk.utils.memory_profile import compact_dataframe, get_profile, plan_dtypes
+
+
+def _df(rows=1000):
+    return pd.DataFrame({
+        "MisTxRef": [f"TX{i}" for i in range(rows)],
+        "MisPaymentMode": np.where(np.arange(rows) % 3 == 0, "CRD", "UPI").astype(object),
+        "MisAmount": np.arange(rows) * 0.5,
+        "MisFee": np.arange(rows) * 0.1,
+        "MisCount": np.arange(rows, dtype=np.int64),
+    })
+
+
+class TestMemoryProfile:
+
+    def test_compacts_dtypes_and_reports_savings(self):
+        df = _df()
+
+        compacted, report = compact_dataframe(df, get_profile(True))
+
+        assert isinstance(compacted["MisPaymentMode"].dtype, pd.CategoricalDtype)
+        assert compacted["MisTxRef"].dtype == "string[pyarrow]"
+        # halves are exact in float32, tenths are not
+        assert compacted["MisAmount"].dtype == np.float32
+        assert compacted["MisFee"].dtype == np.float64
+        assert compacted["MisCount"].dtype == np.uint16
+        assert report["before_bytes"] == df.memory_usage(deep=True, index=False).sum()
+        assert report["after_bytes"] == compacted.memory_usage(deep=True, index=False).sum()
+        assert report["saved_bytes"] > 0
+        assert report["dtypes"]["MisCount"] == ("int64", "uint16")
+        pd.testing.assert_frame_equal(compacted.astype(object), df.astype(object), check_dtype=False, check_categorical=False)
+
+    def test_options(self):
+        profile = get_profile({"float_downcast": "float32", "arrow_strings": False, "exclude_columns": ["MisPaymentMode"]})
+
+        compacted, report = compact_dataframe(_df(), profile)
+
+        assert compacted["MisFee"].dtype == np.float32
+        assert compacted["MisTxRef"].dtype == object
+        assert compacted["MisPaymentMode"].dtype == object
+        assert "MisPaymentMode" not in report["dtypes"]
+
+    @pytest.mark.parametrize("memory_profile", [None, False])
+    def test_disabled(self, memory_profile):
+        assert get_profile(memory_profile) is None
+
+    def test_unknown_option(self):
+        with pytest.raises(ConfigMissingException):
+            get_profile({"downcast_floats": True})
+
+    def test_parse_file(self, tmp_path):
+        file_path = tmp_path / "file.csv"
+        _df().rename(columns=lambda column: column[3:]).to_csv(file_path, index=False)
+        config = {
+            "file_config": {
+                "file_source": {
+                    "read_from_s3_func": "readFromS3",
+                    "parameters_for_read_s3": None,
+                    "file_dtype": None,
+                    "columns_mapping": {"TxRef": "MisTxRef", "PaymentMode": "MisPaymentMode"},
+                    "edge_case": None,
+                    "memory_profile": True
+                }
+            },
+            "s3_config": {"download_bucket": "test-bucket"}
+        }
+        parser = FileParser(config)
+
+        df, stats = parser.parse_file(file_path.as_uri(), "file_source", return_stats=True)
+
+        assert isinstance(df["MisPaymentMode"].dtype, pd.CategoricalDtype)
+        assert [span.attributes["saved_bytes"] > 0 for span in stats.spans if span.name == "memory_profile"] == [True]
+
+    def test_chunked_plan_gives_every_chunk_the_same_dtypes(self):
+        df = _df()
+        profile = get_profile({"float_downcast": "float32"})
+        plan = plan_dtypes(df.iloc[:500], profile, chunked=True)
+        later = pd.DataFrame({**{column: df[column].iloc[:2] for column in df.columns}, "MisPaymentMode": ["CRD", "NB"], "MisCount": [1, 100000]})
+
+        chunks = [compact_dataframe(chunk, profile, plan)[0] for chunk in (df.iloc[:500], df.iloc[500:], later)]
+
+        assert all(chunk.dtypes.equals(chunks[0].dtypes) for chunk in chunks)
+        assert chunks[0]["MisPaymentMode"].dtype == "string[pyarrow]"
+        assert chunks[0]["MisCount"].dtype == np.int64 and chunks[0]["MisFee"].dtype == np.float32
+        assert pd.concat(chunks).dtypes.equals(chunks[0].dtypes)
+        assert chunks[2]["MisPaymentMode"].tolist() == ["CRD", "NB"] and chunks[2]["MisCount"].tolist() == [1, 100000]
+
+    def test_plan_of_another_dataframe_must_be_chunked(self):
+        profile = get_profile(True)
+        plan = plan_dtypes(pd.DataFrame({"MisCount": [1, 2]}), profile)
+
+        with pytest.raises(ValueError, match="chunked=True"):
+            compact_dataframe(pd.DataFrame({"MisCount": [1, 100000]}), profile, plan)
+
+    def test_parse_file_iter_chunks_share_dtypes(self, tmp_path):
+        file_path = tmp_path / "file.csv"
+        pd.DataFrame({"Mode": ["CRD"] * 4 + ["UPI", "NB", "CRD", "UPI"], "Count": [1, 2, 3, 4, 300, 5, 6, 7]}).to_csv(file_path, index=False)
+        config = {
+            "file_config": {
+                "file_source": {
+                    "read_from_s3_func": "readFromS3",
+                    "parameters_for_read_s3": None,
+                    "file_dtype": None,
+                    "columns_mapping": {"Mode": "MisPaymentMode"},
+                    "edge_case": None,
+                    "memory_profile": True
+                }
+            },
+            "s3_config": {"download_bucket": "test-bucket"}
+        }
+
+        chunks = list(FileParser(config).parse_file_iter(file_path.as_uri(), "file_source", chunksize=4))
+
+        assert [str(chunk["Count"].dtype) for chunk in chunks] == ["int64", "int64"]
+        assert [str(chunk["MisPaymentMode"].dtype) for chunk in chunks] == ["string", "string"]
+        assert pd.concat(chunks)["MisPaymentMode"].dtype == "string[pyarrow]"
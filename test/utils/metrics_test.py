@@ -0,0 +1,171 @@
+import asyncio
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+import pytest
+
+from file_parser_sdk.enums.ParsedDataResponseType import ParsedDataResponseType
+from file_parser_sdk.service.file_parser import FileParser
+from file_parser_sdk.utils import metrics
+
+
+def get_config(**file_source_config):
+    return {
+        "file_config": {
+            "file_source": {
+                "read_from_s3_func": "readFromS3",
+                "parameters_for_read_s3": None,
+                "file_dtype": {"Order_Number": str},
+                "columns_mapping": {"Order_Number": "MisTxRef"},
+                "filter_based_on_status": {"filter_column": "Type", "filter_values": ["SALE"]},
+                "edge_case": None,
+                **file_source_config
+            }
+        },
+        "s3_config": {"download_bucket": "test-bucket"}
+    }
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = tmp_path / "settlement.csv"
+    path.write_text("Order_Number,Type,Amount\n001,SALE,10\n002,REFUND,20\n003,SALE,30\n")
+    return path
+
+
+class TestMetrics:
+
+    def test_null_stats_when_disabled(self, csv_path):
+        parser = FileParser(get_config())
+
+        df = parser.parse_file(csv_path.as_uri(), "file_source")
+
+        assert df["MisTxRef"].tolist() == ["001", "003"]
+        assert parser.last_stats is None
+        assert metrics.current_stats() is metrics.NULL_STATS
+        with metrics.NULL_STATS.span("decode") as span:
+            span.set(rows_out=1)
+
+    def test_return_stats(self, csv_path):
+        parser = FileParser(get_config())
+
+        response, stats = parser.parse_file(csv_path.as_uri(), "file_source", ParsedDataResponseType.JSON.value, return_stats=True)
+
+        assert pd.read_json(response)["MisTxRef"].tolist() == [1, 3]
+        spans = {span.name: span for span in stats.spans}
+        assert [span.name for span in stats.spans] == ["download", "decode", "edge_cases", "rename", "filter", "serialize", "parse_file"]
+        assert spans["decode"].attributes == {"file_type": "csv", "rows_out": 3}
+        assert spans["filter"].attributes == {"rows_in": 3, "rows_out": 2}
+        assert spans["serialize"].attributes == {"response_type": "JSON", "rows_in": 2}
+        assert stats.counters == {"bytes_downloaded": csv_path.stat().st_size}
+        assert stats.get_durations()["parse_file"] >= stats.get_durations()["decode"]
+        assert parser.last_stats is stats
+
+    def test_hooks(self, csv_path):
+        parser = FileParser(get_config())
+        events = []
+        parser.add_metrics_hook(lambda stats, span: events.append((stats.file_source, span.name)))
+        parser.add_metrics_hook(lambda stats, span: 1 / 0)
+
+        parser.parse_file(csv_path.as_uri(), "file_source")
+
+        assert events[0] == ("file_source", "download")
+        assert events[-1] == ("file_source", "parse_file")
+        assert parser.last_stats.counters["hook_errors"] == len(events)
+
+    def test_failed_stage_is_recorded(self, tmp_path):
+        parser = FileParser({**get_config(), "metrics": {"enabled": True, "prometheus": True}})
+
+        with pytest.raises(Exception):
+            parser.parse_file((tmp_path / "missing.csv").as_uri(), "file_source")
+
+        assert parser.last_stats.spans[-1].attributes == {"error": "Exception"}
+        assert 'file_parser_parses_total{file_source="file_source",status="failure"} 1' in parser.prometheus_text()
+
+    def test_zip_members_in_threads(self, tmp_path):
+        path = tmp_path / "settlements.zip"
+        with zipfile.ZipFile(path, "w") as zfile:
+            for i in range(3):
+                zfile.writestr(f"member_{i}.csv", f"Order_Number,Type\n{i:03d},SALE\n")
+        parser = FileParser(get_config(read_from_s3_func="readZipFromS3", zip_member_workers=3))
+
+        df, stats = parser.parse_file(path.as_uri(), "file_source", return_stats=True)
+
+        assert len(df) == 3
+        assert stats.counters["zip_members"] == 3
+        assert [span.attributes["rows_out"] for span in stats.spans if span.name == "decode"] == [1, 1, 1]
+
+    def test_prometheus_text(self, csv_path, tmp_path):
+        config = {**get_config(), "metrics": {"prometheus": True}, "result_cache": {"cache_dir": str(tmp_path / "cache")}}
+        parser = FileParser(config)
+
+        parser.parse_file(csv_path.as_uri(), "file_source")
+        parser.parse_file(csv_path.as_uri(), "file_source")
+        text = parser.prometheus_text()
+
+        assert "# TYPE file_parser_stage_duration_seconds summary" in text
+        assert 'file_parser_stage_duration_seconds_count{file_source="file_source",stage="parse_file"} 2' in text
+        assert 'file_parser_stage_duration_seconds_count{file_source="file_source",stage="decode"} 1' in text
+        assert 'file_parser_stage_rows_total{file_source="file_source",stage="filter",direction="out"} 2' in text
+        assert 'file_parser_cache_hits_total{file_source="file_source"} 1' in text
+        assert 'file_parser_cache_misses_total{file_source="file_source"} 1' in text
+        assert 'file_parser_parses_total{file_source="file_source",status="success"} 2' in text
+
+    def test_prometheus_text_requires_config(self):
+        with pytest.raises(Exception, match="Prometheus metrics are not enabled"):
+            FileParser(get_config()).prometheus_text()
+
+    def test_collect(self):
+        with metrics.collect() as stats:
+            with metrics.current_stats().span("upload", rows_in=2) as span:
+                span.set(bytes=10)
+            metrics.current_stats().add("bytes_uploaded", 10)
+
+        assert metrics.current_stats() is metrics.NULL_STATS
+        assert stats.to_dict()["spans"][0]["bytes"] == 10
+        assert stats.counters == {"bytes_uploaded": 10}
+
+    def test_parse_file_async(self, csv_path):
+        parser = FileParser({**get_config(), "metrics": {"prometheus": True}})
+
+        df, stats = asyncio.run(parser.parse_file_async(csv_path.as_uri(), "file_source", return_stats=True))
+
+        assert df["MisTxRef"].tolist() == ["001", "003"]
+        assert [span.name for span in stats.spans] == ["download", "decode", "edge_cases", "rename", "filter", "serialize", "parse_file"]
+        assert stats.counters == {"bytes_downloaded": csv_path.stat().st_size}
+        assert parser.last_stats is stats
+        assert 'file_parser_parses_total{file_source="file_source",status="success"} 1' in parser.prometheus_text()
+
+    def test_parse_file_async_process_executor(self, csv_path):
+        parser = FileParser({**get_config(), "metrics": {"prometheus": True}})
+
+        async def parse():
+            with ProcessPoolExecutor(max_workers=1) as executor:
+                return await parser.parse_file_async(csv_path.as_uri(), "file_source", executor=executor)
+        df = asyncio.run(parse())
+
+        assert df["MisTxRef"].tolist() == ["001", "003"]
+        assert [span.name for span in parser.last_stats.spans] == ["download", "decode", "edge_cases", "rename", "filter", "serialize", "parse_file"]
+        assert 'file_parser_stage_duration_seconds_count{file_source="file_source",stage="decode"} 1' in parser.prometheus_text()
+
+    def test_parse_file_iter(self, csv_path):
+        parser = FileParser({**get_config(), "metrics": {"prometheus": True}})
+
+        chunks = list(parser.parse_file_iter(csv_path.as_uri(), "file_source", chunksize=2))
+
+        assert [chunk["MisTxRef"].tolist() for chunk in chunks] == [["001"], ["003"]]
+        assert [span.name for span in parser.last_stats.spans if span.name == "filter"] == ["filter", "filter"]
+        assert parser.last_stats.spans[-1].name == "parse_file"
+        assert metrics.current_stats() is metrics.NULL_STATS
+        assert 'file_parser_parses_total{file_source="file_source",status="success"} 1' in parser.prometheus_text()
+
+    def test_chunked_file_response_times_writes_only(self, csv_path, tmp_path):
+        parser = FileParser(get_config())
+        response_options = {"chunksize": 2, "destination": str(tmp_path / "out.csv")}
+
+        _, stats = parser.parse_file(csv_path.as_uri(), "file_source", ParsedDataResponseType.FILE.value, response_options, return_stats=True)
+
+        serialize_spans = [span for span in stats.spans if span.name == "serialize"]
+        assert [span.attributes["rows_in"] for span in serialize_spans] == [1, 1]
+        assert stats.spans.index(serialize_spans[0]) > [span.name for span in stats.spans].index("filter")
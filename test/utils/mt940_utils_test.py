@@ -0,0 +1,140 @@
+import io
+import zipfile
+
+import mt940
+import pandas as pd
+import pytest
+
+from file_parser_sdk.exceptions.expcetion import ConfigMissingException
+from file_parser_sdk.utils import mt940_utils
+from file_parser_sdk.utils.logger import CustomLogger
+from file_parser_sdk.utils.s3_file_parser import S3FileParser
+
+
+def _statement(opening, closing, transactions, account="NL69INGB0123456789", number="00001/00001"):
+    lines = ["{1:F01INGBNL2AXXXX0000000000}{2:I940INGBNL2AXXXN}{4:", ":20:STATEMENT", f":25:{account}",
+             f":28C:{number}", opening]
+    for statement_line, details in transactions:
+        lines += [f":61:{statement_line}", f":86:{details}"]
+    lines += [closing, "-}"]
+    return ("\r\n".join(lines) + "\r\n").encode("iso-8859-1")
+
+
+_first = _statement(":60F:C240101EUR1000,00", ":62M:C240101EUR1100,00", [
+    ("2401010101C100,00NTRFNONREF//B1", "Payment from Müller")])
+_middle = _statement(":60M:C240101EUR1100,00", ":62M:C240101EUR1050,00", [
+    ("240101D50,00NCHGREF1", "Bank charges\r\nJanuary")], number="00001/00002")
+_last = _statement(":60M:C240101EUR1050,00", ":62F:C240101EUR1075,50", [
+    ("2312311229RC24,50NTRFREF2//B2\r\nSUPPLEMENTARY", "Reversal")], number="00001/00003")
+_other_account = _statement(":60F:C240101USD10,00", ":62F:C240101USD15,00", [
+    ("240102C5,00NTRFREF3", "Interest")], account="US123")
+
+
+def _zip(members):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zip_file:
+        for name, data in members:
+            zip_file.writestr(name, data)
+    buffer.seek(0)
+    return buffer
+
+
+class TestMt940Utils:
+
+    def test_join_statements_in_memory(self):
+        statements = mt940_utils.join_mt940_statements([("part3.txt", _last), ("part1.txt", _first), ("part2.txt", _middle)])
+
+        assert [file_name for file_name, _ in statements] == ["part1.txt"]
+        data = statements[0][1]
+        assert data.startswith(_first[:_first.index(b":62M:")])
+        assert data.endswith(_last)
+        assert data.count(b":62M:") == 0 and data.count(b":60M:") == 2
+
+    def test_join_several_chains(self):
+        statements = mt940_utils.join_mt940_statements([("part1.txt", _first), ("usd.txt", _other_account), ("part2.txt", _middle)])
+
+        assert [file_name for file_name, _ in statements] == ["part1.txt", "usd.txt"]
+        # the chain stops where the next part is missing
+        assert statements[0][1].endswith(_middle)
+        assert statements[1][1] == _other_account
+
+    def test_accounts_sharing_an_intermediate_balance(self):
+        def parts(account):
+            return [(f"{account}1.txt", _statement(":60F:C240101EUR10,00", ":62M:C240101EUR0,00", [("240101D10,00NCHGREF1", f"{account} 1")], account=account)),
+                    (f"{account}2.txt", _statement(":60M:C240101EUR0,00", ":62F:C240101EUR5,00", [("240101C5,00NTRFREF2", f"{account} 2")], account=account))]
+        members = parts("ACC-A") + parts("ACC-B")
+
+        statements = mt940_utils.join_mt940_statements([members[0], members[2], members[3], members[1]])
+
+        assert [file_name for file_name, _ in statements] == ["ACC-A1.txt", "ACC-B1.txt"]
+        assert [mt940_utils.read_mt940(data)["transaction_details"].tolist() for _, data in statements] == \
+            [["ACC-A 1", "ACC-A 2"], ["ACC-B 1", "ACC-B 2"]]
+
+    def test_not_a_statement(self):
+        with pytest.raises(ValueError):
+            mt940_utils.join_mt940_statements([("empty.txt", b"{1:}\n\n\n\n\n")])
+
+    def test_read_mt940_matches_mt940_package(self):
+        data = mt940_utils.join_mt940_statements([("part1.txt", _first), ("part2.txt", _middle), ("part3.txt", _last)])[0][1]
+
+        df = mt940_utils.read_mt940(data)
+
+        expected = [transaction.data for transaction in mt940.parse(io.BytesIO(data), encoding="iso-8859-1")]
+        assert len(df) == len(expected) == 3
+        assert df["date"].dt.date.tolist() == [transaction["date"] for transaction in expected]
+        assert df["entry_date"].dt.date.tolist()[0] == expected[0]["guessed_entry_date"]
+        assert df["entry_date"].dt.date.tolist()[2] == expected[2]["guessed_entry_date"]
+        for column in ["status", "funds_code", "id", "extra_details"]:
+            assert df[column].tolist() == [transaction.get(column) or None for transaction in expected], column
+        # mt-940 folds the block headers of the joined parts into the details of the last transaction of a part
+        assert df["transaction_details"].tolist() == ["Payment from Müller", "Bank charges\nJanuary", "Reversal"]
+        # mt-940 keeps the bank reference in the customer reference and doesn't negate reversed credits
+        assert df["customer_reference"].tolist() == ["NONREF", "REF1", "REF2"]
+        assert df["bank_reference"].tolist() == ["B1", None, "B2"]
+        assert df["amount"].tolist() == [100.0, -50.0, -24.5]
+        assert df["account_identification"].unique().tolist() == ["NL69INGB0123456789"]
+        assert df["statement_number"].tolist() == ["00001/00001", "00001/00002", "00001/00003"]
+        assert df["currency"].unique().tolist() == ["EUR"]
+
+    def test_read_mt940_of_joined_chain_drops_block_headers(self):
+        # headers with a line per block and a {3:} block, the first part without a message end
+        middle = _middle.replace(b"{1:F01INGBNL2AXXXX0000000000}{2:I940INGBNL2AXXXN}{4:", b"{1:F01}\r\n{2:O940}{3:{108:MUR}}\r\n{4:")
+        data = mt940_utils.join_mt940_statements([("part1.txt", _first), ("part2.txt", middle), ("part3.txt", _last + b"{5:{CHK:123}}\r\n")])[0][1]
+
+        df = mt940_utils.read_mt940(data)
+
+        assert data.count(b"{4:") == 3
+        assert df["transaction_details"].tolist() == ["Payment from Müller", "Bank charges\nJanuary", "Reversal"]
+        assert df["extra_details"].tolist() == [None, None, "SUPPLEMENTARY"]
+        assert df["statement_number"].tolist() == ["00001/00001", "00001/00002", "00001/00003"]
+
+    @pytest.mark.parametrize("workers, executor", [(1, "thread"), (2, "thread"), (2, "process")])
+    def test_read_split_mt940_from_s3(self, mocker, workers, executor):
+        body = _zip([("part2.txt", _middle), ("part1.txt", _first), ("usd.txt", _other_account), ("part3.txt", _last)])
+        mocker.patch('file_parser_sdk.utils.s3_file_parser.S3FileParser.getS3_object', return_value={'Body': body})
+        s3_file_parser = S3FileParser(CustomLogger(), {"s3_config": {"download_bucket": "test-bucket"}})
+
+        df = s3_file_parser.read_split_mt940_from_s3("s3://test-bucket/statements.zip", workers=workers, executor=executor)
+
+        assert df["customer_reference"].tolist() == ["NONREF", "REF1", "REF2", "REF3"]
+        assert df["amount"].tolist() == [100.0, -50.0, -24.5, 5.0]
+        assert df["transaction_details"].tolist() == ["Payment from Müller", "Bank charges\nJanuary", "Reversal", "Interest"]
+
+    def test_read_split_mt940_from_s3_with_parser_func(self, mocker):
+        mocker.patch('file_parser_sdk.utils.s3_file_parser.S3FileParser.getS3_object', return_value={'Body': _zip([("part1.txt", _first), ("part2.txt", _middle)])})
+        s3_file_parser = S3FileParser(CustomLogger(), {"s3_config": {"download_bucket": "test-bucket"}})
+
+        def parser_func(file_obj, input_file_path):
+            return pd.DataFrame({"name": [file_obj.name], "transactions": [len(mt940.parse(file_obj))]})
+
+        df = s3_file_parser.read_split_mt940_from_s3("s3://test-bucket/statements.zip", parser_func)
+
+        assert df.to_dict("list") == {"name": ["part1.txt"], "transactions": [2]}
+
+    def test_process_executor_requires_picklable_parser_func(self, mocker):
+        get_object = mocker.patch('file_parser_sdk.utils.s3_file_parser.S3FileParser.getS3_object')
+        s3_file_parser = S3FileParser(CustomLogger(), {"s3_config": {"download_bucket": "test-bucket"}})
+
+        with pytest.raises(ConfigMissingException, match="picklable"):
+            s3_file_parser.read_split_mt940_from_s3("s3://test-bucket/statements.zip", lambda file_obj, path: None, workers=2, executor="process")
+        get_object.assert_not_called()
@@ -0,0 +1,100 @@
+import pytest
+
+from file_parser_sdk.utils.object_cache import ObjectCache, get_object_cache, clear_object_caches
+from file_parser_sdk.utils.storage_backends import S3StorageBackend, MappedFile
+
+
+@pytest.fixture(autouse=True)
+def fresh_object_caches():
+    clear_object_caches()
+    yield
+    clear_object_caches()
+
+
+class TestObjectCache:
+    def test_memory_tier_lru_eviction(self):
+        cache = ObjectCache(max_memory_bytes=10)
+        cache.put("a", "etag-a", b"aaaa")
+        cache.put("b", "etag-b", b"bbbb")
+        assert cache.get("a")[0] == "etag-a"
+        cache.put("c", "etag-c", b"cccc")
+        # b was the least recently used entry
+        assert cache.get("b") is None
+        etag, body, size = cache.get("a")
+        assert (etag, body.read(), size) == ("etag-a", b"aaaa", 4)
+        assert cache.get("c") is not None
+        assert cache.stats()["memory_bytes"] == 8
+
+    def test_disk_tier_is_memory_mapped(self, tmp_path):
+        cache = ObjectCache(max_memory_bytes=0, cache_dir=str(tmp_path))
+        cache.put("a", "etag-a", b"payload")
+        etag, body, size = cache.get("a")
+        assert isinstance(body, MappedFile)
+        assert (etag, body.read(), size) == ("etag-a", b"payload", 7)
+        assert cache.stats()["disk_hits"] == 1
+        assert body.seek(3) == 3 and body.read(2) == b"lo"
+        assert bytes(body.getbuffer()) == b"payload"
+
+    def test_disk_entry_is_replaced_in_one_file(self, tmp_path):
+        cache = ObjectCache(max_memory_bytes=0, cache_dir=str(tmp_path))
+        cache.put("a", "etag-a", b"old")
+        cache.put("a", "etag-b", b"new content")
+
+        assert len(list(tmp_path.iterdir())) == 1
+        etag, body, size = cache.get("a")
+        assert (etag, body.read(), size) == ("etag-b", b"new content", 11)
+
+    def test_disk_tier_eviction(self, tmp_path):
+        # an entry takes the ETag line and the bytes, 13 bytes each
+        cache = ObjectCache(max_memory_bytes=0, cache_dir=str(tmp_path), max_disk_bytes=20)
+        cache.put("a", "etag-a", b"aaaaaa")
+        cache.put("b", "etag-b", b"bbbbbb")
+        assert cache.get("a") is None
+        assert cache.get("b")[0] == "etag-b"
+
+    def test_get_object_cache_is_shared_per_settings(self, tmp_path):
+        assert get_object_cache(None) is None
+        first = get_object_cache({"cache_dir": str(tmp_path)})
+        assert get_object_cache({"cache_dir": str(tmp_path)}) is first
+        assert get_object_cache({"max_memory_bytes": 1}) is not first
+
+
+class TestObjectCacheRevalidation:
+    def _backend(self, local_s3, tmp_path=None):
+        object_cache = {"cache_dir": str(tmp_path)} if tmp_path is not None else {}
+        object_cache["max_memory_bytes"] = 1024
+        return S3StorageBackend({"download_bucket": "bucket", "object_cache": object_cache}, lambda: local_s3)
+
+    def test_unchanged_object_is_served_from_cache(self, local_s3):
+        local_s3.objects[("bucket", "file.csv")] = b"a,b\n1,2\n"
+        backend = self._backend(local_s3)
+        assert backend.read_bytes("s3://bucket/file.csv") == b"a,b\n1,2\n"
+        local_s3.ranges.clear()
+        response = backend.get_object("s3://bucket/file.csv")
+        assert response['Body'].read() == b"a,b\n1,2\n"
+        # the conditional GET was answered with 304, no byte range was transferred
+        assert local_s3.ranges == []
+        assert len([call for call in local_s3.calls if call[0] == 'get_object']) == 2
+
+    def test_changed_object_is_downloaded_again(self, local_s3):
+        local_s3.objects[("bucket", "file.csv")] = b"old"
+        backend = self._backend(local_s3)
+        assert backend.read_bytes("s3://bucket/file.csv") == b"old"
+        local_s3.objects[("bucket", "file.csv")] = b"new content"
+        assert backend.read_bytes("s3://bucket/file.csv") == b"new content"
+        assert backend.read_bytes("s3://bucket/file.csv") == b"new content"
+
+    def test_disk_tier_survives_new_cache_instance(self, local_s3, tmp_path):
+        local_s3.objects[("bucket", "file.csv")] = b"x" * 2048
+        self._backend(local_s3, tmp_path).read_bytes("s3://bucket/file.csv")
+        clear_object_caches()
+        local_s3.ranges.clear()
+        assert self._backend(local_s3, tmp_path).read_bytes("s3://bucket/file.csv") == b"x" * 2048
+        assert local_s3.ranges == []
+
+    def test_without_object_cache_every_read_downloads(self, local_s3):
+        local_s3.objects[("bucket", "file.csv")] = b"data"
+        backend = S3StorageBackend({"download_bucket": "bucket"}, lambda: local_s3)
+        backend.read_bytes("s3://bucket/file.csv")
+        backend.read_bytes("s3://bucket/file.csv")
+        assert len(local_s3.ranges) == 2
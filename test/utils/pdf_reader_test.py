@@ -0,0 +1,137 @@
+import threading
+
+import pandas as pd
+import pytest
+
+from file_parser_sdk.service.file_parser import FileParser
+from file_parser_sdk.utils import pdf_reader
+from file_parser_sdk.utils.s3_file_parser import S3FileParser
+
+_pdf = b"%PDF-1.4\n1 0 obj << /Type /Pages /Count 3 >> endobj\n" \
+       b"2 0 obj << /Type /Page >> endobj\n3 0 obj << /Type/Page >> endobj\n4 0 obj << /Type /Page /Parent 1 0 R >> endobj\n%%EOF"
+
+
+def table(*rows):
+    return {"data": [[{"text": text} for text in row] for row in rows]}
+
+
+class FakeExtractor:
+    """tabula-java JSON of a statement whose every page repeats the header."""
+
+    def __init__(self, page_count=3):
+        self.page_count = page_count
+        self.pages = []
+        self.threads = set()
+        self._lock = threading.Lock()
+
+    def extract(self, path, page, tabula_options):
+        with open(path, 'rb') as pdf_file:
+            assert pdf_file.read().startswith(b"%PDF")
+        with self._lock:
+            self.pages.append(page)
+            self.threads.add(threading.current_thread().name)
+        if page == 2:
+            return []
+        return [table(["Txn Id", "Amount", ""], [f"T{page}", f"{page}0.5", "x"])]
+
+    def get_page_count(self, path, password=None):
+        return self.page_count
+
+
+@pytest.fixture
+def extractor(mocker):
+    pdf_reader.clear_page_caches()
+    fake_extractor = FakeExtractor()
+    mocker.patch.object(pdf_reader, "get_extractor", return_value=fake_extractor)
+    return fake_extractor
+
+
+class TestPdfReader:
+
+    def test_parse_pages(self):
+        assert pdf_reader.parse_pages(None) is None
+        assert pdf_reader.parse_pages("all") is None
+        assert pdf_reader.parse_pages(2) == [2]
+        assert pdf_reader.parse_pages("5, 1-3,2") == [1, 2, 3, 5]
+        assert pdf_reader.parse_pages([3, "1-2"]) == [1, 2, 3]
+        for pages in ["0", "3-1", ""]:
+            with pytest.raises(ValueError):
+                pdf_reader.parse_pages(pages)
+
+    def test_count_pages(self):
+        assert pdf_reader.count_pages(_pdf) == 3
+        assert pdf_reader.count_pages(b"%PDF-1.5 compressed object streams") is None
+
+    def test_tables_to_dataframe(self):
+        df = pdf_reader.tables_to_dataframe([table(["A", "A", ""], ["1", "2"]), table(["A"], ["3"])], 4)
+
+        assert df.where(df.notna(), None).to_dict("list") == {"A": ["1", "3"], "A.1": ["2", None], "Unnamed: 0": [None, None], "page": [4, 4]}
+
+    def test_read_pdf_pages(self, extractor):
+        df = pdf_reader.read_pdf_pages(_pdf, workers=3)
+
+        assert sorted(extractor.pages) == [1, 2, 3]
+        assert df.to_dict("list") == {"Txn Id": ["T1", "T3"], "Amount": [10.5, 30.5], "Unnamed: 0": ["x", "x"], "page": [1, 3]}
+        assert all(name.startswith("pdf-page") for name in extractor.threads)
+
+    def test_page_selection(self, extractor):
+        df = pdf_reader.read_pdf_pages(_pdf, pages="3", workers=1)
+
+        assert extractor.pages == [3]
+        assert df["page"].tolist() == [3]
+
+    def test_all_pages_at_once_without_page_count(self, extractor):
+        extractor.page_count = None
+
+        df = pdf_reader.read_pdf_pages(_pdf)
+
+        assert extractor.pages == ["all"]
+        assert df["page"].isna().all()
+
+    def test_pages_are_cached_by_etag(self, extractor):
+        pdf_reader.read_pdf_pages(_pdf, pages="1-2", location="s3://bucket/a.pdf", etag='"1"')
+        df = pdf_reader.read_pdf_pages(_pdf, pages="1-3", location="s3://bucket/a.pdf", etag='"1"')
+        pdf_reader.read_pdf_pages(_pdf, pages="1", location="s3://bucket/a.pdf", etag='"2"')
+        pdf_reader.read_pdf_pages(_pdf, pages="1", location="s3://bucket/a.pdf")
+
+        assert sorted(extractor.pages) == [1, 1, 1, 2, 3]
+        assert df["page"].tolist() == [1, 3]
+
+    def test_unknown_backend(self):
+        with pytest.raises(Exception, match="Unsupported pdf backend"):
+            pdf_reader.get_extractor("ghostscript")
+
+    def test_subprocess_backend(self, mocker, tmp_path):
+        read_pdf = mocker.patch.object(pdf_reader, "read_pdf", return_value=[table(["A"], ["1"])])
+        path = tmp_path / "statement.pdf"
+        path.write_bytes(_pdf)
+        extractor = pdf_reader.get_extractor(pdf_reader.file_parser_constants.pdf_subprocess_backend)
+
+        assert extractor.extract(str(path), 2, {"stream": True}) == [table(["A"], ["1"])]
+        assert extractor.get_page_count(str(path)) == 3
+        read_pdf.assert_called_once_with(str(path), pages=2, output_format="json", java_options=None, stream=True)
+
+    def test_parse_file_with_pdf_options(self, extractor, mocker, local_s3):
+        local_s3.objects[("test-bucket", "statements/statement.pdf")] = _pdf
+        mocker.patch.object(S3FileParser, "get_s3_client", return_value=local_s3)
+        config = {
+            "file_config": {
+                "file_source": {
+                    "read_from_s3_func": "readFromS3",
+                    "parameters_for_read_s3": {"pages": "1-2"},
+                    "file_dtype": None,
+                    "columns_mapping": {"Txn Id": "MisTxRef"},
+                    "pdf_options": {"workers": 2},
+                    "prune_columns": False,
+                    "edge_case": None
+                }
+            },
+            "s3_config": {"download_bucket": "test-bucket"}
+        }
+
+        file_parser = FileParser(config)
+        df = file_parser.parse_file("s3://test-bucket/statements/statement.pdf", "file_source")
+        file_parser.parse_file("s3://test-bucket/statements/statement.pdf", "file_source")
+
+        pd.testing.assert_frame_equal(df, pd.DataFrame({"MisTxRef": ["T1"], "Amount": [10.5], "Unnamed: 0": ["x"], "page": [1]}))
+        assert sorted(extractor.pages) == [1, 2]
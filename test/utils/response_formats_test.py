@@ -0,0 +1,145 @@
+import gzip
+import io
+import os
+
+import pandas as pd
+import pytest
+
+from file_parser_sdk.enums.ParsedDataResponseType import ParsedDataResponseType
+from file_parser_sdk.exceptions.expcetion import ConfigMissingException
+from file_parser_sdk.service.file_parser import FileParser
+from file_parser_sdk.utils.response_formats import to_arrow, to_parquet, write_csv
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+_df = pd.DataFrame({"MisTxRef": ["1", "2", "3"], "MisAmount": [10.5, 20.0, None]})
+
+
+class TestResponseFormats:
+
+    def test_arrow_ipc_stream(self):
+        buffer = to_arrow(_df, {"max_chunksize": 2})
+
+        reader = pa.ipc.open_stream(buffer)
+        batches = list(reader)
+        assert [batch.num_rows for batch in batches] == [2, 1]
+        pd.testing.assert_frame_equal(pa.Table.from_batches(batches).to_pandas(), _df)
+
+    def test_arrow_reader_and_table(self):
+        pd.testing.assert_frame_equal(to_arrow(_df, {"arrow_format": "reader"}).read_pandas(), _df)
+        assert to_arrow(_df, {"arrow_format": "table"}).column_names == ["MisTxRef", "MisAmount"]
+
+    def test_unknown_arrow_format(self):
+        with pytest.raises(ConfigMissingException):
+            to_arrow(_df, {"arrow_format": "feather"})
+
+    def test_parquet_to_buffer_and_destination(self, tmp_path):
+        pd.testing.assert_frame_equal(pq.read_table(pa.BufferReader(to_parquet(_df))).to_pandas(), _df)
+
+        path = str(tmp_path / "parsed.parquet")
+        assert to_parquet(_df, {"destination": path, "compression": "zstd"}) == path
+        assert pq.ParquetFile(path).metadata.row_group(0).column(0).compression == "ZSTD"
+
+        stream = io.BytesIO()
+        to_parquet(_df, {"destination": stream, "compression": None})
+        pd.testing.assert_frame_equal(pd.read_parquet(io.BytesIO(stream.getvalue())), _df)
+
+    def test_parse_file_response_types(self, tmp_path):
+        file_path = tmp_path / "file.csv"
+        file_path.write_text("Order_Number,Amount\n1,10.5\n2,20\n")
+        config = {
+            "file_config": {
+                "file_source": {
+                    "read_from_s3_func": "readFromS3",
+                    "parameters_for_read_s3": None,
+                    "file_dtype": {"Order_Number": str},
+                    "columns_mapping": {"Order_Number": "MisTxRef", "Amount": "MisAmount"},
+                    "edge_case": None,
+                    "response_options": {"arrow_format": "reader"}
+                }
+            },
+            "s3_config": {"download_bucket": "test-bucket"}
+        }
+        parser = FileParser(config)
+
+        reader = parser.parse_file(file_path.as_uri(), "file_source", ParsedDataResponseType.ARROW.value)
+        buffer = parser.parse_file(file_path.as_uri(), "file_source", ParsedDataResponseType.ARROW.value, {"arrow_format": "ipc"})
+        parquet = parser.parse_file(file_path.as_uri(), "file_source", ParsedDataResponseType.PARQUET.value)
+
+        assert reader.read_all().column("MisTxRef").to_pylist() == ["1", "2"]
+        assert pa.ipc.open_stream(buffer).read_all().column("MisAmount").to_pylist() == [10.5, 20.0]
+        assert pq.read_table(pa.BufferReader(parquet)).num_rows == 2
+
+
+class TestFileResponse:
+
+    def _config(self):
+        return {
+            "file_config": {
+                "file_source": {
+                    "read_from_s3_func": "readFromS3",
+                    "parameters_for_read_s3": None,
+                    "file_dtype": {"Order_Number": str},
+                    "columns_mapping": {"Order_Number": "MisTxRef", "Amount": "MisAmount"},
+                    "filter_based_on_status": {"filter_column": "MisAmount", "filter_type": "range", "min": 0},
+                    "edge_case": None
+                }
+            },
+            "s3_config": {"download_bucket": "test-bucket"}
+        }
+
+    def _write_input(self, tmp_path, rows=10):
+        file_path = tmp_path / "file.csv"
+        file_path.write_text("Order_Number,Amount\n" + "".join(f"{i},{-1 if i == 3 else i * 10}\n" for i in range(rows)))
+        return file_path
+
+    def test_file_persists_in_directory(self, tmp_path):
+        file_path = self._write_input(tmp_path)
+        output_dir = tmp_path / "out"
+        output_dir.mkdir()
+
+        path = FileParser(self._config()).parse_file(file_path.as_uri(), "file_source", ParsedDataResponseType.FILE.value, {"destination": str(output_dir)})
+
+        assert path == str(output_dir / "parsed_file.csv")
+        df = pd.read_csv(path, dtype={"MisTxRef": str})
+        assert df["MisTxRef"].tolist() == [str(i) for i in range(10) if i != 3]
+        assert os.listdir(output_dir) == ["parsed_file.csv"]
+
+    def test_chunked_gzip_output(self, tmp_path):
+        file_path = self._write_input(tmp_path)
+        output_path = tmp_path / "parsed.csv.gz"
+        options = {"destination": str(output_path), "compression": "gzip", "chunksize": 3}
+
+        path = FileParser(self._config()).parse_file(file_path.as_uri(), "file_source", ParsedDataResponseType.FILE.value, options)
+
+        with gzip.open(path, "rt") as output_file:
+            lines = output_file.read().splitlines()
+        # a single header although the rows were written in chunks
+        assert lines == ["MisTxRef,MisAmount"] + [f"{i},{i * 10}" for i in range(10) if i != 3]
+
+    def test_chunked_output_from_result_cache(self, tmp_path, mocker):
+        file_path = self._write_input(tmp_path)
+        parser = FileParser({**self._config(), "result_cache": {"cache_dir": str(tmp_path / "cache")}})
+        parser.parse_file(file_path.as_uri(), "file_source")
+        fetch_chunks = mocker.patch.object(parser, "fetch_chunks_from_s3_using_input_path")
+
+        path, stats = parser.parse_file(file_path.as_uri(), "file_source", ParsedDataResponseType.FILE.value,
+                                        {"destination": str(tmp_path / "parsed.csv"), "chunksize": 3}, return_stats=True)
+
+        fetch_chunks.assert_not_called()
+        assert stats.counters["cache_hits"] == 1
+        assert pd.read_csv(path)["MisAmount"].tolist() == [i * 10 for i in range(10) if i != 3]
+
+    def test_stream_destination_stays_open(self):
+        stream = io.BytesIO()
+
+        assert write_csv([_df.iloc[:2], _df.iloc[2:]], "file.csv", {"destination": stream, "compression": "gzip"}) is stream
+
+        assert not stream.closed
+        pd.testing.assert_frame_equal(pd.read_csv(io.BytesIO(gzip.decompress(stream.getvalue())), dtype={"MisTxRef": str}), _df)
+
+    def test_unsupported_compression(self, tmp_path):
+        with pytest.raises(ConfigMissingException):
+            write_csv([_df], "file.csv", {"destination": str(tmp_path / "out.csv"), "compression": "lz4"})
+        assert os.listdir(tmp_path) == []
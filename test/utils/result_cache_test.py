@@ -0,0 +1,78 @@
+import os, time
+import pandas as pd
+import pytest
+from file_parser_sdk.service.file_parser import FileParser
+from file_parser_sdk.utils.result_cache import ResultCache, get_config_hash, get_edge_case_version, get_sdk_version
+
+pytest.importorskip("pyarrow")
+
+_file_config = {
+    "read_from_s3_func": "readFromS3",
+    "parameters_for_read_s3": None,
+    "file_dtype": {"Order_Number": str},
+    "columns_mapping": {"Order_Number": "MisTxRef"},
+    "edge_case": None
+}
+
+
+class TestResultCache:
+
+    def test_put_get_and_stats(self, tmp_path):
+        cache = ResultCache(str(tmp_path))
+        df = pd.DataFrame({"MisTxRef": ["001", "002"], "MisAmount": [1.5, 2.5]})
+
+        assert cache.get("missing") is None
+        cache.put("key", df)
+
+        assert cache.get("key").equals(df)
+        assert cache.stats() == {"hits": 1, "misses": 1, "evictions": 0}
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        cache = ResultCache(str(tmp_path), max_entries=2)
+        df = pd.DataFrame({"col1": [1]})
+        for key in ["first", "second"]:
+            cache.put(key, df)
+            time.sleep(0.01)
+        cache.get("first")
+        time.sleep(0.01)
+
+        cache.put("third", df)
+
+        assert sorted(os.listdir(tmp_path)) == ["first.parquet", "third.parquet"]
+        assert cache.stats()["evictions"] == 1
+
+    def test_build_key_depends_on_every_component(self):
+        keys = {
+            ResultCache.build_key("s3://bucket/key", '"etag"', get_config_hash(_file_config), "1"),
+            ResultCache.build_key("s3://bucket/key", '"other"', get_config_hash(_file_config), "1"),
+            ResultCache.build_key("s3://bucket/key", '"etag"', get_config_hash({**_file_config, "skipfooter": 1}), "1"),
+            ResultCache.build_key("s3://bucket/key", '"etag"', get_config_hash(_file_config), "2"),
+            ResultCache.build_key("s3://bucket/other", '"etag"', get_config_hash(_file_config), "1"),
+            ResultCache.build_key("s3://bucket/key", '"etag"', get_config_hash(_file_config), "1", "0.0.1+1")
+        }
+
+        assert len(keys) == 6
+        assert ResultCache.build_key("s3://bucket/key", '"etag"', "hash", "1") == ResultCache.build_key("s3://bucket/key", '"etag"', "hash", "1", get_sdk_version())
+        assert get_edge_case_version(None) == "none"
+
+    def test_parse_file_uses_result_cache(self, tmp_path, mocker):
+        file_path = tmp_path / "file.csv"
+        file_path.write_text("Order_Number,Amount\n001,10\n")
+        config = {
+            "file_config": {"file_source_csv": _file_config},
+            "s3_config": {"upload_bucket": "test-bucket", "download_bucket": "test-bucket"},
+            "result_cache": {"cache_dir": str(tmp_path / "cache")}
+        }
+        parser = FileParser(config)
+        fetch = mocker.spy(parser, "fetch_data_from_s3_using_input_path")
+
+        first_df = parser.parse_file(file_path.as_uri(), "file_source_csv")
+        second_df = parser.parse_file(file_path.as_uri(), "file_source_csv")
+        file_path.write_text("Order_Number,Amount\n002,20\n")
+        os.utime(file_path, ns=(time.time_ns() + 10 ** 9, time.time_ns() + 10 ** 9))
+        third_df = parser.parse_file(file_path.as_uri(), "file_source_csv")
+
+        assert fetch.call_count == 2
+        assert second_df.equals(first_df)
+        assert third_df["MisTxRef"].tolist() == ["002"]
+        assert parser.result_cache.stats()["hits"] == 1
@@ -0,0 +1,57 @@
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+import pytest
+from file_parser_sdk.utils import s3_client_registry
+from file_parser_sdk.utils.s3_file_parser import S3FileParser
+from file_parser_sdk.utils.logger import CustomLogger
+
+_s3_config = {
+    "upload_bucket": "test-bucket",
+    "download_bucket": "test-bucket",
+    "max_pool_connections": 20,
+    "retry_max_attempts": 3
+}
+
+
+@pytest.fixture(autouse=True)
+def clear_clients():
+    s3_client_registry.clear_s3_clients()
+    yield
+    s3_client_registry.clear_s3_clients()
+
+
+def test_get_s3_client_is_shared_across_calls_and_threads():
+    client = s3_client_registry.get_s3_client(_s3_config)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        clients = list(executor.map(lambda _: s3_client_registry.get_s3_client(dict(_s3_config)), range(16)))
+
+    assert all(thread_client is client for thread_client in clients)
+
+
+def test_get_s3_client_uses_pool_and_retry_settings():
+    client = s3_client_registry.get_s3_client(_s3_config)
+
+    assert client.meta.config.max_pool_connections == 20
+    # botocore normalises max_attempts (retries) into total_max_attempts (first call + retries)
+    assert client.meta.config.retries['total_max_attempts'] == 4
+
+
+def test_get_s3_client_differs_per_signature_and_settings():
+    client = s3_client_registry.get_s3_client(_s3_config)
+
+    assert s3_client_registry.get_s3_client(_s3_config, signature_version='s3v4', region_name='ap-south-1') is not client
+    assert s3_client_registry.get_s3_client({**_s3_config, "max_pool_connections": 5}) is not client
+
+
+def test_s3_file_parser_instances_share_client(mocker, local_s3):
+    mock_boto_client = mocker.patch('file_parser_sdk.utils.s3_client_registry.boto3.client', return_value=local_s3)
+    first_parser = S3FileParser(CustomLogger(), {"s3_config": _s3_config})
+    second_parser = S3FileParser(CustomLogger(), {"s3_config": _s3_config})
+
+    first_parser.upload_file_to_s3("test-bucket", "path/file.csv", pd.DataFrame({"col1": [1]}))
+    obj = second_parser.read_file_from_s3("test-bucket", "path/file.csv")
+
+    mock_boto_client.assert_called_once()
+    assert obj['Body'].read() == b'"col1"\n1\n'
+    assert local_s3.calls == [('put_object', 'path/file.csv'), ('get_object', 'path/file.csv')]
@@ -14,8 +14,10 @@ mock_df = pd.DataFrame({
 
 class TestCommonService:
     _config = {
-        "upload_bucket":"test-bucket",
-        "download_bucket":"test-bucket"
+        "s3_config": {
+            "upload_bucket":"test-bucket",
+            "download_bucket":"test-bucket"
+        }
     }
     _logger = CustomLogger()
     _s3_file_parser = S3FileParser(_logger, _config)
@@ -130,17 +132,14 @@ class TestCommonService:
 
     def test_read_split_mt940_from_s3_success(self, mocker):
         mocker.patch('file_parser_sdk.utils.s3_file_parser.S3FileParser.getS3_object')
-        mocker.patch('file_parser_sdk.utils.s3_file_parser.mt940_utils.join_mt940_statements', return_value="file_name.txt")
-        mocker.patch('file_parser_sdk.utils.s3_file_parser.S3FileParser.detect_type', return_value="csv")
-        mocker.patch('file_parser_sdk.utils.s3_file_parser.S3FileParser.delete_file')
-        mocker.patch('file_parser_sdk.utils.s3_file_parser.S3FileParser.creating_df_based_on_file_types', return_value=mock_df)
+        mocker.patch('file_parser_sdk.utils.s3_file_parser.mt940_utils.read_zip_members')
+        mocker.patch('file_parser_sdk.utils.s3_file_parser.mt940_utils.join_mt940_statements', return_value=[("file_name.txt", b"")])
+        mocker.patch('file_parser_sdk.utils.s3_file_parser.mt940_utils.parse_statement', return_value=mock_df)
         df = self._s3_file_parser.read_split_mt940_from_s3(self._mock_input_path_csv, None)
         assert len(df.columns) == len(mock_df.columns)
 
     def test_read_split_mt940_from_s3_exception(self, mocker):
-        mocker.patch('file_parser_sdk.utils.s3_file_parser.mt940_utils.join_mt940_statements', return_value="file_name.txt")
-        mocker.patch('file_parser_sdk.utils.s3_file_parser.S3FileParser.detect_type', return_value="csv")
-        mocker.patch('file_parser_sdk.utils.s3_file_parser.S3FileParser.creating_df_based_on_file_types')
-        mocker.patch('file_parser_sdk.utils.s3_file_parser.S3FileParser.delete_file')
+        mocker.patch('file_parser_sdk.utils.s3_file_parser.mt940_utils.join_mt940_statements', return_value=[("file_name.txt", b"")])
+        mocker.patch('file_parser_sdk.utils.s3_file_parser.mt940_utils.parse_statement')
         with pytest.raises(Exception) as e:
             df = self._s3_file_parser.read_split_mt940_from_s3(self._mock_input_path_csv, None)
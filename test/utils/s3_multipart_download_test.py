@@ -0,0 +1,84 @@
+import io
+import threading
+import pandas as pd
+import pytest
+from file_parser_sdk.utils.s3_multipart_download import download_s3_object, get_part_ranges, allocate_buffer, read_into
+from file_parser_sdk.utils.s3_file_parser import S3FileParser
+from file_parser_sdk.utils.logger import CustomLogger
+
+
+def test_get_part_ranges():
+    assert get_part_ranges(10, 35, 10) == [(10, 20), (20, 30), (30, 35)]
+
+
+def test_download_s3_object_small_object_single_request(local_s3):
+    local_s3.objects[("bucket", "key")] = b"small"
+
+    obj = download_s3_object(local_s3, "bucket", "key", part_size=10, concurrency=4, threshold=20)
+
+    assert obj['Body'].read() == b"small"
+    assert len(local_s3.ranges) == 1
+
+
+def test_download_s3_object_below_threshold_uses_one_more_request(local_s3):
+    content = bytes(range(256)) * 2
+    local_s3.objects[("bucket", "key")] = content
+
+    obj = download_s3_object(local_s3, "bucket", "key", part_size=100, concurrency=4, threshold=1000)
+
+    assert obj['Body'].read() == content
+    assert obj['ContentLength'] == len(content)
+    assert local_s3.ranges == [(0, 99), (100, 511)]
+
+
+def test_download_s3_object_parallel_parts(local_s3, mocker):
+    content = bytes(range(256)) * 40
+    local_s3.objects[("bucket", "key")] = content
+    threads = set()
+    get_object = local_s3.get_object
+
+    def record_thread(**kwargs):
+        threads.add(threading.get_ident())
+        return get_object(**kwargs)
+    mocker.patch.object(local_s3, "get_object", side_effect=record_thread)
+
+    obj = download_s3_object(local_s3, "bucket", "key", part_size=1000, concurrency=4, threshold=2000)
+
+    assert obj['Body'].read() == content
+    assert sorted(local_s3.ranges) == [(start, end - 1) for start, end in get_part_ranges(0, len(content), 1000)]
+    assert len(threads) > 1
+
+
+def test_download_s3_object_empty_object(local_s3):
+    local_s3.objects[("bucket", "key")] = b""
+
+    obj = download_s3_object(local_s3, "bucket", "key", part_size=10, concurrency=4, threshold=20)
+
+    assert obj['Body'].read() == b""
+
+
+def test_readFromS3_uses_multipart_download(local_s3, mocker):
+    content = "Order_Number,Amount\n" + "".join(f"{i:05d},{i}\n" for i in range(2000))
+    local_s3.objects[("test-bucket", "path/file.csv")] = content.encode()
+    mocker.patch('file_parser_sdk.utils.s3_file_parser.S3FileParser.get_s3_client', return_value=local_s3)
+    config = {"s3_config": {"upload_bucket": "test-bucket", "download_bucket": "test-bucket",
+                            "multipart_download_part_size": 4096, "multipart_download_threshold": 8192}}
+    s3_file_parser = S3FileParser(CustomLogger(), config)
+
+    df = s3_file_parser.readFromS3("s3://test-bucket/path/file.csv", {"Order_Number": str})
+
+    assert df["Order_Number"].tolist() == [f"{i:05d}" for i in range(2000)]
+    assert len(local_s3.ranges) > 2
+
+
+def test_allocate_buffer_and_read_into():
+    buffer = allocate_buffer(6)
+    view = buffer.getbuffer()
+
+    read_into(io.BytesIO(b"abc"), view[1:4])
+    read_into(type("Body", (), {"read": lambda self: b"z"})(), view[5:])
+    view.release()
+
+    assert buffer.read() == b"\0abc\0z"
+    with pytest.raises(IOError, match="Incomplete read"):
+        read_into(io.BytesIO(b"a"), memoryview(bytearray(2)))
@@ -0,0 +1,197 @@
+import csv
+import gzip
+import io
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from file_parser_sdk.utils import file_parser_constants
+from file_parser_sdk.utils.delimited_writer import write_delimited
+from file_parser_sdk.utils.logger import CustomLogger
+from file_parser_sdk.utils.s3_file_parser import S3FileParser
+from file_parser_sdk.utils.s3_multipart_upload import MultipartUploadWriter, SharedPartUploads
+
+
+@pytest.fixture
+def small_parts(mocker):
+    mocker.patch.object(file_parser_constants, "min_multipart_upload_part_size", 1)
+
+
+def _parser(local_s3, mocker, **s3_config):
+    mocker.patch('file_parser_sdk.utils.s3_file_parser.S3FileParser.get_s3_client', return_value=local_s3)
+    return S3FileParser(CustomLogger(), {"s3_config": {"upload_bucket": "test-bucket", "backup_path": "backup/", **s3_config}})
+
+
+def _call_names(local_s3):
+    return [name for name, _ in local_s3.calls]
+
+
+def test_small_object_is_uploaded_with_one_put(local_s3):
+    with MultipartUploadWriter(local_s3, "bucket", "key") as writer:
+        writer.write(b"small")
+
+    assert local_s3.objects[("bucket", "key")] == b"small"
+    assert _call_names(local_s3) == ["put_object"]
+
+
+def test_large_object_is_uploaded_in_parts(local_s3, small_parts):
+    content = bytes(range(256)) * 10
+
+    with MultipartUploadWriter(local_s3, "bucket", "key", part_size=1000, concurrency=2) as writer:
+        for start in range(0, len(content), 300):
+            writer.write(content[start:start + 300])
+
+    assert local_s3.objects[("bucket", "key")] == content
+    assert _call_names(local_s3).count("upload_part") == 3
+
+
+def test_part_size_below_s3_minimum(local_s3):
+    with pytest.raises(ValueError):
+        MultipartUploadWriter(local_s3, "bucket", "key", part_size=1024)
+
+
+def test_failed_serialization_aborts_upload(local_s3, mocker, small_parts):
+    s3_file_parser = _parser(local_s3, mocker, multipart_upload_part_size=64, upload_chunksize=10)
+    df = pd.DataFrame({"a": range(100)})
+    to_csv = pd.DataFrame.to_csv
+    chunks = []
+
+    def failing_to_csv(chunk, *args, **kwargs):
+        chunks.append(chunk)
+        if len(chunks) == 5:
+            raise RuntimeError("serialization failed")
+        return to_csv(chunk, *args, **kwargs)
+    mocker.patch.object(pd.DataFrame, "to_csv", failing_to_csv)
+
+    with pytest.raises(RuntimeError):
+        s3_file_parser.stream_df_to_s3(df, "test-bucket", "key")
+
+    assert "abort_multipart_upload" in _call_names(local_s3)
+    assert ("test-bucket", "key") not in local_s3.objects
+    assert local_s3.uploads == {}
+
+
+def test_upload_file_to_s3_streams_gzip_parts(local_s3, mocker, small_parts):
+    s3_file_parser = _parser(local_s3, mocker, multipart_upload_part_size=256, upload_chunksize=50)
+    df = pd.DataFrame({"Order_Number": [f"{i:05d}" for i in range(1000)], "Amount": range(1000)})
+
+    s3_file_parser.upload_file_to_s3("test-bucket", "path/file.csv.gz", df, compression="gzip")
+
+    body = gzip.decompress(local_s3.objects[("test-bucket", "path/file.csv.gz")])
+    expected = io.StringIO()
+    df.to_csv(expected, quoting=csv.QUOTE_NONNUMERIC, index=False)
+    assert body.decode() == expected.getvalue()
+    assert _call_names(local_s3).count("upload_part") > 1
+
+
+def test_upload_to_s3_multi_char_delimiter_keeps_commas(local_s3, mocker):
+    s3_file_parser = _parser(local_s3, mocker)
+    df = pd.DataFrame({"Order_Number": ["1", "2"], "Remarks": ["paid, settled", "a~~b"], "Amount": [10.5, None]})
+
+    url, file_path = s3_file_parser.upload_to_s3(df, "report", sep="~~", get_signed_url=True, return_path=True)
+
+    assert file_path.startswith("backup/") and file_path.endswith("_report.csv")
+    assert local_s3.objects[("test-bucket", file_path)].decode() == \
+        'Order_Number~~Remarks~~Amount\n1~~paid, settled~~10.5\n2~~"a~~b"~~\n'
+    assert file_path in url
+
+
+def test_write_delimited_matches_to_csv_for_single_char_separator():
+    df = pd.DataFrame({"a": ["x|y", "z"], "b": [1.5, None]})
+    output = io.StringIO()
+
+    write_delimited(df, output, sep="|", chunksize=1)
+
+    assert output.getvalue() == df.to_csv(sep="|", index=False)
+
+
+@pytest.mark.parametrize("quoting", [csv.QUOTE_MINIMAL, csv.QUOTE_ALL, csv.QUOTE_NONNUMERIC])
+def test_write_delimited_multi_char_separator_matches_to_csv(quoting):
+    df = pd.DataFrame({"a": [1.5, None, 3.0], "b": ['x,"q"', None, "a|b"], "d": pd.to_datetime(["2024-01-01", None, "2024-01-02"]),
+                       "t": [True, False, True], "o": [1, "y", None]})
+    output = io.StringIO()
+
+    write_delimited(df, output, sep="~~", quoting=quoting, chunksize=2)
+
+    # no field holds a tab, to_csv with a tab separator quotes the same fields
+    assert output.getvalue() == df.to_csv(sep="\t", index=False, quoting=quoting).replace("\t", "~~")
+
+
+def test_write_delimited_multi_char_separator_quote_none():
+    output = io.StringIO()
+
+    write_delimited(pd.DataFrame({"a": ["x", None]}), output, sep="~~", quoting=csv.QUOTE_NONE)
+
+    assert output.getvalue() == "a\nx\n\n"
+    with pytest.raises(csv.Error):
+        write_delimited(pd.DataFrame({"a": ["x~~y"]}), io.StringIO(), sep="~~", quoting=csv.QUOTE_NONE)
+
+
+def test_upload_many(local_s3, mocker):
+    s3_file_parser = _parser(local_s3, mocker)
+    threads = set()
+    stream_df_to_s3 = s3_file_parser.stream_df_to_s3
+
+    def record_thread(df, *args, **kwargs):
+        threads.add(threading.get_ident())
+        if df is None:
+            raise ValueError("no dataframe")
+        time.sleep(0.05)
+        return stream_df_to_s3(df, *args, **kwargs)
+    mocker.patch.object(s3_file_parser, "stream_df_to_s3", side_effect=record_thread)
+    items = [(pd.DataFrame({"a": [i]}), f"report_{i}", "product") for i in range(4)] + [(None, "broken")]
+
+    results = s3_file_parser.upload_many(items, get_signed_url=True, link_expiry=60, max_workers=4)
+
+    assert [result.file_name for result in results] == ["report_0", "report_1", "report_2", "report_3", "broken"]
+    for i, result in enumerate(results[:4]):
+        assert result.succeeded
+        assert result.path.startswith("backup/") and "/product/" in result.path
+        assert result.path.endswith(f"_report_{i}.csv")
+        assert local_s3.objects[("test-bucket", result.path)] == f'"a"\n{i}\n'.encode()
+        assert result.url == f"https://test-bucket.local/{result.path}?expires=60"
+    assert not results[4].succeeded and results[4].path is None
+    assert len(threads) > 1
+
+
+def test_upload_many_without_items(local_s3, mocker):
+    assert _parser(local_s3, mocker).upload_many([]) == []
+
+
+def test_upload_many_duplicate_keys(local_s3, mocker):
+    items = [(pd.DataFrame({"a": [i]}), "report", "product") for i in range(2)] + [(pd.DataFrame({"a": [2]}), "report")]
+
+    results = _parser(local_s3, mocker).upload_many(items)
+
+    assert results[0].succeeded and results[2].succeeded
+    assert isinstance(results[1].error, ValueError) and results[1].path is None
+    assert local_s3.objects[("test-bucket", results[0].path)] == b'"a"\n0\n'
+
+
+def test_shared_part_uploads_block_while_full():
+    release = threading.Event()
+    submitted = threading.Event()
+
+    with SharedPartUploads(concurrency=1) as shared_part_uploads:
+        first = shared_part_uploads.submit(release.wait)
+        thread = threading.Thread(target=lambda: (shared_part_uploads.submit(lambda: None), submitted.set()))
+        thread.start()
+        assert not submitted.wait(0.1)
+        release.set()
+        thread.join()
+
+    assert first.result() and submitted.is_set()
+
+
+def test_writers_share_part_uploads(local_s3, small_parts):
+    with SharedPartUploads(concurrency=2) as shared_part_uploads:
+        writers = [MultipartUploadWriter(local_s3, "test-bucket", f"key_{i}", part_size=2, shared_part_uploads=shared_part_uploads) for i in range(2)]
+        for writer in writers:
+            writer.write(b"01234")
+        for writer in writers:
+            writer.close()
+
+    assert local_s3.objects[("test-bucket", "key_0")] == local_s3.objects[("test-bucket", "key_1")] == b"01234"
+    assert all(writer._executor is None for writer in writers)
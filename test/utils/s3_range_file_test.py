@@ -0,0 +1,68 @@
+import io, zipfile
+import pandas as pd
+from file_parser_sdk.utils.s3_range_file import S3RangeFile
+from file_parser_sdk.utils.s3_file_parser import S3FileParser
+from file_parser_sdk.utils.logger import CustomLogger
+
+
+def build_zip():
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_STORED) as zfile:
+        zfile.writestr("wanted.csv", "Order_Number,Amount\n001,10\n002,20\n")
+        zfile.writestr("ignored.pdf", b"x" * 200000)
+        zfile.writestr("also_wanted.csv", "Order_Number,Amount\n003,30\n")
+    return buffer.getvalue()
+
+
+class TestS3RangeFile:
+
+    def test_read_and_seek_match_object_content(self, local_s3):
+        content = bytes(range(256)) * 40
+        local_s3.objects[("bucket", "key")] = content
+        range_file = S3RangeFile(local_s3, "bucket", "key", block_size=100, cache_blocks=4)
+
+        assert range_file.read(10) == content[:10]
+        range_file.seek(-50, io.SEEK_END)
+        assert range_file.read() == content[-50:]
+        range_file.seek(95)
+        assert range_file.read(20) == content[95:115]
+        range_file.seek(1000)
+        assert range_file.read(1000) == content[1000:2000]
+
+    def test_cached_blocks_are_not_fetched_again(self, local_s3):
+        local_s3.objects[("bucket", "key")] = b"a" * 1000
+        range_file = S3RangeFile(local_s3, "bucket", "key", block_size=100, cache_blocks=4)
+
+        range_file.read(50)
+        range_file.seek(10)
+        range_file.read(50)
+
+        assert range_file.requests_made == 1
+
+    def test_zip_reads_only_required_members(self, local_s3):
+        content = build_zip()
+        local_s3.objects[("bucket", "file.zip")] = content
+        range_file = S3RangeFile(local_s3, "bucket", "file.zip", block_size=4096, cache_blocks=4)
+
+        with zipfile.ZipFile(range_file) as zfile:
+            ignored = zfile.getinfo("ignored.pdf")
+            df = pd.concat([pd.read_csv(zfile.open(name), dtype=str) for name in ["wanted.csv", "also_wanted.csv"]])
+
+        assert df["Order_Number"].tolist() == ["001", "002", "003"]
+        assert range_file.bytes_fetched < len(content) / 2
+        ignored_start, ignored_end = ignored.header_offset, ignored.header_offset + ignored.compress_size
+        overlap = sum(max(0, min(end, ignored_end) - max(start, ignored_start) + 1) for start, end in local_s3.ranges)
+        # only the blocks shared with the neighbouring members may touch the ignored member
+        assert overlap <= 2 * 4096
+
+    def test_readZipFromS3_uses_range_reads(self, mocker, local_s3):
+        local_s3.objects[("test-bucket", "path/file.zip")] = build_zip()
+        mocker.patch('file_parser_sdk.utils.s3_file_parser.S3FileParser.get_s3_client', return_value=local_s3)
+        mock_get_object = mocker.patch('file_parser_sdk.utils.s3_file_parser.S3FileParser.getS3_object')
+        config = {"s3_config": {"upload_bucket": "test-bucket", "download_bucket": "test-bucket", "range_read_zip": True}}
+        s3_file_parser = S3FileParser(CustomLogger(), config)
+
+        zfile = s3_file_parser.readZipFromS3("s3://test-bucket/path/file.zip")
+
+        assert zfile.namelist() == ["wanted.csv", "ignored.pdf", "also_wanted.csv"]
+        mock_get_object.assert_not_called()
@@ -0,0 +1,155 @@
+import zipfile
+import pandas as pd
+import pytest
+from file_parser_sdk.service.file_parser import FileParser
+from file_parser_sdk.utils.s3_file_parser import S3FileParser
+from file_parser_sdk.utils.storage_backends import StorageBackend, LocalFileStorageBackend, MappedFile, InMemoryStorageBackend, S3StorageBackend
+from file_parser_sdk.utils.logger import CustomLogger
+from file_parser_sdk.exceptions.expcetion import ConfigMissingException, ResourceNotFoundException
+
+_config = {
+    "file_config": {
+        "file_source_csv": {
+            "read_from_s3_func": "readFromS3",
+            "parameters_for_read_s3": None,
+            "file_dtype": {"Order_Number": str},
+            "columns_mapping": {"Order_Number": "MisTxRef"},
+            "edge_case": None
+        },
+        "file_source_zip": {
+            "read_from_s3_func": "readZipFromS3",
+            "parameters_for_read_s3": None,
+            "file_dtype": {"Order_Number": str},
+            "columns_mapping": {"Order_Number": "MisTxRef"},
+            "edge_case": None
+        },
+        "file_source_excel": {
+            "read_from_s3_func": "read_complete_excel_file",
+            "parameters_for_read_s3": None,
+            "file_dtype": {"Order_Number": str},
+            "columns_mapping": {"Order_Number": "MisTxRef"},
+            "edge_case": None
+        }
+    },
+    "s3_config": {
+        "upload_bucket": "test-bucket",
+        "download_bucket": "test-bucket"
+    }
+}
+_csv_content = "Order_Number,Amount\n001,10\n002,20\n"
+
+
+class TestStorageBackends:
+
+    def test_local_file_backend_memory_maps_file(self, tmp_path):
+        file_path = tmp_path / "file.csv"
+        file_path.write_text(_csv_content)
+
+        obj = LocalFileStorageBackend().get_object(file_path.as_uri())
+
+        assert isinstance(obj['Body'], MappedFile)
+        assert obj['Body'].getbuffer()[:12].tobytes() == b"Order_Number"
+        assert obj['ContentLength'] == len(_csv_content)
+        assert pd.read_csv(obj['Body'], dtype=str)["Order_Number"].tolist() == ["001", "002"]
+
+    def test_mapped_file_close_unmaps(self, tmp_path):
+        file_path = tmp_path / "file.csv"
+        file_path.write_text(_csv_content)
+        body = LocalFileStorageBackend().get_object(file_path.as_uri())['Body']
+        buffered_body = LocalFileStorageBackend().get_object(file_path.as_uri())['Body']
+        buffer = buffered_body.getbuffer()
+
+        body.close()
+        buffered_body.close()
+
+        assert body._mapping.closed and body.closed
+        assert buffered_body.closed and buffer[:5].tobytes() == b"Order"
+
+    def test_storage_backend_is_abstract(self):
+        class NoIdentityBackend(StorageBackend):
+            def get_object(self, location, stream=False):
+                return {}
+
+        for backend in (StorageBackend, NoIdentityBackend):
+            with pytest.raises(TypeError):
+                backend()
+
+    def test_local_file_backend_missing_and_empty_file(self, tmp_path):
+        (tmp_path / "empty.csv").write_text("")
+
+        assert LocalFileStorageBackend().get_object((tmp_path / "empty.csv").as_uri())['Body'].read() == b""
+        with pytest.raises(ResourceNotFoundException):
+            LocalFileStorageBackend().get_object((tmp_path / "missing.csv").as_uri())
+
+    def test_parse_file_from_local_csv(self, tmp_path):
+        file_path = tmp_path / "file.csv"
+        file_path.write_text(_csv_content)
+
+        df = FileParser(_config).parse_file(file_path.as_uri(), "file_source_csv")
+
+        assert df["MisTxRef"].tolist() == ["001", "002"]
+
+    def test_parse_file_from_local_zip(self, tmp_path):
+        file_path = tmp_path / "file.zip"
+        with zipfile.ZipFile(file_path, "w") as zfile:
+            zfile.writestr("a.csv", _csv_content)
+            zfile.writestr("b.csv", "Order_Number,Amount\n003,30\n")
+
+        df = FileParser(_config).parse_file(file_path.as_uri(), "file_source_zip")
+
+        assert df["MisTxRef"].tolist() == ["001", "002", "003"]
+
+    def test_parse_file_from_local_excel(self, tmp_path):
+        file_path = tmp_path / "file.xlsx"
+        with pd.ExcelWriter(file_path) as writer:
+            pd.DataFrame({"Order_Number": ["001"], "Amount": [10]}).to_excel(writer, sheet_name="Sale", index=False)
+            pd.DataFrame({"Order_Number": ["002"], "Amount": [20]}).to_excel(writer, sheet_name="Refund", index=False)
+
+        df = FileParser(_config).parse_file(file_path.as_uri(), "file_source_excel")
+
+        assert df["MisTxRef"].tolist() == ["001", "002"]
+        assert df["sheet_name"].tolist() == ["Sale", "Refund"]
+
+    def test_registered_in_memory_backend(self):
+        parser = FileParser(_config)
+        parser.s3_file_parser.register_storage_backend("memory", InMemoryStorageBackend({"memory://bucket/file.csv": _csv_content.encode()}))
+
+        df = parser.parse_file("memory://bucket/file.csv", "file_source_csv")
+
+        assert df["MisTxRef"].tolist() == ["001", "002"]
+
+    def test_unknown_scheme(self):
+        s3_file_parser = S3FileParser(CustomLogger(), _config)
+
+        with pytest.raises(ConfigMissingException):
+            s3_file_parser.get_storage_backend("ftp://host/file.csv")
+
+    @pytest.mark.parametrize("path", ["s3a://test-bucket/path/file.csv", "s3n://test-bucket/path/file.csv"])
+    def test_s3_scheme_aliases(self, mocker, local_s3, path):
+        local_s3.objects[("test-bucket", "path/file.csv")] = _csv_content.encode()
+        mocker.patch.object(S3FileParser, "get_s3_client", return_value=local_s3)
+        s3_file_parser = S3FileParser(CustomLogger(), _config)
+
+        assert s3_file_parser.get_storage_backend(path) is s3_file_parser.get_storage_backend("s3://test-bucket/path/file.csv")
+        assert s3_file_parser.read_object_bytes(path) == _csv_content.encode()
+
+    def test_s3_backend_location(self, local_s3):
+        local_s3.objects[("test-bucket", "path/file.csv")] = _csv_content.encode()
+        backend = S3StorageBackend({"download_bucket": "test-bucket"}, lambda: local_s3)
+
+        assert backend.get_location("s3://other-bucket/path/file.csv") == ("test-bucket", "path/file.csv")
+        assert S3StorageBackend({}, lambda: local_s3).get_location("s3://other-bucket/path/file.csv") == ("other-bucket", "path/file.csv")
+        assert backend.read_bytes("s3://other-bucket/path/file.csv") == _csv_content.encode()
+
+    def test_in_memory_backend_cache_identity(self, local_s3):
+        data = _csv_content.encode()
+        local_s3.objects[("test-bucket", "path/file.csv")] = data
+        s3_backend = S3StorageBackend({"download_bucket": "test-bucket"}, lambda: local_s3)
+        etag_identity = s3_backend.get_cache_identity("s3://test-bucket/path/file.csv")
+
+        prefetched = InMemoryStorageBackend({"s3://test-bucket/path/file.csv": data}, fallback=s3_backend)
+        carried = InMemoryStorageBackend({"s3://test-bucket/path/file.csv": data}, cache_identities={"s3://test-bucket/path/file.csv": ("s3://test-bucket/path/file.csv", '"1"')})
+
+        assert prefetched.get_cache_identity("s3://test-bucket/path/file.csv") == etag_identity
+        assert carried.get_cache_identity("s3://test-bucket/path/file.csv") == ("s3://test-bucket/path/file.csv", '"1"')
+        assert InMemoryStorageBackend({"memory://file.csv": data}).get_cache_identity("memory://file.csv")[0] == "memory://file.csv"
@@ -0,0 +1,103 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from file_parser_sdk.exceptions.expcetion import ConfigMissingException, FileProcessFailException
+from file_parser_sdk.service.file_parser import FileParser
+from file_parser_sdk.utils import transforms
+
+
+class TestTransforms:
+
+    def test_parse_dates(self):
+        df = pd.DataFrame({"MisDate": ["19-05-2022", "01-12-2023", "bad"]})
+
+        df = transforms.parse_dates(df, {"columns": ["MisDate"], "format": "%d-%m-%Y", "output_format": "%Y-%m-%d"})
+
+        assert df["MisDate"].tolist()[:2] == ["2022-05-19", "2023-12-01"]
+        assert pd.isna(df["MisDate"].iloc[2])
+
+    def test_convert_amounts(self):
+        df = pd.DataFrame({"MisAmount": ["INR 1,234.50", "(12.00)", "Rs. 100", "7.5 DR", None, "abc"],
+                           "Currency": ["INR", "INR", "USD", "INR", "INR", "INR"]})
+
+        df = transforms.convert_amounts(df, {"columns": ["MisAmount"], "debit_suffixes": ["DR"],
+                                             "currency_column": "Currency", "rates": {"USD": 80}, "round": 2})
+
+        assert df["MisAmount"].tolist()[:4] == [1234.5, -12.0, 8000.0, -7.5]
+        assert df["MisAmount"].iloc[4:].isna().all()
+
+    def test_convert_numeric_amounts_in_paise(self):
+        df = pd.DataFrame({"MisAmount": [12345, 50]})
+
+        assert transforms.convert_amounts(df, {"columns": ["MisAmount"], "divide_by": 100})["MisAmount"].tolist() == [123.45, 0.5]
+
+    def test_clean_strings(self):
+        df = pd.DataFrame({"MisTxRef": ["  ab-12 ", "'CD  34", "   ", np.nan, 1234]})
+
+        df = transforms.clean_strings(df, {"columns": ["MisTxRef"], "case": "upper", "remove": "[-']",
+                                           "collapse_whitespace": True, "empty_as_null": True})
+
+        assert df["MisTxRef"].tolist()[:2] == ["AB12", "CD 34"]
+        assert df["MisTxRef"].iloc[2:4].isna().all()
+        assert df["MisTxRef"].iloc[4] == "1234"
+
+    def test_split_and_merge_columns(self):
+        df = pd.DataFrame({"Narration": ["UPI|123|SALE", "NEFT|456", None], "Bank": ["HDFC", "ICICI", "SBI"]})
+
+        df = transforms.split_column(df, {"column": "Narration", "separator": "|", "into": ["Mode", "Ref", "Type"], "keep": False})
+        df = transforms.merge_columns(df, {"columns": ["Bank", "Ref"], "into": "BankRef", "separator": "-"})
+
+        assert "Narration" not in df.columns
+        assert df["Mode"].tolist()[:2] == ["UPI", "NEFT"]
+        assert pd.isna(df["Type"].iloc[1])
+        assert df["BankRef"].tolist() == ["HDFC-123", "ICICI-456", "SBI-"]
+
+    def test_constant_and_cast_columns(self):
+        df = pd.DataFrame({"Amount": ["1", "x"], "Count": [1.0, 2.0], "Ref": [1, None]})
+
+        df = transforms.constant_columns(df, {"values": {"MisSettlementCurrency": "INR"}})
+        df = transforms.cast_columns(df, {"dtypes": {"Amount": "numeric", "Count": "Int64", "Ref": "str"}})
+
+        assert df["MisSettlementCurrency"].tolist() == ["INR", "INR"]
+        assert df["Amount"].iloc[0] == 1 and pd.isna(df["Amount"].iloc[1])
+        assert str(df["Count"].dtype) == "Int64"
+        assert df["Ref"].iloc[0] == "1.0" and pd.isna(df["Ref"].iloc[1])
+
+    def test_missing_column(self):
+        with pytest.raises(ConfigMissingException):
+            transforms.parse_dates(pd.DataFrame({"a": [1]}), {"columns": ["b"]})
+
+
+class TestApplyEdgeCasesWithTransforms:
+
+    def _parser(self, edge_case):
+        parser = FileParser({"file_config": {"file_source": {"read_from_s3_func": "readFromS3", "parameters_for_read_s3": None,
+                                                               "file_dtype": None, "columns_mapping": {}, "edge_case": edge_case}},
+                             "s3_config": {}})
+        parser.resolve_file_config("s3://bucket/file.csv", "file_source")
+        return parser
+
+    def test_builtin_transforms_run_in_order(self):
+        parser = self._parser({"clean_strings": {"columns": ["Type"], "case": "upper"},
+                               "convert_amounts": [{"columns": ["Amount"]}, {"columns": ["Fee"], "divide_by": 100}]})
+        df = pd.DataFrame({"Type": [" sale"], "Amount": ["1,000.00"], "Fee": [250]})
+
+        df = parser.apply_edge_cases(df)
+
+        assert df.to_dict("list") == {"Type": ["SALE"], "Amount": [1000.0], "Fee": [2.5]}
+
+    def test_user_edge_case_takes_precedence(self):
+        parser = self._parser({"clean_strings": None, "constant_columns": {"values": {"Source": "mis"}}})
+        parser.edge_cases = type("user_edge_cases", (), {"clean_strings": staticmethod(lambda df: df.assign(Cleaned=True))})
+
+        df = parser.apply_edge_cases(pd.DataFrame({"Type": ["sale"]}))
+
+        assert df.to_dict("list") == {"Type": ["sale"], "Cleaned": [True], "Source": ["mis"]}
+
+    def test_unknown_edge_case_without_module(self):
+        parser = self._parser({"not_a_transform": None})
+        parser.edge_cases = None
+
+        with pytest.raises(FileProcessFailException, match="Edge case module not found"):
+            parser.apply_edge_cases(pd.DataFrame({"Type": ["sale"]}))
@@ -0,0 +1,76 @@
+import io
+
+import pandas as pd
+
+from file_parser_sdk.service.file_parser import FileParser
+from file_parser_sdk.utils.xml_reader import read_xml
+
+_settlement = b"""<?xml version="1.0"?>
+<Settlement>
+  <Header><Date>2024-01-01</Date></Header>
+  <Txns>
+    <Txn><TxnId>1</TxnId><Amount>10.5</Amount>
+      <Fee><Type>MDR</Type><Value>0.2</Value></Fee>
+      <Fee><Type>GST</Type><Value>0.04</Value></Fee>
+    </Txn>
+    <Txn><TxnId>2</TxnId><Amount>20</Amount><Status>FAILED</Status></Txn>
+    <Txn><TxnId>3</TxnId><Amount>30</Amount><Fee><Type>MDR</Type><Value>0.6</Value></Fee></Txn>
+  </Txns>
+</Settlement>"""
+
+
+class TestXmlReader:
+
+    def test_default_txn_and_fee_records(self):
+        df = read_xml(io.BytesIO(_settlement))
+
+        expected = pd.DataFrame({
+            "TxnId": ["1", "2", "3"], "Amount": ["10.5", "20", "30"],
+            "Type_1": ["MDR", None, "MDR"], "Value_1": ["0.2", None, "0.6"],
+            "Type_2": ["GST", None, None], "Value_2": ["0.04", None, None],
+            "Status": [None, "FAILED", None],
+        })
+        pd.testing.assert_frame_equal(df, expected)
+
+    def test_configured_tags_columns_and_usecols(self):
+        document = b"""<Report xmlns="urn:report">
+            <Row><Ref>A</Ref><Charge><Code>X</Code></Charge><Charge><Code>Y</Code></Charge></Row>
+            <Row><Ref>B</Ref></Row>
+        </Report>"""
+
+        df = read_xml(io.BytesIO(document), record_tag="Row", repeated_groups=["Charge"],
+                      columns={"Ref": "Reference", "Code_1": "FirstCharge"}, usecols=lambda name: name != "Code_2")
+
+        assert df.to_dict("list") == {"Reference": ["A", "B"], "FirstCharge": ["X", None]}
+
+    def test_chunks(self):
+        chunks = list(read_xml(io.BytesIO(_settlement), chunksize=2))
+
+        assert [len(chunk) for chunk in chunks] == [2, 1]
+        assert chunks[1]["TxnId"].tolist() == ["3"]
+        assert chunks[1].index.tolist() == [0]
+
+    def test_no_records(self):
+        assert read_xml(io.BytesIO(b"<Settlement/>")).empty
+
+    def test_parse_file_with_xml_options(self, tmp_path):
+        file_path = tmp_path / "settlement.xml"
+        file_path.write_bytes(_settlement)
+        config = {
+            "file_config": {
+                "file_source": {
+                    "read_from_s3_func": "readFromS3",
+                    "parameters_for_read_s3": None,
+                    "file_dtype": None,
+                    "columns_mapping": {"TxnId": "MisTxRef", "Fee": "MisFee"},
+                    "xml_options": {"columns": {"Value_1": "Fee"}},
+                    "prune_columns": True,
+                    "edge_case": None
+                }
+            },
+            "s3_config": {"download_bucket": "test-bucket"}
+        }
+
+        df = FileParser(config).parse_file(file_path.as_uri(), "file_source")
+
+        assert df.to_dict("list") == {"MisTxRef": ["1", "2", "3"], "MisFee": ["0.2", None, "0.6"]}